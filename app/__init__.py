@@ -17,10 +17,47 @@ def create_app(config_class=DevelopmentConfig):
     
     # Initialize extensions
     db.init_app(app)
+    from app.utils.db_routing import register_db_routing
+    register_db_routing(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
     bcrypt.init_app(app)
     
+    # Per-worker catalog cache
+    from app.utils.cache import catalog_cache, auth_cache
+    catalog_cache.configure(
+        max_entries=app.config.get('CATALOG_CACHE_MAX_ENTRIES', 1024),
+        ttl=app.config.get('CATALOG_CACHE_TTL', 60)
+    )
+    auth_cache.configure(
+        max_entries=app.config.get('AUTH_CACHE_MAX_ENTRIES', 4096),
+        ttl=app.config.get('AUTH_CACHE_TTL', 30)
+    )
+    
+    # Bounded bcrypt pool (per worker)
+    from app.utils.passwords import password_hasher
+    password_hasher.configure(
+        workers=app.config.get('PASSWORD_HASH_WORKERS', 2),
+        max_pending=app.config.get('PASSWORD_HASH_MAX_PENDING', 16),
+        rounds=app.config.get('BCRYPT_LOG_ROUNDS', 12)
+    )
+    
+    # Login/register/refresh throttling
+    from app.utils.ratelimit import rate_limiter
+    rate_limiter.configure(app.config.get('RATELIMIT_STORE'))
+    
+    # Logged-out token blocklist (per-worker Bloom filter over token_blocklist)
+    from app.utils.blocklist import token_revocations
+    token_revocations.configure(
+        capacity=app.config.get('TOKEN_BLOCKLIST_CAPACITY', 100000),
+        sync_interval=app.config.get('TOKEN_BLOCKLIST_SYNC_INTERVAL', 5),
+        rebuild_interval=app.config.get('TOKEN_BLOCKLIST_REBUILD_INTERVAL', 3600)
+    )
+    
+    # Token revocation checks (logout, role/status changes) and current_user loading
+    from app.utils.auth import register_jwt_callbacks
+    register_jwt_callbacks(jwt)
+    
     # Enable CORS for frontend
     allowed_origins = os.environ.get('ALLOWED_ORIGINS', 
                                      'http://localhost:5000,http://127.0.0.1:5000,http://localhost:8000,http://127.0.0.1:8000,http://localhost:5500,http://127.0.0.1:5500,https://daastan.onrender.com')
@@ -29,7 +66,7 @@ def create_app(config_class=DevelopmentConfig):
         r"/api/*": {
             "origins": allowed_origins.split(','),
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"],
+            "allow_headers": ["Content-Type", "Authorization", "Idempotency-Key"],
             "expose_headers": ["Content-Type", "Authorization"],
             "supports_credentials": True
         }
@@ -46,6 +83,7 @@ def create_app(config_class=DevelopmentConfig):
     from app.routes.CartHistoryRoutes import cart_history_bp
     from app.routes.OrderRoutes import order_bp
     from app.routes.ReviewRoutes import review_bp
+    from app.routes.AdminRoutes import admin_bp
     
     # API v1 routes
     app.register_blueprint(auth_bp, url_prefix='/api/v1/auth')
@@ -57,10 +95,15 @@ def create_app(config_class=DevelopmentConfig):
     app.register_blueprint(cart_history_bp, url_prefix='/api/v1/cart-history')
     app.register_blueprint(order_bp, url_prefix='/api/v1')
     app.register_blueprint(review_bp, url_prefix='/api/v1/reviews')
+    app.register_blueprint(admin_bp, url_prefix='/api/v1')
     
     # Legacy routes (keep for backward compatibility)
     app.register_blueprint(items_bp, url_prefix='/api')
     
+    # CLI commands (flask search rebuild, ...)
+    from app.commands import register_commands
+    register_commands(app)
+    
     # Serve frontend static files
     @app.route('/')
     def home():
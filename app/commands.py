@@ -0,0 +1,159 @@
+import click
+from flask.cli import AppGroup
+
+search_cli = AppGroup('search', help='Book search index commands')
+
+
+@search_cli.command('rebuild')
+def rebuild_search_index():
+    """Create (if missing) and rebuild the book full-text search index"""
+    from app.services.SearchService import BookSearchService
+    count = BookSearchService.rebuild()
+    click.echo(f'Indexed {count} books')
+
+
+ratings_cli = AppGroup('ratings', help='Book review aggregate commands')
+
+
+@ratings_cli.command('backfill')
+def backfill_ratings():
+    """Recompute every book's review count, sum and star distribution"""
+    from app.services.ReviewService import ReviewService
+    count = ReviewService().rebuild_rating_aggregates()
+    click.echo(f'Updated rating aggregates for {count} reviewed books')
+
+
+cart_cli = AppGroup('cart', help='Shopping cart maintenance commands')
+
+
+@cart_cli.command('purge-abandoned')
+@click.option('--days', default=30, show_default=True, help='Remove cart items untouched for this many days')
+def purge_abandoned_carts(days):
+    """Soft delete abandoned cart items in a single UPDATE"""
+    from app.services.CartService import CartService
+    removed = CartService.purge_abandoned_carts(days)
+    click.echo(f'Removed {removed} abandoned cart items')
+
+
+tokens_cli = AppGroup('tokens', help='JWT blocklist commands')
+
+
+@tokens_cli.command('prune')
+def prune_revoked_tokens():
+    """Delete blocklist entries for tokens that have expired"""
+    from app.utils.blocklist import token_revocations
+    deleted = token_revocations.prune()
+    click.echo(f'Pruned {deleted} expired blocklist entries')
+
+
+idempotency_cli = AppGroup('idempotency', help='Idempotency-Key response store commands')
+
+
+@idempotency_cli.command('prune')
+def prune_idempotency_keys():
+    """Delete stored responses whose keys have expired"""
+    from app.utils.idempotency import prune_idempotency_keys
+    deleted = prune_idempotency_keys()
+    click.echo(f'Pruned {deleted} expired idempotency keys')
+
+
+orders_cli = AppGroup('orders', help='Order commands')
+
+
+@orders_cli.command('import-tracking')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', type=int, help='Rows per UPDATE and commit (default TRACKING_IMPORT_BATCH_SIZE)')
+def import_tracking(path, batch_size):
+    """Set tracking numbers from a CSV with order_id and tracking_number columns"""
+    from app.services.OrderService import OrderService
+    with open(path, newline='', encoding='utf-8-sig') as csv_file:
+        try:
+            result = OrderService().import_tracking_numbers(csv_file, batch_size=batch_size)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+    for error in result['errors']:
+        click.echo(f"row {error['row']} ({error['order_id'] or '-'}): {error['error']}", err=True)
+    if result['failed'] > len(result['errors']):
+        click.echo(f"... {result['failed'] - len(result['errors'])} more errors not shown", err=True)
+    click.echo(f"Read {result['rows']} rows: {result['updated']} updated, {result['failed']} failed")
+
+
+analytics_cli = AppGroup('analytics', help='Sales rollup commands')
+
+
+@analytics_cli.command('rebuild')
+def rebuild_analytics():
+    """Recompute the daily sales rollups from all orders (stop the job worker first)"""
+    from app.services.AnalyticsService import AnalyticsService
+    count = AnalyticsService().rebuild()
+    click.echo(f'Rebuilt sales rollups ({count} day/city rows)')
+
+
+jobs_cli = AppGroup('jobs', help='Background job queue commands')
+
+
+@jobs_cli.command('work')
+@click.option('--burst', is_flag=True, help='Exit once no jobs are due instead of polling')
+@click.option('--poll-interval', type=float, help='Seconds to sleep when idle (default JOBS_POLL_INTERVAL)')
+def work_jobs(burst, poll_interval):
+    """Run background jobs until interrupted (SIGTERM/SIGINT finish the current job first)"""
+    import signal
+    import threading
+    from app.services.JobService import JobService
+    stop_event = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *args: stop_event.set())
+    count = JobService().work(poll_interval=poll_interval, stop_event=stop_event, burst=burst)
+    click.echo(f'Ran {count} jobs')
+
+
+@jobs_cli.command('status')
+def job_status():
+    """Print the number of jobs per status"""
+    from app.services.JobService import JobService
+    for status, count in sorted(JobService().get_status_counts().items()):
+        click.echo(f'{status}: {count}')
+
+
+@jobs_cli.command('retry-failed')
+def retry_failed_jobs():
+    """Requeue jobs that ran out of attempts"""
+    from app.services.JobService import JobService
+    count = JobService().retry_failed_jobs()
+    click.echo(f'Requeued {count} failed jobs')
+
+
+@jobs_cli.command('prune')
+@click.option('--days', default=7, show_default=True, help='Delete successful jobs finished this many days ago')
+def prune_jobs(days):
+    """Delete old successfully finished jobs"""
+    from app.services.JobService import JobService
+    deleted = JobService().prune_finished_jobs(days)
+    click.echo(f'Pruned {deleted} finished jobs')
+
+
+@click.command('selfcheck')
+@click.option('--workers', type=int, help='Gunicorn workers to assume when sizing connections')
+@click.option('--threads', type=int, help='Gunicorn threads per worker to assume')
+def selfcheck(workers, threads):
+    """Print the effective database/pool/runtime settings and any problems"""
+    from flask import current_app
+    from app.utils.selfcheck import collect_settings, find_problems
+    settings = collect_settings(current_app, workers, threads)
+    for key, value in settings.items():
+        click.echo(f'{key}: {value}')
+    for problem in find_problems(current_app, settings):
+        click.echo(f'WARNING: {problem}')
+
+
+def register_commands(app):
+    """Register custom flask CLI commands"""
+    app.cli.add_command(search_cli)
+    app.cli.add_command(ratings_cli)
+    app.cli.add_command(cart_cli)
+    app.cli.add_command(tokens_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(orders_cli)
+    app.cli.add_command(idempotency_cli)
+    app.cli.add_command(selfcheck)
@@ -13,10 +13,37 @@ class Book(BaseModel, db.Model):
     description = db.Column(db.Text, nullable=True)
     image_url = db.Column(db.String(500), nullable=True)
     
+    # Review aggregates, maintained by ReviewService in the review's transaction
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_1_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_2_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_3_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_4_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_5_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    average_rating = db.column_property(
+        db.case((rating_count > 0, db.cast(rating_sum, db.Float) / rating_count), else_=0.0)
+    )
+    
+    # Optimistic concurrency: bumped on every ORM update (version_id_col) and every stock UPDATE
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
     # Foreign Keys
     author_id = db.Column(db.String(36), db.ForeignKey('authors.id'), nullable=True)
     category_id = db.Column(db.String(36), db.ForeignKey('categories.id'), nullable=True)
     
+    # Listing indexes over active rows: (filter, sort key, id) for keyset pagination
+    __table_args__ = (
+        db.Index('ix_books_created_at_active', 'created_at', 'id', postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_books_title_active', 'title', 'id', postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_books_price_active', 'price', 'id', postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_books_category_active', 'category_id', 'created_at', 'id', postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_books_author_active', 'author_id', 'created_at', 'id', postgresql_where=db.text('is_deleted = false')),
+    )
+    
+    # ORM updates carry WHERE version = <loaded version>; a concurrent change raises StaleDataError
+    __mapper_args__ = {'version_id_col': version}
+    
     # Relationships (backrefs defined in Author and Category models)
     # author = db.relationship('Author', backref='books', lazy=True)
     # category = db.relationship('Category', backref='books', lazy=True)
@@ -35,11 +62,14 @@ class Book(BaseModel, db.Model):
             'price': float(self.price) if self.price else None,
             'price_pkr': f"PKR {float(self.price):,.2f}" if self.price else None,
             'stock_quantity': self.stock_quantity,
+            'version': self.version,
             'description': self.description,
             'image_url': self.image_url,
             'author_id': self.author_id,
             'category_id': self.category_id,
-            'in_stock': self.stock_quantity > 0
+            'in_stock': self.stock_quantity > 0,
+            'average_rating': round(self.average_rating or 0, 2),
+            'review_count': self.rating_count or 0
         }
         
         # Include author details if requested
@@ -57,3 +87,7 @@ class Book(BaseModel, db.Model):
             }
         
         return result
+    
+    def rating_distribution(self):
+        """Review count per star (1-5)"""
+        return {star: getattr(self, f'rating_{star}_count') or 0 for star in range(1, 6)}
@@ -0,0 +1,15 @@
+from app.models import db
+
+class BookSalesDaily(db.Model):
+    __tablename__ = 'book_sales_daily'
+    
+    # Units and revenue per (UTC order day, book), maintained by AnalyticsService.
+    # A rollup, not an entity: no BaseModel columns, the key is the primary key.
+    day = db.Column(db.Date, primary_key=True)
+    book_id = db.Column(db.String(36), db.ForeignKey('books.id'), primary_key=True)
+    
+    # Everything ordered that day; the cancelled part is also counted separately
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+    cancelled_quantity = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_revenue = db.Column(db.Numeric(18, 2), nullable=False, default=0)
@@ -11,6 +11,11 @@ class CartItem(BaseModel, db.Model):
     book_id = db.Column(db.String(36), db.ForeignKey('books.id'), nullable=True)
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
     
+    # Active cart lookups by user, and by (user, book) for duplicate checks
+    __table_args__ = (
+        db.Index('ix_cart_items_user_book_active', 'user_id', 'book_id', postgresql_where=db.text('is_deleted = false')),
+    )
+    
     # Relationships
     book = db.relationship('Book', backref='cart_items', lazy=True)
     user = db.relationship('User', backref='cart_items', lazy=True)
@@ -0,0 +1,22 @@
+from app.models import db
+from app.models.BaseModel import BaseModel
+
+class IdempotencyKey(BaseModel, db.Model):
+    __tablename__ = 'idempotency_keys'
+    
+    # Idempotency-Key of a POST and the response it produced (see app.utils.idempotency)
+    key = db.Column(db.String(255), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)  # method, path and body the key was first used with
+    status = db.Column(db.String(20), nullable=False, default='in_progress')  # in_progress | completed
+    response_status = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)
+    response_mimetype = db.Column(db.String(100), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    # Foreign Keys
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    
+    # Keys are scoped per user
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'key', name='uq_idempotency_keys_user_key'),
+    )
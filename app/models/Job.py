@@ -0,0 +1,46 @@
+from app.models import db
+from app.models.BaseModel import BaseModel
+import json
+
+class Job(BaseModel, db.Model):
+    __tablename__ = 'jobs'
+    
+    # Background job (see app.services.JobService), run by `flask jobs work`
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')  # JSON keyword arguments for the task
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending | running | done | failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False)  # not picked up before this time (retry backoff)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    locked_by = db.Column(db.String(100), nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    
+    # Enqueueing the same key twice creates one job
+    idempotency_key = db.Column(db.String(200), nullable=True, unique=True)
+    
+    # Workers poll for due pending jobs
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),
+    )
+    
+    @property
+    def arguments(self):
+        return json.loads(self.payload or '{}')
+    
+    def to_dict(self):
+        return {
+            **self.base_to_dict(),
+            'name': self.name,
+            'payload': self.arguments,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_at': self.run_at.isoformat() if self.run_at else None,
+            'locked_at': self.locked_at.isoformat() if self.locked_at else None,
+            'locked_by': self.locked_by,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'last_error': self.last_error,
+            'idempotency_key': self.idempotency_key
+        }
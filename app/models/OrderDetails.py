@@ -7,7 +7,7 @@ class OrderDetails(BaseModel, db.Model):
     
     # OrderDetails fields
     total_amount = db.Column(db.Numeric(18, 2), nullable=False)
-    order_date = db.Column(db.DateTime, nullable=False, default=datetime.now(timezone.utc))
+    order_date = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     order_status = db.Column(db.String(20), nullable=False, default='Pending')  # Pending, Confirmed, Shipped, Delivered, Cancelled
     shipping_address = db.Column(db.String(255), nullable=False, default='')
     city = db.Column(db.String(100), nullable=False, default='')
@@ -19,14 +19,35 @@ class OrderDetails(BaseModel, db.Model):
     # Foreign Key
     user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
     
+    # Order history (user, newest first) and admin listings (status / date)
+    __table_args__ = (
+        db.Index('ix_order_details_user_date_active', 'user_id', 'order_date', postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_order_details_status_date_active', 'order_status', 'order_date', postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_order_details_date_active', 'order_date', postgresql_where=db.text('is_deleted = false')),
+    )
+    
+    # Valid status transitions (current status -> allowed new statuses)
+    STATUS_TRANSITIONS = {
+        'Pending': ['Confirmed', 'Cancelled'],
+        'Confirmed': ['Shipped', 'Cancelled'],
+        'Shipped': ['Delivered'],
+        'Delivered': [],
+        'Cancelled': []
+    }
+    
     # Relationships
     user = db.relationship('User', backref='orders', lazy=True)
     # Note: order_items relationship is defined via backref in OrderItem model
     
+    @property
+    def active_items(self):
+        """Order items that aren't soft-deleted"""
+        return [item for item in self.order_items if not item.is_deleted]
+    
     @property
     def item_count(self):
         """Get total number of items in order"""
-        return sum(item.quantity for item in self.order_items if not item.is_deleted)
+        return sum(item.quantity for item in self.active_items)
     
     def can_cancel(self):
         """Check if order can be cancelled"""
@@ -34,16 +55,19 @@ class OrderDetails(BaseModel, db.Model):
     
     def can_update_status(self, new_status):
         """Check if status transition is valid"""
-        valid_transitions = {
-            'Pending': ['Confirmed', 'Cancelled'],
-            'Confirmed': ['Shipped', 'Cancelled'],
-            'Shipped': ['Delivered'],
-            'Delivered': [],
-            'Cancelled': []
-        }
-        return new_status in valid_transitions.get(self.order_status, [])
+        return new_status in self.STATUS_TRANSITIONS.get(self.order_status, [])
+    
+    @classmethod
+    def statuses_leading_to(cls, new_status):
+        """Statuses an order can move to new_status from"""
+        return [status for status, targets in cls.STATUS_TRANSITIONS.items() if new_status in targets]
     
-    def to_dict(self):
+    def to_dict(self, item_count=None):
+        """Convert order to dictionary
+        
+        Args:
+            item_count: Precomputed item count (skips loading order_items)
+        """
         return {
             **self.base_to_dict(),
             'total_amount': float(self.total_amount),
@@ -56,5 +80,5 @@ class OrderDetails(BaseModel, db.Model):
             'payment_method': self.payment_method,
             'notes': self.notes,
             'user_id': self.user_id,
-            'item_count': self.item_count,
+            'item_count': self.item_count if item_count is None else int(item_count),
         }
@@ -13,6 +13,11 @@ class OrderItem(BaseModel, db.Model):
     order_details_id = db.Column(db.String(36), db.ForeignKey('order_details.id'), nullable=True)
     book_id = db.Column(db.String(36), db.ForeignKey('books.id'), nullable=True)
     
+    __table_args__ = (
+        db.Index('ix_order_items_order_active', 'order_details_id', postgresql_where=db.text('is_deleted = false')),
+        db.Index('ix_order_items_user_active', 'user_id', postgresql_where=db.text('is_deleted = false')),
+    )
+    
     # Relationships
     user = db.relationship('User', backref='order_items', lazy=True)
     order_details = db.relationship('OrderDetails', backref='order_items', lazy=True)
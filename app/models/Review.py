@@ -21,6 +21,7 @@ class Review(BaseModel, db.Model):
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='valid_rating'),
         db.UniqueConstraint('user_id', 'book_id', name='unique_user_book_review'),
+        db.Index('ix_reviews_book_active', 'book_id', postgresql_where=db.text('is_deleted = false')),
     )
     
     def to_dict(self):
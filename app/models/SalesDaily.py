@@ -0,0 +1,17 @@
+from app.models import db
+
+class SalesDaily(db.Model):
+    __tablename__ = 'sales_daily'
+    
+    # Order totals per (UTC order day, shipping city), maintained by AnalyticsService.
+    # A rollup, not an entity: no BaseModel columns, the key is the primary key.
+    day = db.Column(db.Date, primary_key=True)
+    city = db.Column(db.String(100), primary_key=True)
+    
+    # Every order placed that day; cancelled and delivered ones are also counted separately
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+    cancelled_orders = db.Column(db.Integer, nullable=False, default=0)
+    cancelled_revenue = db.Column(db.Numeric(18, 2), nullable=False, default=0)
+    delivered_orders = db.Column(db.Integer, nullable=False, default=0)
+    delivered_revenue = db.Column(db.Numeric(18, 2), nullable=False, default=0)
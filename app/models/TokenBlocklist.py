@@ -0,0 +1,27 @@
+from app.models import db
+from app.models.BaseModel import BaseModel
+
+class TokenBlocklist(BaseModel, db.Model):
+    __tablename__ = 'token_blocklist'
+    
+    # Revoked JWT (logout), kept until the token would have expired anyway
+    jti = db.Column(db.String(36), nullable=False, unique=True)
+    token_type = db.Column(db.String(10), nullable=False)  # access | refresh
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    # Foreign Keys
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
+    
+    # Workers poll for entries created since their last sync
+    __table_args__ = (
+        db.Index('ix_token_blocklist_created_at', 'created_at'),
+    )
+    
+    def to_dict(self):
+        return {
+            **self.base_to_dict(),
+            'jti': self.jti,
+            'token_type': self.token_type,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'user_id': self.user_id
+        }
@@ -16,6 +16,9 @@ class User(BaseModel, db.Model):
     phone_number = db.Column(db.String(20), nullable=True)
     date_of_birth = db.Column(db.DateTime, nullable=True)
     
+    # Bumped on role/status changes, tokens carrying an older value are rejected
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
     def to_dict(self):
         return {
             **self.base_to_dict(),
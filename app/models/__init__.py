@@ -1,6 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
+from app.utils.db_routing import RoutingSession
 
-db = SQLAlchemy()
+# RoutingSession sends GET request reads to the 'replica' bind when one is configured
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Import models
 from app.models.BaseModel import BaseModel
@@ -13,5 +15,10 @@ from app.models.CartHistory import CartHistory
 from app.models.OrderItem import OrderItem
 from app.models.OrderDetails import OrderDetails
 from app.models.Review import Review
+from app.models.TokenBlocklist import TokenBlocklist
+from app.models.Job import Job
+from app.models.IdempotencyKey import IdempotencyKey
+from app.models.SalesDaily import SalesDaily
+from app.models.BookSalesDaily import BookSalesDaily
 
-__all__ = ['db', 'BaseModel', 'User', 'Author', 'Category', 'Book', 'CartItem', 'CartHistory', 'OrderItem', 'OrderDetails', 'Review']
+__all__ = ['db', 'BaseModel', 'User', 'Author', 'Category', 'Book', 'CartItem', 'CartHistory', 'OrderItem', 'OrderDetails', 'Review', 'TokenBlocklist', 'Job', 'IdempotencyKey', 'SalesDaily', 'BookSalesDaily']
@@ -0,0 +1,127 @@
+from app.models import db, SalesDaily, BookSalesDaily, OrderDetails, OrderItem, Book, Category
+from typing import List
+from sqlalchemy import case, func, insert, select, update
+from datetime import date
+
+class AnalyticsRepository:
+    """Repository for the sales rollup tables"""
+    
+    @staticmethod
+    def add(model, keys: dict, deltas: dict) -> None:
+        """Add deltas to one rollup row, creating it if missing (no commit)
+        
+        UPDATE first, INSERT if no row matched. Two transactions inserting the
+        same new row at once make one fail on the primary key; job retries
+        take care of that.
+        """
+        deltas = {column: delta for column, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        
+        key_filter = [getattr(model, column) == value for column, value in keys.items()]
+        result = db.session.execute(
+            update(model)
+            .where(*key_filter)
+            .values({getattr(model, column): getattr(model, column) + delta for column, delta in deltas.items()})
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.session.execute(insert(model).values(**keys, **deltas))
+    
+    @staticmethod
+    def rebuild() -> int:
+        """Recompute both rollups from order_details / order_items with INSERT ... SELECT (no commit)
+        
+        Returns:
+            Number of sales_daily rows
+        """
+        db.session.query(SalesDaily).delete(synchronize_session=False)
+        db.session.query(BookSalesDaily).delete(synchronize_session=False)
+        
+        day = func.date(OrderDetails.order_date)
+        cancelled = OrderDetails.order_status == 'Cancelled'
+        delivered = OrderDetails.order_status == 'Delivered'
+        db.session.execute(insert(SalesDaily).from_select(
+            ['day', 'city', 'orders', 'revenue', 'cancelled_orders', 'cancelled_revenue', 'delivered_orders', 'delivered_revenue'],
+            select(
+                day, OrderDetails.city,
+                func.count(OrderDetails.id), func.sum(OrderDetails.total_amount),
+                func.sum(case((cancelled, 1), else_=0)), func.sum(case((cancelled, OrderDetails.total_amount), else_=0)),
+                func.sum(case((delivered, 1), else_=0)), func.sum(case((delivered, OrderDetails.total_amount), else_=0))
+            ).where(OrderDetails.is_deleted == False).group_by(day, OrderDetails.city)
+        ))
+        
+        amount = OrderItem.unit_price * OrderItem.quantity
+        db.session.execute(insert(BookSalesDaily).from_select(
+            ['day', 'book_id', 'quantity', 'revenue', 'cancelled_quantity', 'cancelled_revenue'],
+            select(
+                day, OrderItem.book_id,
+                func.sum(OrderItem.quantity), func.sum(amount),
+                func.sum(case((cancelled, OrderItem.quantity), else_=0)), func.sum(case((cancelled, amount), else_=0))
+            ).join(OrderDetails, OrderDetails.id == OrderItem.order_details_id).where(
+                OrderDetails.is_deleted == False,
+                OrderItem.is_deleted == False,
+                OrderItem.book_id.isnot(None)
+            ).group_by(day, OrderItem.book_id)
+        ))
+        return db.session.query(func.count()).select_from(SalesDaily).scalar()
+    
+    @staticmethod
+    def _order_totals():
+        return (
+            func.sum(SalesDaily.orders).label('orders'),
+            func.sum(SalesDaily.revenue).label('revenue'),
+            func.sum(SalesDaily.cancelled_orders).label('cancelled_orders'),
+            func.sum(SalesDaily.cancelled_revenue).label('cancelled_revenue'),
+            func.sum(SalesDaily.delivered_orders).label('delivered_orders'),
+            func.sum(SalesDaily.delivered_revenue).label('delivered_revenue'),
+        )
+    
+    @staticmethod
+    def totals_by_day(date_from: date, date_to: date) -> List:
+        """Order totals per day in [date_from, date_to], oldest first"""
+        return db.session.query(SalesDaily.day, *AnalyticsRepository._order_totals()).filter(
+            SalesDaily.day.between(date_from, date_to)
+        ).group_by(SalesDaily.day).order_by(SalesDaily.day).all()
+    
+    @staticmethod
+    def totals_by_city(date_from: date, date_to: date) -> List:
+        """Order totals per city in [date_from, date_to]"""
+        return db.session.query(SalesDaily.city, *AnalyticsRepository._order_totals()).filter(
+            SalesDaily.day.between(date_from, date_to)
+        ).group_by(SalesDaily.city).all()
+    
+    @staticmethod
+    def totals(date_from: date, date_to: date):
+        """Order totals over [date_from, date_to]"""
+        return db.session.query(*AnalyticsRepository._order_totals()).filter(
+            SalesDaily.day.between(date_from, date_to)
+        ).one()
+    
+    @staticmethod
+    def _book_totals():
+        return (
+            (func.sum(BookSalesDaily.quantity) - func.sum(BookSalesDaily.cancelled_quantity)).label('quantity'),
+            (func.sum(BookSalesDaily.revenue) - func.sum(BookSalesDaily.cancelled_revenue)).label('revenue'),
+        )
+    
+    @staticmethod
+    def book_totals_by_category(date_from: date, date_to: date) -> List:
+        """Net units and revenue per book category in [date_from, date_to]"""
+        return db.session.query(Category.id, Category.category_type, *AnalyticsRepository._book_totals()).select_from(
+            BookSalesDaily
+        ).join(Book, Book.id == BookSalesDaily.book_id).outerjoin(
+            Category, Category.id == Book.category_id
+        ).filter(
+            BookSalesDaily.day.between(date_from, date_to)
+        ).group_by(Category.id, Category.category_type).all()
+    
+    @staticmethod
+    def top_books(date_from: date, date_to: date, limit: int) -> List:
+        """Books with the most net units sold in [date_from, date_to]"""
+        totals = AnalyticsRepository._book_totals()
+        return db.session.query(Book.id, Book.title, *totals).select_from(BookSalesDaily).join(
+            Book, Book.id == BookSalesDaily.book_id
+        ).filter(
+            BookSalesDaily.day.between(date_from, date_to)
+        ).group_by(Book.id, Book.title).order_by(totals[0].desc(), Book.id).limit(limit).all()
@@ -1,4 +1,5 @@
-from app.models import Book, db
+from app.models import Book, Review, db
+from sqlalchemy import func, update, case, bindparam
 from typing import List, Optional, Dict
 from datetime import datetime, timezone
 
@@ -16,6 +17,23 @@ class BookRepository:
         """Get book by ID"""
         return Book.query.filter_by(id=book_id, is_deleted=False).first()
     
+    def get_many_for_update(self, book_ids: List[str]) -> List[Book]:
+        """Lock and return active books in one SELECT ... FOR UPDATE
+        
+        Rows are locked in id order so concurrent checkouts can't deadlock.
+        """
+        return Book.query.filter(
+            Book.id.in_(book_ids),
+            Book.is_deleted == False
+        ).order_by(Book.id).with_for_update().all()
+    
+    def get_many(self, book_ids: List[str]) -> List[Book]:
+        """Active books by id in one SELECT, without locking"""
+        return Book.query.filter(
+            Book.id.in_(book_ids),
+            Book.is_deleted == False
+        ).all()
+    
     def get_all(self) -> List[Book]:
         """Get all books"""
         return Book.query.filter_by(is_deleted=False).all()
@@ -76,9 +94,104 @@ class BookRepository:
         db.session.flush()
         return book
     
+    def reduce_stock_bulk(self, quantities: Dict[str, int], prices: Optional[Dict[str, object]] = None) -> bool:
+        """Reduce stock for several books in a single conditional UPDATE
+        
+        Each row is only touched when stock_quantity >= its quantity and, with
+        prices (book id -> price read earlier), when the price is unchanged;
+        returns False (nothing should be committed) if any book fell short.
+        """
+        if not quantities:
+            return True
+        
+        amount = case(quantities, value=Book.id)
+        conditions = [Book.id.in_(list(quantities)), Book.is_deleted == False, Book.stock_quantity >= amount]
+        if prices:
+            conditions.append(Book.price == case(prices, value=Book.id))
+        result = db.session.execute(
+            update(Book)
+            .where(*conditions)
+            .values(stock_quantity=Book.stock_quantity - amount, version=Book.version + 1,
+                    updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == len(quantities)
+    
+    def increase_stock_bulk(self, quantities: Dict[str, int]) -> int:
+        """Add stock to several books in a single UPDATE, no locks needed
+        
+        Returns:
+            Number of books updated
+        """
+        if not quantities:
+            return 0
+        
+        amount = case(quantities, value=Book.id)
+        result = db.session.execute(
+            update(Book)
+            .where(Book.id.in_(list(quantities)), Book.is_deleted == False)
+            .values(stock_quantity=Book.stock_quantity + amount, version=Book.version + 1,
+                    updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
     def increase_stock(self, book: Book, quantity: int) -> Book:
         """Increase book stock quantity"""
         book.stock_quantity += quantity
         book.updated_at = datetime.now(timezone.utc)
         db.session.flush()
         return book
+    
+    def apply_rating_change(self, book_id: str, old_rating: Optional[int] = None, new_rating: Optional[int] = None) -> None:
+        """Adjust a book's review aggregates in place (atomic SQL increments)
+        
+        Pass new_rating for a new review, old_rating for a removed one, both for an edit.
+        """
+        deltas = {}
+        for rating, sign in ((old_rating, -1), (new_rating, 1)):
+            if rating is None:
+                continue
+            for field, amount in (('rating_count', 1), ('rating_sum', rating), (f'rating_{rating}_count', 1)):
+                deltas[field] = deltas.get(field, 0) + sign * amount
+        
+        values = {getattr(Book, field): getattr(Book, field) + delta for field, delta in deltas.items() if delta}
+        if values:
+            Book.query.filter_by(id=book_id).update(values, synchronize_session=False)
+    
+    def rebuild_rating_aggregates(self) -> int:
+        """Recompute review aggregates for every book from the reviews table
+        
+        Returns:
+            Number of books with at least one review
+        """
+        rows = db.session.query(
+            Review.book_id, Review.rating, func.count(Review.id)
+        ).filter(Review.is_deleted == False).group_by(Review.book_id, Review.rating).all()
+        
+        aggregates = {}
+        for book_id, rating, count in rows:
+            values = aggregates.setdefault(book_id, {
+                'rating_count': 0, 'rating_sum': 0,
+                **{f'rating_{star}_count': 0 for star in range(1, 6)}
+            })
+            values['rating_count'] += count
+            values['rating_sum'] += rating * count
+            values[f'rating_{rating}_count'] = count
+        
+        # Core statements on the table: an ORM bulk UPDATE by primary key would
+        # need every book's current version (version_id_col); these bump it instead
+        books = Book.__table__
+        zeroed = {'rating_count': 0, 'rating_sum': 0, **{f'rating_{star}_count': 0 for star in range(1, 6)}}
+        db.session.execute(update(books).values(**zeroed, version=books.c.version + 1))
+        if aggregates:
+            # One executemany UPDATE for all reviewed books
+            db.session.execute(
+                update(books).where(books.c.id == bindparam('book_id')).values(
+                    {**{column: bindparam(f'new_{column}') for column in zeroed}, 'version': books.c.version + 1}
+                ),
+                [{'book_id': book_id, **{f'new_{column}': values[column] for column in zeroed}}
+                 for book_id, values in aggregates.items()]
+            )
+        db.session.flush()
+        return len(aggregates)
@@ -1,3 +1,59 @@
+from app.models import db
+from app.models.CartHistory import CartHistory
+from typing import List, Optional, Set
+from sqlalchemy import insert
+from datetime import datetime, timezone
+
 class CartHistoryRepository:
     """Repository for CartHistory database operations"""
-    pass
+    
+    @staticmethod
+    def create(cart_history_data: dict) -> CartHistory:
+        """Create a new cart history record"""
+        cart_history = CartHistory(**cart_history_data)
+        db.session.add(cart_history)
+        db.session.commit()
+        return cart_history
+    
+    @staticmethod
+    def create_batch(cart_histories_data: List[dict]) -> int:
+        """Create multiple cart history records with one bulk INSERT (no commit)"""
+        if not cart_histories_data:
+            return 0
+        db.session.execute(insert(CartHistory), cart_histories_data)
+        return len(cart_histories_data)
+    
+    @staticmethod
+    def get_by_id(cart_history_id: str) -> Optional[CartHistory]:
+        """Get cart history by ID"""
+        return CartHistory.query.filter_by(id=cart_history_id, is_deleted=False).first()
+    
+    @staticmethod
+    def get_all() -> List[CartHistory]:
+        """Get all cart history records"""
+        return CartHistory.query.filter_by(is_deleted=False).order_by(CartHistory.created_at.desc()).all()
+    
+    @staticmethod
+    def get_by_user_id(user_id: str) -> List[CartHistory]:
+        """Get all cart history records for a user"""
+        return CartHistory.query.filter_by(user_id=user_id, is_deleted=False).order_by(CartHistory.created_at.desc()).all()
+    
+    @staticmethod
+    def get_by_order_item_id(order_item_id: str) -> List[CartHistory]:
+        """Get cart history records for an order item"""
+        return CartHistory.query.filter_by(order_item_id=order_item_id, is_deleted=False).all()
+    
+    @staticmethod
+    def get_recorded_order_item_ids(order_item_ids: List[str]) -> Set[str]:
+        """Which of the given order items already have a cart history record"""
+        if not order_item_ids:
+            return set()
+        rows = db.session.query(CartHistory.order_item_id).filter(CartHistory.order_item_id.in_(order_item_ids))
+        return {row.order_item_id for row in rows}
+    
+    @staticmethod
+    def delete(cart_history: CartHistory) -> None:
+        """Soft delete cart history"""
+        cart_history.is_deleted = True
+        cart_history.deleted_at = datetime.now(timezone.utc)
+        db.session.commit()
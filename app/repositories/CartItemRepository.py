@@ -1,4 +1,6 @@
-from app.models import CartItem, db
+from app.models import CartItem, Book, db
+from sqlalchemy import func
+from sqlalchemy.orm import contains_eager
 from typing import List, Optional, Dict
 from datetime import datetime, timezone
 
@@ -24,6 +26,45 @@ class CartItemRepository:
         """Get all cart items for a user"""
         return CartItem.query.filter_by(user_id=user_id, is_deleted=False).all()
     
+    def _active_lines(self, query, user_id: str):
+        """Restrict a query to a user's active cart items joined with their available books"""
+        return query.join(Book, Book.id == CartItem.book_id).filter(
+            CartItem.user_id == user_id,
+            CartItem.is_deleted == False,
+            Book.is_deleted == False
+        )
+    
+    def get_with_books(self, user_id: str) -> List[CartItem]:
+        """Get a user's cart items with their books loaded by the same joined query"""
+        query = self._active_lines(CartItem.query, user_id)
+        return query.options(contains_eager(CartItem.book)).order_by(CartItem.created_at).all()
+    
+    def get_summary_lines(self, user_id: str) -> list:
+        """Get a user's cart lines with only the book columns the summary needs"""
+        query = db.session.query(
+            CartItem.id.label('cart_item_id'),
+            Book.id.label('book_id'),
+            Book.title,
+            Book.price,
+            CartItem.quantity,
+            Book.stock_quantity
+        )
+        return self._active_lines(query, user_id).order_by(CartItem.created_at).all()
+    
+    def get_totals(self, user_id: str) -> Dict:
+        """Compute line count, total quantity and total price with SQL aggregates"""
+        query = db.session.query(
+            func.count(CartItem.id),
+            func.coalesce(func.sum(CartItem.quantity), 0),
+            func.coalesce(func.sum(Book.price * CartItem.quantity), 0)
+        )
+        total_items, total_quantity, total_price = self._active_lines(query, user_id).one()
+        return {
+            'total_items': total_items,
+            'total_quantity': int(total_quantity),
+            'total_price': float(total_price)
+        }
+    
     def get_by_user_and_book(self, user_id: str, book_id: str) -> Optional[CartItem]:
         """Get cart item by user and book (check for duplicates)"""
         return CartItem.query.filter_by(
@@ -52,8 +93,38 @@ class CartItemRepository:
         cart_item.deleted_at = datetime.now(timezone.utc)
         db.session.flush()
     
-    def clear_user_cart(self, user_id: str) -> None:
+    def soft_delete_for_user(self, user_id: str, cart_item_ids: Optional[List[str]] = None) -> int:
+        """Soft delete a user's active cart items (or only the given ids) in one UPDATE
+        
+        Cart items already loaded in the session are updated in place, so
+        callers holding them don't see stale is_deleted values.
+        
+        Returns:
+            Number of cart items deleted
+        """
+        query = CartItem.query.filter(CartItem.user_id == user_id, CartItem.is_deleted == False)
+        if cart_item_ids is not None:
+            if not cart_item_ids:
+                return 0
+            query = query.filter(CartItem.id.in_(cart_item_ids))
+        
+        now = datetime.now(timezone.utc)
+        return query.update(
+            {CartItem.is_deleted: True, CartItem.deleted_at: now, CartItem.updated_at: now},
+            synchronize_session='auto'
+        )
+    
+    def clear_user_cart(self, user_id: str) -> int:
         """Clear all cart items for a user (soft delete)"""
-        cart_items = self.get_by_user_id(user_id)
-        for item in cart_items:
-            self.delete(item)
+        return self.soft_delete_for_user(user_id)
+    
+    def purge_abandoned(self, inactive_since: datetime) -> int:
+        """Soft delete every active cart item not touched since the given time, in one UPDATE"""
+        now = datetime.now(timezone.utc)
+        return CartItem.query.filter(
+            CartItem.is_deleted == False,
+            CartItem.updated_at < inactive_since
+        ).update(
+            {CartItem.is_deleted: True, CartItem.deleted_at: now, CartItem.updated_at: now},
+            synchronize_session='auto'
+        )
@@ -0,0 +1,101 @@
+from app.models import db
+from app.models.Job import Job
+from typing import Dict, List, Optional
+from sqlalchemy import func, update
+from datetime import datetime, timezone
+
+class JobRepository:
+    """Repository for Job database operations"""
+    
+    @staticmethod
+    def create(job_data: dict) -> Job:
+        """Add a job to the session (no commit)"""
+        job = Job(**job_data)
+        db.session.add(job)
+        return job
+    
+    @staticmethod
+    def get_by_id(job_id: str) -> Optional[Job]:
+        """Get job by ID"""
+        return db.session.get(Job, job_id)
+    
+    @staticmethod
+    def get_by_idempotency_key(idempotency_key: str) -> Optional[Job]:
+        """Get the job enqueued under an idempotency key"""
+        return Job.query.filter_by(idempotency_key=idempotency_key).first()
+    
+    @staticmethod
+    def get_due_ids(now: datetime, limit: int = 10) -> List[str]:
+        """IDs of pending jobs whose run_at has passed, oldest first"""
+        rows = db.session.query(Job.id).filter(
+            Job.status == 'pending',
+            Job.run_at <= now
+        ).order_by(Job.run_at).limit(limit)
+        return [row.id for row in rows]
+    
+    @staticmethod
+    def claim(job_id: str, worker_id: str, now: datetime) -> bool:
+        """Move a pending job to running for one worker (no commit)
+        
+        Conditional UPDATE, so when several workers race for the same job
+        exactly one of them sees a changed row.
+        """
+        result = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'pending')
+            .values(status='running', attempts=Job.attempts + 1, locked_at=now, locked_by=worker_id, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    @staticmethod
+    def update_if_owned(job_id: str, worker_id: str, attempts: int, values: dict) -> bool:
+        """Update a running job only if worker_id still holds this attempt of it (no commit)
+        
+        A job requeued by release_stale and claimed again has another owner
+        or attempt count, so the first worker's late result changes nothing.
+        """
+        result = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'running', Job.locked_by == worker_id, Job.attempts == attempts)
+            .values(**values, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    @staticmethod
+    def release_stale(locked_before: datetime) -> int:
+        """Return jobs left running by a crashed worker to pending (no commit)"""
+        result = db.session.execute(
+            update(Job)
+            .where(Job.status == 'running', Job.locked_at < locked_before)
+            .values(status='pending', locked_at=None, locked_by=None, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    @staticmethod
+    def retry_failed() -> int:
+        """Requeue every failed job with a fresh set of attempts (no commit)"""
+        now = datetime.now(timezone.utc)
+        result = db.session.execute(
+            update(Job)
+            .where(Job.status == 'failed')
+            .values(status='pending', attempts=0, run_at=now, finished_at=None, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    @staticmethod
+    def delete_finished(finished_before: datetime) -> int:
+        """Delete jobs that finished successfully before a cutoff (no commit)"""
+        return Job.query.filter(
+            Job.status == 'done',
+            Job.finished_at < finished_before
+        ).delete(synchronize_session=False)
+    
+    @staticmethod
+    def count_by_status() -> Dict[str, int]:
+        """Number of jobs per status"""
+        rows = db.session.query(Job.status, func.count(Job.id)).group_by(Job.status)
+        return {status: count for status, count in rows}
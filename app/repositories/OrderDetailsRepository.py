@@ -1,6 +1,10 @@
 from app.models import db
 from app.models.OrderDetails import OrderDetails
-from typing import List, Optional
+from app.models.OrderItem import OrderItem
+from app.models.User import User
+from typing import List, Optional, Set
+from sqlalchemy import func, update
+from sqlalchemy.orm import selectinload
 from datetime import datetime, timezone
 
 class OrderDetailsRepository:
@@ -11,7 +15,7 @@ class OrderDetailsRepository:
         """Create a new order"""
         order = OrderDetails(**order_data)
         db.session.add(order)
-        db.session.commit()
+        db.session.flush()
         return order
     
     @staticmethod
@@ -19,11 +23,79 @@ class OrderDetailsRepository:
         """Get order by ID"""
         return OrderDetails.query.filter_by(id=order_id, is_deleted=False).first()
     
+    @staticmethod
+    def get_with_items(order_id: str, with_books: bool = True) -> Optional[OrderDetails]:
+        """Get order by ID with its items (and their books) loaded by selectinload
+        
+        A fixed number of SELECTs whatever the item count; item.to_dict() and
+        item_count then run no further queries.
+        """
+        items = selectinload(OrderDetails.order_items)
+        if with_books:
+            items = items.selectinload(OrderItem.book)
+        return OrderDetails.query.options(items).filter_by(id=order_id, is_deleted=False).first()
+    
     @staticmethod
     def get_all() -> List[OrderDetails]:
         """Get all orders"""
         return OrderDetails.query.filter_by(is_deleted=False).order_by(OrderDetails.order_date.desc()).all()
     
+    @staticmethod
+    def admin_listing_query(filters: Optional[dict] = None):
+        """Active orders as (order, item_count, user_name) rows for the admin listing
+        
+        item_count is a correlated SUM(quantity) over the order's active items
+        (an index lookup per returned row) and user_name comes from a join, so
+        a page of orders is one statement with no lazy loads.
+        
+        Filters: status, date_from / date_to (datetimes, to is exclusive), city, user_id
+        """
+        filters = filters or {}
+        item_count = db.session.query(
+            func.coalesce(func.sum(OrderItem.quantity), 0)
+        ).filter(
+            OrderItem.order_details_id == OrderDetails.id,
+            OrderItem.is_deleted == False
+        ).correlate(OrderDetails).scalar_subquery()
+        
+        query = db.session.query(
+            OrderDetails, item_count.label('item_count'), User.name.label('user_name')
+        ).outerjoin(User, User.id == OrderDetails.user_id).filter(OrderDetails.is_deleted == False)
+        
+        return OrderDetailsRepository._apply_filters(query, filters)
+    
+    @staticmethod
+    def _apply_filters(query, filters: dict):
+        if filters.get('status'):
+            query = query.filter(OrderDetails.order_status == filters['status'])
+        if filters.get('date_from'):
+            query = query.filter(OrderDetails.order_date >= filters['date_from'])
+        if filters.get('date_to'):
+            query = query.filter(OrderDetails.order_date < filters['date_to'])
+        if filters.get('city'):
+            query = query.filter(OrderDetails.city == filters['city'])
+        if filters.get('user_id'):
+            query = query.filter(OrderDetails.user_id == filters['user_id'])
+        return query
+    
+    @staticmethod
+    def get_many_for_update(order_ids: Optional[List[str]] = None, filters: Optional[dict] = None,
+                            statuses: Optional[List[str]] = None, limit: Optional[int] = None) -> List[OrderDetails]:
+        """Lock and return active orders by id, or matching the admin listing filters
+        
+        statuses further restricts the orders to those in one of these statuses.
+        Rows are locked in id order so concurrent batches can't deadlock.
+        """
+        query = OrderDetails.query.filter(OrderDetails.is_deleted == False)
+        if order_ids is not None:
+            query = query.filter(OrderDetails.id.in_(order_ids))
+        if statuses is not None:
+            query = query.filter(OrderDetails.order_status.in_(statuses))
+        query = OrderDetailsRepository._apply_filters(query, filters or {}).order_by(OrderDetails.id)
+        if limit:
+            query = query.limit(limit)
+        return query.with_for_update().all()
+    
     @staticmethod
     def get_by_user_id(user_id: str) -> List[OrderDetails]:
         """Get all orders for a specific user"""
@@ -58,6 +130,60 @@ class OrderDetailsRepository:
         db.session.commit()
         return order
     
+    @staticmethod
+    def update_status_if(order_id: str, from_statuses: List[str], status: str) -> bool:
+        """Set an order's status only if it currently has one of from_statuses (no commit)
+        
+        Conditional UPDATE, so of two concurrent transitions only one succeeds.
+        """
+        result = db.session.execute(
+            update(OrderDetails)
+            .where(OrderDetails.id == order_id, OrderDetails.is_deleted == False, OrderDetails.order_status.in_(from_statuses))
+            .values(order_status=status, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    @staticmethod
+    def update_status_bulk(order_ids: List[str], from_status: str, status: str) -> int:
+        """Move orders that are still in from_status to status in one UPDATE (no commit)
+        
+        Returns:
+            Number of orders updated
+        """
+        if not order_ids:
+            return 0
+        result = db.session.execute(
+            update(OrderDetails)
+            .where(OrderDetails.id.in_(order_ids), OrderDetails.is_deleted == False, OrderDetails.order_status == from_status)
+            .values(order_status=status, updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    @staticmethod
+    def get_existing_ids(order_ids: List[str]) -> Set[str]:
+        """Ids of active orders among order_ids, in one SELECT"""
+        if not order_ids:
+            return set()
+        return {row.id for row in db.session.query(OrderDetails.id).filter(
+            OrderDetails.id.in_(order_ids),
+            OrderDetails.is_deleted == False
+        )}
+    
+    @staticmethod
+    def update_tracking_numbers_bulk(rows: List[dict]) -> int:
+        """Set tracking numbers with one executemany UPDATE by primary key (no commit)
+        
+        Args:
+            rows: dicts with 'id' and 'tracking_number' of existing orders
+        """
+        if not rows:
+            return 0
+        now = datetime.now(timezone.utc)
+        db.session.execute(update(OrderDetails), [{**row, 'updated_at': now} for row in rows])
+        return len(rows)
+    
     @staticmethod
     def delete(order: OrderDetails) -> None:
         """Soft delete order"""
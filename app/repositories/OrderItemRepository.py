@@ -1,6 +1,7 @@
 from app.models import db
 from app.models.OrderItem import OrderItem
-from typing import List, Optional
+from typing import Dict, List, Optional
+from sqlalchemy import func, insert
 from datetime import datetime, timezone
 
 class OrderItemRepository:
@@ -15,12 +16,12 @@ class OrderItemRepository:
         return order_item
     
     @staticmethod
-    def create_batch(order_items_data: List[dict]) -> List[OrderItem]:
-        """Create multiple order items at once"""
-        order_items = [OrderItem(**item_data) for item_data in order_items_data]
-        db.session.add_all(order_items)
-        db.session.commit()
-        return order_items
+    def create_batch(order_items_data: List[dict]) -> int:
+        """Create multiple order items with one bulk INSERT (no commit)"""
+        if not order_items_data:
+            return 0
+        db.session.execute(insert(OrderItem), order_items_data)
+        return len(order_items_data)
     
     @staticmethod
     def get_by_id(order_item_id: str) -> Optional[OrderItem]:
@@ -40,6 +41,18 @@ class OrderItemRepository:
             is_deleted=False
         ).all()
     
+    @staticmethod
+    def get_quantities_by_order_ids(order_ids: List[str]) -> Dict[str, int]:
+        """Total quantity per book over several orders' active items, in one grouped query"""
+        if not order_ids:
+            return {}
+        rows = db.session.query(OrderItem.book_id, func.sum(OrderItem.quantity)).filter(
+            OrderItem.order_details_id.in_(order_ids),
+            OrderItem.is_deleted == False,
+            OrderItem.book_id.isnot(None)
+        ).group_by(OrderItem.book_id).all()
+        return {book_id: int(quantity) for book_id, quantity in rows}
+    
     @staticmethod
     def get_by_user_id(user_id: str) -> List[OrderItem]:
         """Get all order items for a specific user"""
@@ -0,0 +1,136 @@
+from flask import Blueprint, jsonify, request
+from app.services.AnalyticsService import AnalyticsService
+from app.utils.auth import admin_required
+from app.utils.cache import catalog_cache
+from app.utils.pagination import parse_limit
+from datetime import datetime, timezone, timedelta
+
+admin_bp = Blueprint("admin", __name__)
+analytics_service = AnalyticsService()
+
+DEFAULT_ANALYTICS_DAYS = 30
+
+# GET /admin/cache - Catalog cache counters for the worker serving the request (Admin only)
+@admin_bp.route('/admin/cache', methods=['GET'])
+@admin_required()
+def get_cache_stats():
+    """Get catalog cache hit/miss counters - Admin only"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': catalog_cache.stats(),
+            'message': 'Cache stats retrieved successfully'
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Failed to retrieve cache stats'
+        }), 500
+
+# DELETE /admin/cache - Flush the catalog cache of the worker serving the request (Admin only)
+@admin_bp.route('/admin/cache', methods=['DELETE'])
+@admin_required()
+def clear_cache():
+    """Clear the catalog cache - Admin only"""
+    try:
+        catalog_cache.invalidate()
+        return jsonify({
+            'success': True,
+            'message': 'Cache cleared successfully'
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Failed to clear cache'
+        }), 500
+
+def _date_range():
+    """?date_from= / ?date_to= (YYYY-MM-DD, inclusive), default the last 30 days (UTC)"""
+    values = {}
+    for name in ('date_from', 'date_to'):
+        value = request.args.get(name)
+        if value:
+            try:
+                values[name] = datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                raise ValueError(f'Invalid {name} format, expected YYYY-MM-DD')
+    date_to = values.get('date_to') or datetime.now(timezone.utc).date()
+    date_from = values.get('date_from') or date_to - timedelta(days=DEFAULT_ANALYTICS_DAYS - 1)
+    if date_from > date_to:
+        raise ValueError('date_from must not be after date_to')
+    return date_from, date_to
+
+def _analytics_response(fetch, name):
+    """Run fetch(date_from, date_to) over the requested range and wrap the result"""
+    try:
+        date_from, date_to = _date_range()
+        return jsonify({
+            'success': True,
+            'data': fetch(date_from, date_to),
+            'date_from': date_from.isoformat(),
+            'date_to': date_to.isoformat(),
+            'message': f'{name} retrieved successfully'
+        }), 200
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Validation error'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': f'Failed to retrieve {name.lower()}'
+        }), 500
+
+# GET /admin/analytics/summary - Orders, revenue and average order value (Admin only)
+@admin_bp.route('/admin/analytics/summary', methods=['GET'])
+@admin_required()
+def get_sales_summary():
+    """Sales totals for a date range - Admin only
+    
+    Query Parameters (all analytics endpoints):
+    - date_from / date_to: YYYY-MM-DD, inclusive (default: the last 30 days)
+    """
+    return _analytics_response(analytics_service.get_summary, 'Sales summary')
+
+# GET /admin/analytics/revenue/daily - Revenue per day (Admin only)
+@admin_bp.route('/admin/analytics/revenue/daily', methods=['GET'])
+@admin_required()
+def get_daily_revenue():
+    """Revenue and orders per day - Admin only"""
+    return _analytics_response(analytics_service.get_revenue_by_day, 'Daily revenue')
+
+# GET /admin/analytics/revenue/cities - Revenue per shipping city (Admin only)
+@admin_bp.route('/admin/analytics/revenue/cities', methods=['GET'])
+@admin_required()
+def get_city_revenue():
+    """Revenue and orders per city - Admin only"""
+    return _analytics_response(analytics_service.get_revenue_by_city, 'City revenue')
+
+# GET /admin/analytics/revenue/categories - Revenue per book category (Admin only)
+@admin_bp.route('/admin/analytics/revenue/categories', methods=['GET'])
+@admin_required()
+def get_category_revenue():
+    """Units and revenue per book category - Admin only"""
+    return _analytics_response(analytics_service.get_revenue_by_category, 'Category revenue')
+
+# GET /admin/analytics/top-books - Best sellers (Admin only)
+@admin_bp.route('/admin/analytics/top-books', methods=['GET'])
+@admin_required()
+def get_top_books():
+    """Books with the most units sold - Admin only
+    
+    Query Parameters:
+    - limit: Number of books (default 10, max 100)
+    """
+    try:
+        limit = parse_limit(request.args.get('limit'), default=10)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e), 'message': 'Validation error'}), 400
+    return _analytics_response(
+        lambda date_from, date_to: analytics_service.get_top_books(date_from, date_to, limit), 'Top books'
+    )
@@ -1,8 +1,11 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt, decode_token, current_user
 from app.models import User, db
 from app.utils.enums import enums
-from app import bcrypt
+from app.utils.auth import token_claims, get_current_user_model, forget_user, bump_token_version
+from app.utils.blocklist import token_revocations
+from app.utils.passwords import password_hasher, PasswordHasherBusy, busy_response
+from app.utils.ratelimit import rate_limit, rate_limiter
 import re
 
 auth_bp = Blueprint('auth', __name__)
@@ -23,6 +26,7 @@ def validate_password_strength(password):
     return True, "Valid"
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limit('register')
 def register():
     """Register a new user"""
     try:
@@ -47,7 +51,7 @@ def register():
         if User.query.filter_by(email=data['email']).first():
             return jsonify({'error': 'Email already exists'}), 409
         
-        hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+        hashed_password = password_hasher.hash(data['password'])
         
         new_user = User(
             username=data['username'],
@@ -70,12 +74,16 @@ def register():
             'user': new_user.to_dict()
         }), 201
         
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit('login', by_username=True)
 def login():
     """Login user and return JWT tokens"""
     try:
@@ -94,11 +102,25 @@ def login():
         if not user.is_active:
             return jsonify({'error': 'Account is disabled'}), 403
         
-        if not bcrypt.check_password_hash(user.password, data['password']):
+        if not password_hasher.check(user.password, data['password']):
             return jsonify({'error': 'Invalid credentials'}), 401
         
-        access_token = create_access_token(identity=user.id)
-        refresh_token = create_refresh_token(identity=user.id)
+        # Only failed attempts count towards the per-username lockout
+        rate_limiter.release('user')
+        
+        # Upgrade hashes made with a different cost than BCRYPT_LOG_ROUNDS;
+        # the password is already verified, so when the hasher is saturated
+        # skip the upgrade and leave it to a later login instead of failing
+        if password_hasher.needs_rehash(user.password):
+            try:
+                user.password = password_hasher.hash(data['password'])
+                db.session.commit()
+            except PasswordHasherBusy:
+                db.session.rollback()
+        
+        claims = token_claims(user)
+        access_token = create_access_token(identity=user.id, additional_claims=claims)
+        refresh_token = create_refresh_token(identity=user.id, additional_claims=claims)
         
         return jsonify({
             'message': 'Login successful',
@@ -113,33 +135,87 @@ def login():
             }
         }), 200
         
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
 
 @auth_bp.route('/refresh', methods=['POST'])
+@rate_limit('refresh')
 @jwt_required(refresh=True)
 def refresh():
     """Refresh access token using refresh token"""
     current_user_id = get_jwt_identity()
-    new_access_token = create_access_token(identity=current_user_id)
+    
+    # Re-read the user so the new token carries the current role
+    user = User.query.filter_by(id=current_user_id, is_deleted=False).first()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    if not user.is_active:
+        return jsonify({'error': 'Account is disabled'}), 403
+    
+    new_access_token = create_access_token(identity=current_user_id, additional_claims=token_claims(user))
     
     return jsonify({
         'access_token': new_access_token
     }), 200
 
 
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required(verify_type=False)
+def logout():
+    """Revoke the presented token, and the refresh token in the body if given"""
+    try:
+        payloads = [get_jwt()]
+        
+        data = request.get_json(silent=True) or {}
+        if data.get('refresh_token'):
+            try:
+                refresh_payload = decode_token(data['refresh_token'])
+            except Exception:
+                refresh_payload = None  # Already invalid, nothing to revoke
+            if refresh_payload and refresh_payload['sub'] == payloads[0]['sub']:
+                payloads.append(refresh_payload)
+        
+        token_revocations.revoke(payloads)
+        return jsonify({'message': 'Logged out successfully'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+
+@auth_bp.route('/logout-all', methods=['POST'])
+@jwt_required()
+def logout_all():
+    """Revoke every access and refresh token issued to the current user"""
+    try:
+        user = get_current_user_model()
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        # Older tokens no longer match the user's token version
+        bump_token_version(user)
+        db.session.commit()
+        forget_user(user.id)
+        
+        # Blocklist the presented token too, so other workers drop it within the sync interval
+        token_revocations.revoke([get_jwt()])
+        return jsonify({'message': 'Logged out of all sessions'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
-    """Get current authenticated user"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
-    
-    return jsonify(user.to_dict()), 200
+    """Get current authenticated user (served from the cached user snapshot)"""
+    return jsonify(current_user.to_dict()), 200
 
 
 @auth_bp.route('/change-password', methods=['PUT'])
@@ -147,8 +223,7 @@ def get_current_user():
 def change_password():
     """Change user password"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_user_model()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -158,14 +233,18 @@ def change_password():
         if not data.get('old_password') or not data.get('new_password'):
             return jsonify({'error': 'Old password and new password are required'}), 400
         
-        if not bcrypt.check_password_hash(user.password, data['old_password']):
+        if not password_hasher.check(user.password, data['old_password']):
             return jsonify({'error': 'Invalid old password'}), 401
         
-        user.password = bcrypt.generate_password_hash(data['new_password']).decode('utf-8')
+        user.password = password_hasher.hash(data['new_password'])
         db.session.commit()
+        forget_user(user.id)
         
         return jsonify({'message': 'Password changed successfully'}), 200
         
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
@@ -176,8 +255,7 @@ def change_password():
 def update_profile():
     """Update user profile"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = get_current_user_model()
         
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -206,6 +284,7 @@ def update_profile():
             user.province = data['province']
         
         db.session.commit()
+        forget_user(user.id)
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.AuthorService import AuthorService
 from app.utils.enums import is_admin
+from app.utils.http import conditional_json
 
 author_bp = Blueprint("authors", __name__)
 author_service = AuthorService()
@@ -17,12 +18,12 @@ def get_authors():
         else:
             authors = author_service.get_all_authors()
         
-        return jsonify({
+        return conditional_json({
             'success': True,
             'data': authors,
             'message': 'Authors retrieved successfully',
             'total': len(authors)
-        }), 200
+        })
     except Exception as e:
         return jsonify({
             'success': False,
@@ -2,6 +2,8 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.BookService import BookService
 from app.utils.enums import is_admin
+from app.utils.pagination import parse_limit
+from app.utils.http import conditional_json
 
 book_bp = Blueprint("books", __name__)
 
@@ -16,8 +18,12 @@ def get_books():
     - min_price: Minimum price (PKR)
     - max_price: Maximum price (PKR)
     - in_stock: Only show books in stock (true/false)
+    - min_rating: Minimum average review rating (1-5)
     - search: Search in title, ISBN, description
     - include_details: Include author and category details (true/false)
+    - sort: newest (default), title, price_asc, price_desc, rating
+    - limit: Page size (default 20, max 100)
+    - cursor: next_cursor from the previous page
     """
     try:
         # Get query parameters
@@ -38,21 +44,34 @@ def get_books():
                 return jsonify({'error': 'Invalid max_price format'}), 400
         if request.args.get('in_stock'):
             filters['in_stock'] = request.args.get('in_stock').lower() == 'true'
+        if request.args.get('min_rating'):
+            try:
+                filters['min_rating'] = float(request.args.get('min_rating'))
+            except ValueError:
+                return jsonify({'error': 'Invalid min_rating format'}), 400
         
         search = request.args.get('search')
         include_details = request.args.get('include_details', 'true').lower() == 'true'
+        limit = parse_limit(request.args.get('limit'))
         
-        books = BookService.get_all_books(
+        page = BookService.get_all_books(
             filters=filters if filters else None,
             search=search,
-            include_details=include_details
+            include_details=include_details,
+            limit=limit,
+            cursor=request.args.get('cursor'),
+            sort=request.args.get('sort', BookService.DEFAULT_SORT)
         )
         
-        return jsonify({
-            'books': books,
-            'count': len(books)
-        }), 200
+        return conditional_json({
+            'books': page['books'],
+            'count': len(page['books']),
+            'limit': limit,
+            'next_cursor': page['next_cursor']
+        })
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -66,7 +85,7 @@ def get_book(book_id):
         if not book:
             return jsonify({'error': 'Book not found'}), 404
         
-        return jsonify({'book': book}), 200
+        return conditional_json({'book': book})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -74,24 +93,33 @@ def get_book(book_id):
 # GET search books
 @book_bp.route('/books/search', methods=['GET'])
 def search_books():
-    """Search books by title, ISBN, or description
+    """Search books by title, ISBN, author, category or description
+    
+    Results are ordered by relevance.
     
     Query Parameters:
     - q: Search query string (required)
+    - limit: Page size (default 20, max 100)
+    - cursor: next_cursor from the previous page
     """
     try:
         query = request.args.get('q')
         if not query:
             return jsonify({'error': 'Search query (q) is required'}), 400
         
-        books = BookService.search_books(query)
+        limit = parse_limit(request.args.get('limit'))
+        page = BookService.search_books(query, limit=limit, cursor=request.args.get('cursor'))
         
         return jsonify({
-            'books': books,
-            'count': len(books),
-            'query': query
+            'books': page['books'],
+            'count': len(page['books']),
+            'query': query,
+            'limit': limit,
+            'next_cursor': page['next_cursor']
         }), 200
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.CartService import CartService
+from app.utils.idempotency import idempotent
 
 cart_bp = Blueprint("cart", __name__)
 
@@ -25,10 +26,11 @@ def get_cart():
 @cart_bp.route('/cart/summary', methods=['GET'])
 @jwt_required()
 def get_cart_summary():
-    """Get cart summary with totals"""
+    """Get cart summary with totals (?compact=true returns only the totals)"""
     try:
         current_user_id = get_jwt_identity()
-        summary = CartService.get_cart_summary(current_user_id)
+        compact = request.args.get('compact', 'false').lower() == 'true'
+        summary = CartService.get_cart_summary(current_user_id, compact=compact)
         
         return jsonify(summary), 200
         
@@ -38,6 +40,7 @@ def get_cart_summary():
 # POST add item to cart
 @cart_bp.route('/cart/items', methods=['POST'])
 @jwt_required()
+@idempotent
 def add_to_cart():
     """Add item to cart or update quantity if already exists"""
     try:
@@ -140,9 +143,9 @@ def clear_cart():
     """Clear all items from user's cart"""
     try:
         current_user_id = get_jwt_identity()
-        CartService.clear_cart(current_user_id)
+        removed = CartService.clear_cart(current_user_id)
         
-        return jsonify({'message': 'Cart cleared successfully'}), 200
+        return jsonify({'message': 'Cart cleared successfully', 'removed': removed}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
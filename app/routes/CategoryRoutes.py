@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.CategoryService import CategoryService
 from app.utils.enums import is_admin
+from app.utils.http import conditional_json
 
 category_bp = Blueprint("categories", __name__)
 category_service = CategoryService()
@@ -18,12 +19,12 @@ def get_categories():
         else:
             categories = category_service.get_all_categories()
         
-        return jsonify({
+        return conditional_json({
             'success': True,
             'data': categories,
             'message': 'Categories retrieved successfully',
             'total': len(categories)
-        }), 200
+        })
     except Exception as e:
         return jsonify({
             'success': False,
@@ -1,14 +1,42 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.OrderService import OrderService
+from app.utils.auth import admin_required
 from app.utils.enums import is_admin
+from app.utils.idempotency import idempotent
+from app.utils.pagination import parse_limit
+from datetime import datetime, timedelta
+import io
 
 order_bp = Blueprint("orders", __name__)
 order_service = OrderService()
 
+def _order_filters(values):
+    """Admin order filters (status, date_from / date_to as YYYY-MM-DD inclusive, city, user_id)"""
+    filters = {}
+    status = values.get('status')
+    if status:
+        if status not in OrderService.ORDER_STATUSES:
+            raise ValueError(f'Invalid status. Must be one of: {", ".join(OrderService.ORDER_STATUSES)}')
+        filters['status'] = status
+    for name in ('date_from', 'date_to'):
+        if values.get(name):
+            try:
+                day = datetime.strptime(values.get(name), '%Y-%m-%d')
+            except (ValueError, TypeError):
+                raise ValueError(f'Invalid {name} format, expected YYYY-MM-DD')
+            # date_to includes the whole day
+            filters[name] = day + timedelta(days=1) if name == 'date_to' else day
+    if values.get('city'):
+        filters['city'] = values.get('city')
+    if values.get('user_id'):
+        filters['user_id'] = values.get('user_id')
+    return filters
+
 # POST /orders/checkout - Create order from cart
 @order_bp.route('/orders/checkout', methods=['POST'])
 @jwt_required()
+@idempotent
 def checkout():
     """Checkout - Create order from cart"""
     try:
@@ -135,32 +163,39 @@ def get_order(order_id):
             'message': 'Failed to retrieve order'
         }), 500
 
-# GET /admin/orders - Get all orders (Admin only)
+# GET /admin/orders - List orders (Admin only)
 @order_bp.route('/admin/orders', methods=['GET'])
-@jwt_required()
+@admin_required()
 def get_all_orders():
-    """Get all orders - Admin only"""
+    """List orders newest first, one page at a time - Admin only
+    
+    Query Parameters:
+    - status: Pending, Confirmed, Shipped, Delivered or Cancelled
+    - date_from / date_to: Order date range, YYYY-MM-DD (inclusive)
+    - city: Shipping city
+    - user_id: Orders of one customer
+    - limit: Page size (default 20, max 100)
+    - cursor: next_cursor from the previous page
+    """
     try:
-        if not is_admin():
-            return jsonify({
-                'success': False,
-                'error': 'Admin access required',
-                'message': 'Permission denied'
-            }), 403
-        
-        # Check if filtering by status
-        status = request.args.get('status')
-        if status:
-            orders = order_service.get_orders_by_status(status)
-        else:
-            orders = order_service.get_all_orders()
+        filters = _order_filters(request.args)
+        limit = parse_limit(request.args.get('limit'))
+        page = order_service.get_admin_orders(filters, limit=limit, cursor=request.args.get('cursor'))
         
         return jsonify({
             'success': True,
-            'data': orders,
+            'data': page['orders'],
             'message': 'Orders retrieved successfully',
-            'total': len(orders)
+            'count': len(page['orders']),
+            'limit': limit,
+            'next_cursor': page['next_cursor']
         }), 200
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Validation error'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -219,6 +254,56 @@ def update_order_status(order_id):
             'message': 'Failed to update order status'
         }), 500
 
+# PUT /admin/orders/status - Update the status of many orders (Admin only)
+@order_bp.route('/admin/orders/status', methods=['PUT'])
+@admin_required()
+def bulk_update_order_status():
+    """Move many orders to one status in one transaction - Admin only
+    
+    Request Body:
+    - status: Target status
+    - order_ids: List of order ids (at most 500), or
+    - filter: Same fields as the order listing (status, date_from, date_to,
+      city, user_id); up to 500 matching orders per call, repeat while has_more
+    
+    Orders that can't make the transition are reported in results and
+    don't stop the others.
+    """
+    try:
+        data = request.get_json() or {}
+        status = data.get('status')
+        
+        if not status:
+            return jsonify({
+                'success': False,
+                'error': 'Status is required',
+                'message': 'Missing required field'
+            }), 400
+        
+        if data.get('filter') is not None and not isinstance(data['filter'], dict):
+            raise ValueError('filter must be an object')
+        filters = _order_filters(data['filter']) if data.get('filter') else None
+        result = order_service.bulk_update_order_status(status, order_ids=data.get('order_ids'), filters=filters)
+        
+        return jsonify({
+            'success': True,
+            'data': result,
+            'message': f'{result["updated"]} orders updated, {result["failed"]} failed'
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Validation error'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Failed to update order status'
+        }), 500
+
 # PUT /admin/orders/<order_id>/tracking - Update tracking number (Admin only)
 @order_bp.route('/admin/orders/<order_id>/tracking', methods=['PUT'])
 @jwt_required()
@@ -264,6 +349,52 @@ def update_tracking_number(order_id):
             'message': 'Failed to update tracking number'
         }), 500
 
+# POST /admin/orders/tracking/import - Set tracking numbers from a courier CSV (Admin only)
+@order_bp.route('/admin/orders/tracking/import', methods=['POST'])
+@admin_required()
+def import_tracking_numbers():
+    """Import tracking numbers from CSV - Admin only
+    
+    Send the CSV as the request body (Content-Type: text/csv, streamed) or
+    as a multipart upload in the 'file' field. The header row must include
+    order_id and tracking_number; other columns are ignored.
+    
+    Rows that fail are listed in errors and don't stop the others.
+    """
+    try:
+        if request.mimetype in ('text/csv', 'text/plain'):
+            raw = io.BufferedReader(request.stream)
+        elif 'file' in request.files:
+            raw = request.files['file'].stream
+        else:
+            return jsonify({
+                'success': False,
+                'error': 'Send a text/csv body or upload the CSV as file',
+                'message': 'Missing required field'
+            }), 400
+        
+        lines = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        result = order_service.import_tracking_numbers(lines)
+        
+        return jsonify({
+            'success': True,
+            'data': result,
+            'message': f'{result["updated"]} tracking numbers updated, {result["failed"]} rows failed'
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Validation error'
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'message': 'Failed to import tracking numbers'
+        }), 500
+
 # POST /orders/<order_id>/cancel - Cancel order
 @order_bp.route('/orders/<order_id>/cancel', methods=['POST'])
 @jwt_required()
@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.ReviewService import ReviewService
 from app.utils.enums import is_admin
+from app.utils.http import conditional_json
+from app.utils.idempotency import idempotent
 
 review_bp = Blueprint('reviews', __name__)
 review_service = ReviewService()
@@ -48,7 +50,7 @@ def get_book_rating_summary(book_id):
     """Get rating summary for a book"""
     try:
         summary = review_service.get_book_rating_summary(book_id)
-        return jsonify({'success': True, 'data': summary}), 200
+        return conditional_json({'success': True, 'data': summary})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -74,6 +76,7 @@ def get_user_reviews(user_id):
 
 @review_bp.route('/', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_review():
     """Create a new review"""
     try:
@@ -1,7 +1,8 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from app.services.UserService import UserService
-from app.utils.enums import is_admin, enums
+from app.utils.enums import is_admin
+from app.utils.passwords import PasswordHasherBusy, busy_response
 from app.models import User
 import re
 
@@ -50,6 +51,10 @@ def get_user(user_id):
         if current_user_id != user_id and not is_admin():
             return jsonify({'error': 'Access denied'}), 403
         
+        # Own profile comes from the cached user snapshot
+        if current_user_id == user_id:
+            return jsonify({'user': current_user.to_dict()}), 200
+        
         user = UserService.get_user_by_id(user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
@@ -103,6 +108,8 @@ def create_user():
             'user': new_user.to_dict()
         }), 201
         
+    except PasswordHasherBusy:
+        return busy_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -113,7 +120,6 @@ def update_user(user_id):
     """Update user (Admin or own profile)"""
     try:
         current_user_id = get_jwt_identity()
-        current_user = User.query.get(current_user_id)
         
         # Users can update their own profile, admins can update any profile
         if current_user_id != user_id and not is_admin():
@@ -136,7 +142,7 @@ def update_user(user_id):
                 return jsonify({'error': 'Email already exists'}), 409
         
         # Non-admin users cannot change their role
-        if data.get('role') is not None and current_user_id == user_id and current_user.role < enums.UserRole.isAdmin:
+        if data.get('role') is not None and current_user_id == user_id and not is_admin():
             return jsonify({'error': 'Cannot modify your own role'}), 403
         
         updated_user = UserService.update_user(user_id, data)
@@ -148,6 +154,8 @@ def update_user(user_id):
             'user': updated_user.to_dict()
         }), 200
         
+    except PasswordHasherBusy:
+        return busy_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -180,15 +188,9 @@ def delete_user(user_id):
 @users_bp.route('/users/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
-    """Get current logged-in user's profile"""
+    """Get current logged-in user's profile (served from the cached user snapshot)"""
     try:
-        current_user_id = get_jwt_identity()
-        user = UserService.get_user_by_id(current_user_id)
-        
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
-        return jsonify({'user': user.to_dict()}), 200
+        return jsonify({'user': current_user.to_dict()}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -229,5 +231,7 @@ def update_current_user():
             'user': updated_user.to_dict()
         }), 200
         
+    except PasswordHasherBusy:
+        return busy_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
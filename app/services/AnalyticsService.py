@@ -0,0 +1,140 @@
+from app.repositories.AnalyticsRepository import AnalyticsRepository
+from app.repositories.OrderItemRepository import OrderItemRepository
+from app.models import db, OrderDetails, SalesDaily, BookSalesDaily, Job
+from typing import Dict, List, Optional
+from datetime import date
+
+class AnalyticsService:
+    """Admin sales analytics served from the daily rollup tables
+    
+    OrderService queues an 'analytics.order_status' job with every status
+    change (creation included); the job adds the order's contribution to
+    sales_daily (per day and city) and book_sales_daily (per day and book).
+    An order always counts as placed on its order day, and in addition as
+    cancelled or delivered, so reports read a handful of rows per day
+    instead of scanning orders. Days are UTC order dates.
+    """
+    
+    TASK = 'analytics.order_status'
+    
+    def __init__(self):
+        self.repository = AnalyticsRepository()
+        self.order_item_repository = OrderItemRepository()
+    
+    @staticmethod
+    def _buckets(status: Optional[str]) -> Dict[str, int]:
+        """Which counters an order in this status contributes to (None = no order)"""
+        if status is None:
+            return {}
+        buckets = {'': 1}
+        if status == 'Cancelled':
+            buckets['cancelled_'] = 1
+        elif status == 'Delivered':
+            buckets['delivered_'] = 1
+        return buckets
+    
+    def apply_status_change(self, order_id: str, from_status: Optional[str], to_status: str) -> None:
+        """Move an order's contribution from one status to another (no commit)"""
+        order = db.session.get(OrderDetails, order_id)
+        if not order or order.is_deleted:
+            return
+        
+        before, after = self._buckets(from_status), self._buckets(to_status)
+        changes = {prefix: after.get(prefix, 0) - before.get(prefix, 0) for prefix in set(before) | set(after)}
+        changes = {prefix: sign for prefix, sign in changes.items() if sign}
+        if not changes:
+            return
+        
+        day = order.order_date.date()
+        deltas = {}
+        for prefix, sign in changes.items():
+            deltas[f'{prefix}orders'] = sign
+            deltas[f'{prefix}revenue'] = sign * order.total_amount
+        self.repository.add(SalesDaily, {'day': day, 'city': order.city}, deltas)
+        
+        # Only placed and cancelled are tracked per book
+        per_book = {}
+        for item in self.order_item_repository.get_by_order_id(order_id):
+            quantity, revenue = per_book.get(item.book_id, (0, 0))
+            per_book[item.book_id] = (quantity + item.quantity, revenue + item.unit_price * item.quantity)
+        for book_id, (quantity, revenue) in per_book.items():
+            if book_id is None:
+                continue
+            deltas = {}
+            for prefix, sign in changes.items():
+                if prefix != 'delivered_':
+                    deltas[f'{prefix}quantity'] = sign * quantity
+                    deltas[f'{prefix}revenue'] = sign * revenue
+            self.repository.add(BookSalesDaily, {'day': day, 'book_id': book_id}, deltas)
+    
+    def rebuild(self) -> int:
+        """Recompute the rollups from all orders and commit
+        
+        Queued status-change jobs are already reflected in the orders, so
+        they are dropped in the same transaction. Jobs a worker is running at
+        that moment would be counted twice; stop the worker for a rebuild.
+        
+        Returns:
+            Number of (day, city) rows
+        """
+        try:
+            Job.query.filter(Job.name == self.TASK, Job.status == 'pending').delete(synchronize_session=False)
+            count = self.repository.rebuild()
+            db.session.commit()
+            return count
+        except Exception as e:
+            db.session.rollback()
+            raise e
+    
+    @staticmethod
+    def _order_metrics(row) -> Dict:
+        orders = int(row.orders or 0)
+        revenue = float(row.revenue or 0)
+        cancelled_orders = int(row.cancelled_orders or 0)
+        cancelled_revenue = float(row.cancelled_revenue or 0)
+        net_orders = orders - cancelled_orders
+        net_revenue = revenue - cancelled_revenue
+        return {
+            'orders': net_orders,
+            'revenue': round(net_revenue, 2),
+            'cancelled_orders': cancelled_orders,
+            'cancelled_revenue': round(cancelled_revenue, 2),
+            'delivered_orders': int(row.delivered_orders or 0),
+            'delivered_revenue': round(float(row.delivered_revenue or 0), 2),
+            'average_order_value': round(net_revenue / net_orders, 2) if net_orders else 0,
+        }
+    
+    def get_summary(self, date_from: date, date_to: date) -> Dict:
+        """Totals and average order value over a date range (cancelled orders excluded)"""
+        return self._order_metrics(self.repository.totals(date_from, date_to))
+    
+    def get_revenue_by_day(self, date_from: date, date_to: date) -> List[Dict]:
+        """Per-day totals, oldest first (days without orders are omitted)"""
+        return [
+            {'day': row.day.isoformat(), **self._order_metrics(row)}
+            for row in self.repository.totals_by_day(date_from, date_to)
+        ]
+    
+    def get_revenue_by_city(self, date_from: date, date_to: date) -> List[Dict]:
+        """Per-city totals, highest revenue first"""
+        cities = [{'city': row.city, **self._order_metrics(row)} for row in self.repository.totals_by_city(date_from, date_to)]
+        return sorted(cities, key=lambda city: city['revenue'], reverse=True)
+    
+    def get_revenue_by_category(self, date_from: date, date_to: date) -> List[Dict]:
+        """Net units and revenue per book category, highest revenue first"""
+        categories = [{
+            'category_id': row.id,
+            'category': row.category_type or 'Uncategorized',
+            'quantity': int(row.quantity or 0),
+            'revenue': round(float(row.revenue or 0), 2),
+        } for row in self.repository.book_totals_by_category(date_from, date_to)]
+        return sorted(categories, key=lambda category: category['revenue'], reverse=True)
+    
+    def get_top_books(self, date_from: date, date_to: date, limit: int = 10) -> List[Dict]:
+        """Best sellers by net units"""
+        return [{
+            'book_id': row.id,
+            'title': row.title,
+            'quantity': int(row.quantity or 0),
+            'revenue': round(float(row.revenue or 0), 2),
+        } for row in self.repository.top_books(date_from, date_to, limit)]
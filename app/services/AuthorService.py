@@ -1,5 +1,7 @@
 from flask import jsonify
 from app.repositories.AuthorRepository import AuthorRepository
+from app.services.SearchService import BookSearchService
+from app.utils.cache import catalog_cache
 from app.models import db
 from typing import List, Optional, Dict
 
@@ -11,8 +13,11 @@ class AuthorService:
     
     def get_all_authors(self) -> List[Dict]:
         """Get all active authors"""
-        authors = self.author_repository.get_all_authors()
-        return [author.to_dict() for author in authors]
+        def load():
+            authors = self.author_repository.get_all_authors()
+            return [author.to_dict() for author in authors]
+        
+        return catalog_cache.get_or_load(('authors', 'list'), load)
     
     def get_author_by_id(self, author_id: str) -> Optional[Dict]:
         """Get author by ID"""
@@ -23,8 +28,12 @@ class AuthorService:
         """Get author by name"""
         if not author_name:
             return None
-        author = self.author_repository.get_author_by_name(author_name)
-        return author.to_dict() if author else None
+        
+        def load():
+            author = self.author_repository.get_author_by_name(author_name)
+            return author.to_dict() if author else None
+        
+        return catalog_cache.get_or_load(('authors', 'name', author_name.lower()), load)
     
     def search_authors(self, name: str) -> List[Dict]:
         """Search authors by name"""
@@ -45,6 +54,7 @@ class AuthorService:
         
         author = self.author_repository.create(author_data)
         db.session.commit()
+        catalog_cache.invalidate('authors', 'list')
         return author.to_dict()
     
     def update_author(self, author_name: str, data: dict) -> Optional[Dict]:
@@ -64,8 +74,15 @@ class AuthorService:
             'author_name': data.get('author_name', author.author_name)
         }
         
+        name_changed = update_data['author_name'] != author.author_name
         updated_author = self.author_repository.update(author, update_data)
+        if name_changed:
+            BookSearchService.reindex_author(updated_author.id)
         db.session.commit()
+        catalog_cache.invalidate('authors')
+        if name_changed:
+            # Book dicts embed the author name
+            catalog_cache.invalidate('books')
         return updated_author.to_dict()
     
     def delete_author(self, author_name: str) -> bool:
@@ -80,4 +97,5 @@ class AuthorService:
         
         self.author_repository.delete_author(author)
         db.session.commit()
+        catalog_cache.invalidate('authors')
         return True
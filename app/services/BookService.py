@@ -1,16 +1,64 @@
 from app.models import Book, Author, Category, db
 from app.repositories.BookRepository import BookRepository
+from app.services.SearchService import BookSearchService
+from app.utils.pagination import keyset_paginate, DEFAULT_PAGE_SIZE
+from app.utils.cache import catalog_cache
+from flask import current_app
 from datetime import datetime, timezone
 from sqlalchemy import or_, and_
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
 
 class BookService:
     """Service layer for Book operations"""
     
+    # sort name -> (column, descending)
+    SORT_OPTIONS = {
+        'newest': (Book.created_at, True),
+        'title': (Book.title, False),
+        'price_asc': (Book.price, False),
+        'price_desc': (Book.price, True),
+        'rating': (Book.average_rating, True),
+    }
+    DEFAULT_SORT = 'newest'
+    
+    @staticmethod
+    def invalidate_cache(book_ids=()):
+        """Drop cached book listings and the given books' detail entries (call after commit)"""
+        for book_id in book_ids:
+            catalog_cache.invalidate('books', 'detail', book_id)
+        catalog_cache.invalidate('books', 'list')
+        catalog_cache.invalidate('books', 'search')
+    
     @staticmethod
-    def get_all_books(filters=None, search=None, include_details=False):
-        """Get all active books with optional filters and search"""
+    def _with_details(query):
+        """Load author and category in the same SELECT as the books (avoids N+1 in to_dict)"""
+        return query.options(joinedload(Book.author), joinedload(Book.category))
+    
+    @staticmethod
+    def get_all_books(filters=None, search=None, include_details=False,
+                      limit=DEFAULT_PAGE_SIZE, cursor=None, sort=DEFAULT_SORT):
+        """Get one page of active books with optional filters and search
+        
+        Results are ordered by (sort key, id) and paged with an opaque cursor,
+        so each request reads at most limit + 1 rows.
+        
+        Returns:
+            dict with 'books' and 'next_cursor' (None on the last page)
+        """
+        if sort not in BookService.SORT_OPTIONS:
+            raise ValueError(f'Invalid sort. Must be one of: {", ".join(BookService.SORT_OPTIONS)}')
+        
+        cache_key = ('books', 'list', tuple(sorted((filters or {}).items())), search,
+                     include_details, limit, cursor, sort)
+        cached = catalog_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             query = Book.query.filter_by(is_deleted=False)
+            if include_details:
+                query = BookService._with_details(query)
             
             # Apply filters
             if filters:
@@ -24,32 +72,42 @@ class BookService:
                     query = query.filter(Book.price <= filters['max_price'])
                 if filters.get('in_stock'):
                     query = query.filter(Book.stock_quantity > 0)
+                if filters.get('min_rating'):
+                    query = query.filter(Book.average_rating >= filters['min_rating'])
             
             # Apply search
             if search:
-                search_term = f"%{search}%"
-                query = query.filter(
-                    or_(
-                        Book.title.ilike(search_term),
-                        Book.isbn.ilike(search_term),
-                        Book.description.ilike(search_term)
-                    )
-                )
+                query = query.filter(BookSearchService.filter_clause(search))
             
-            books = query.all()
+            sort_column, descending = BookService.SORT_OPTIONS[sort]
+            books, next_cursor = keyset_paginate(
+                query, sort_column, Book.id, limit,
+                cursor=cursor, descending=descending, scope=sort
+            )
             
             # Convert to dict with optional details
-            return [book.to_dict(include_author=include_details, include_category=include_details) for book in books]
+            page = {
+                'books': [book.to_dict(include_author=include_details, include_category=include_details) for book in books],
+                'next_cursor': next_cursor
+            }
+            catalog_cache.set(cache_key, page)
+            return page
         except Exception as e:
             raise e
     
     @staticmethod
     def get_book_by_id(book_id, include_details=True):
         """Get book by ID with optional author and category details"""
-        book = Book.query.filter_by(id=book_id, is_deleted=False).first()
-        if book:
-            return book.to_dict(include_author=include_details, include_category=include_details)
-        return None
+        def load():
+            query = Book.query.filter_by(id=book_id, is_deleted=False)
+            if include_details:
+                query = BookService._with_details(query)
+            book = query.first()
+            if book:
+                return book.to_dict(include_author=include_details, include_category=include_details)
+            return None
+        
+        return catalog_cache.get_or_load(('books', 'detail', book_id, include_details), load)
     
     @staticmethod
     def create_book(data, created_by=None):
@@ -97,7 +155,10 @@ class BookService:
             )
             
             db.session.add(new_book)
+            db.session.flush()
+            BookSearchService.index_book(new_book.id)
             db.session.commit()
+            BookService.invalidate_cache()
             return new_book.to_dict(include_author=True, include_category=True)
         except Exception as e:
             db.session.rollback()
@@ -111,6 +172,10 @@ class BookService:
             if not book:
                 return None
             
+            # Clients may send the version they edited to avoid overwriting a newer change
+            if 'version' in data and int(data['version']) != book.version:
+                raise ValueError('Book was changed by someone else, please reload and try again')
+            
             # Update fields if provided
             if 'title' in data:
                 book.title = data['title']
@@ -152,8 +217,14 @@ class BookService:
                 book.category_id = data['category_id']
             
             book.updated_at = datetime.now(timezone.utc)
+            BookSearchService.index_book(book.id)
             db.session.commit()
+            BookService.invalidate_cache([book_id])
             return book.to_dict(include_author=True, include_category=True)
+        except StaleDataError:
+            # Stock or details changed (version bumped) between our read and write
+            db.session.rollback()
+            raise ValueError('Book was changed by someone else, please reload and try again')
         except Exception as e:
             db.session.rollback()
             raise e
@@ -168,7 +239,9 @@ class BookService:
             
             book.is_deleted = True
             book.deleted_at = datetime.now(timezone.utc)
+            BookSearchService.remove_book(book.id)
             db.session.commit()
+            BookService.invalidate_cache([book_id])
             return True
         except Exception as e:
             db.session.rollback()
@@ -184,43 +257,74 @@ class BookService:
     
     @staticmethod
     def update_stock(book_id, quantity, operation='reduce'):
-        """Update stock quantity (reduce or add)"""
+        """Update stock quantity (reduce or add)
+        
+        With STOCK_CONCURRENCY = 'optimistic' this is one conditional UPDATE
+        instead of a locked read-modify-write.
+        """
+        if operation not in ('reduce', 'add'):
+            return False
+        
         try:
-            book = Book.query.filter_by(id=book_id, is_deleted=False).with_for_update().first()
-            if not book:
-                return False
-            
-            if operation == 'reduce':
-                if book.stock_quantity < quantity:
+            if current_app.config.get('STOCK_CONCURRENCY', 'pessimistic') == 'optimistic':
+                repository = BookRepository()
+                if operation == 'reduce':
+                    updated = repository.reduce_stock_bulk({book_id: quantity})
+                else:
+                    updated = repository.increase_stock_bulk({book_id: quantity}) == 1
+                if not updated:
+                    db.session.rollback()
                     return False
-                book.stock_quantity -= quantity
-            elif operation == 'add':
-                book.stock_quantity += quantity
             else:
-                return False
+                book = Book.query.filter_by(id=book_id, is_deleted=False).with_for_update().first()
+                if not book:
+                    return False
+                
+                if operation == 'reduce':
+                    if book.stock_quantity < quantity:
+                        return False
+                    book.stock_quantity -= quantity
+                else:
+                    book.stock_quantity += quantity
             
             db.session.commit()
+            BookService.invalidate_cache([book_id])
             return True
         except Exception as e:
             db.session.rollback()
             raise e
     
     @staticmethod
-    def search_books(query_string):
-        """Search books by title, ISBN, or description"""
+    def search_books(query_string, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """Search books by title, ISBN, author, category or description
+        
+        Results come from the full-text index in relevance order.
+        
+        Returns:
+            dict with 'books' and 'next_cursor' (None on the last page)
+        """
         if not query_string:
-            return []
+            return {'books': [], 'next_cursor': None}
         
-        search_term = f"%{query_string}%"
-        books = Book.query.filter(
-            and_(
-                Book.is_deleted == False,
-                or_(
-                    Book.title.ilike(search_term),
-                    Book.isbn.ilike(search_term),
-                    Book.description.ilike(search_term)
-                )
-            )
-        ).all()
+        cache_key = ('books', 'search', query_string, limit, cursor)
+        cached = catalog_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        book_ids, next_cursor = BookSearchService.search(query_string, limit, cursor=cursor)
+        books_by_id = {}
+        if book_ids:
+            books = BookService._with_details(Book.query).filter(
+                and_(Book.id.in_(book_ids), Book.is_deleted == False)
+            ).all()
+            books_by_id = {book.id: book for book in books}
         
-        return [book.to_dict(include_author=True, include_category=True) for book in books]
+        page = {
+            'books': [
+                books_by_id[book_id].to_dict(include_author=True, include_category=True)
+                for book_id in book_ids if book_id in books_by_id
+            ],
+            'next_cursor': next_cursor
+        }
+        catalog_cache.set(cache_key, page)
+        return page
@@ -1,4 +1,5 @@
 from app.repositories.CartHistoryRepository import CartHistoryRepository
+from app.repositories.OrderItemRepository import OrderItemRepository
 from typing import List, Dict, Optional
 
 class CartHistoryService:
@@ -6,6 +7,7 @@ class CartHistoryService:
     
     def __init__(self):
         self.repository = CartHistoryRepository()
+        self.order_item_repository = OrderItemRepository()
     
     def create_cart_history(self, user_id: str, book_id: str, order_item_id: str, 
                            quantity: int, price_at_purchase: float) -> Dict:
@@ -21,6 +23,26 @@ class CartHistoryService:
         cart_history = self.repository.create(cart_history_data)
         return cart_history.to_dict()
     
+    def record_order(self, order_id: str) -> int:
+        """Create cart history records for an order's items (no commit)
+        
+        Runs as a background job after checkout; items that already have a
+        record are skipped, so running it again for the same order is safe.
+        
+        Returns:
+            Number of records created
+        """
+        items = self.order_item_repository.get_by_order_id(order_id)
+        recorded = self.repository.get_recorded_order_item_ids([item.id for item in items])
+        
+        return self.repository.create_batch([{
+            'user_id': item.user_id,
+            'book_id': item.book_id,
+            'order_item_id': item.id,
+            'quantity': item.quantity,
+            'price_at_purchase': item.unit_price
+        } for item in items if item.id not in recorded])
+    
     def get_cart_history(self, cart_history_id: str) -> Optional[Dict]:
         """Get cart history by ID"""
         cart_history = self.repository.get_by_id(cart_history_id)
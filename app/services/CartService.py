@@ -1,6 +1,6 @@
 from app.models import CartItem, Book, db
 from app.repositories.CartItemRepository import CartItemRepository
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 
 class CartService:
     """Service layer for Cart operations"""
@@ -10,17 +10,15 @@ class CartService:
     
     @staticmethod
     def get_user_cart(user_id):
-        """Get all cart items for a user with book details"""
-        cart_items = CartItem.query.filter_by(user_id=user_id, is_deleted=False).all()
+        """Get all cart items for a user with book details (one joined query)"""
+        cart_items = CartItemRepository().get_with_books(user_id)
         result = []
         
         for item in cart_items:
-            book = Book.query.filter_by(id=item.book_id, is_deleted=False).first()
-            if book:
-                item_dict = item.to_dict()
-                item_dict['book'] = book.to_dict()
-                item_dict['subtotal'] = float(book.price) * item.quantity
-                result.append(item_dict)
+            item_dict = item.to_dict()
+            item_dict['book'] = item.book.to_dict()
+            item_dict['subtotal'] = float(item.book.price) * item.quantity
+            result.append(item_dict)
         
         return result
     
@@ -137,43 +135,66 @@ class CartService:
     
     @staticmethod
     def clear_cart(user_id):
-        """Clear all items from user's cart"""
+        """Clear all items from user's cart
+        
+        Returns:
+            Number of cart items removed
+        """
         try:
-            cart_items = CartItem.query.filter_by(user_id=user_id, is_deleted=False).all()
-            for item in cart_items:
-                item.is_deleted = True
-                item.deleted_at = datetime.now(timezone.utc)
+            removed = CartItemRepository().clear_user_cart(user_id)
             db.session.commit()
-            return True
+            return removed
         except Exception as e:
             db.session.rollback()
             raise e
     
     @staticmethod
-    def get_cart_summary(user_id):
-        """Get cart summary with total, item count, etc."""
-        cart_items = CartItem.query.filter_by(user_id=user_id, is_deleted=False).all()
+    def purge_abandoned_carts(days=30):
+        """Soft delete cart items untouched for the given number of days
+        
+        Returns:
+            Number of cart items removed
+        """
+        try:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+            removed = CartItemRepository().purge_abandoned(cutoff)
+            db.session.commit()
+            return removed
+        except Exception as e:
+            db.session.rollback()
+            raise e
+    
+    @staticmethod
+    def get_cart_summary(user_id, compact=False):
+        """Get cart summary with total, item count, etc.
+        
+        Args:
+            user_id: Cart owner
+            compact: Only return the totals, computed with SQL aggregates
+                (no per-line data, used by the navbar cart badge)
+        """
+        repo = CartItemRepository()
+        if compact:
+            return repo.get_totals(user_id)
         
         total = 0
         item_count = 0
         items = []
         
-        for item in cart_items:
-            book = Book.query.filter_by(id=item.book_id, is_deleted=False).first()
-            if book:
-                subtotal = float(book.price) * item.quantity
-                total += subtotal
-                item_count += item.quantity
-                
-                items.append({
-                    'cart_item_id': item.id,
-                    'book_id': book.id,
-                    'title': book.title,
-                    'price': float(book.price),
-                    'quantity': item.quantity,
-                    'subtotal': subtotal,
-                    'stock_available': book.stock_quantity
-                })
+        for line in repo.get_summary_lines(user_id):
+            subtotal = float(line.price) * line.quantity
+            total += subtotal
+            item_count += line.quantity
+            
+            items.append({
+                'cart_item_id': line.cart_item_id,
+                'book_id': line.book_id,
+                'title': line.title,
+                'price': float(line.price),
+                'quantity': line.quantity,
+                'subtotal': subtotal,
+                'stock_available': line.stock_quantity
+            })
         
         return {
             'items': items,
@@ -1,4 +1,6 @@
 from app.repositories.CategoryRepository import CategoryRepository
+from app.services.SearchService import BookSearchService
+from app.utils.cache import catalog_cache
 from app.models import db
 from typing import List, Optional, Dict
 
@@ -10,13 +12,19 @@ class CategoryService:
     
     def get_all_categories(self) -> List[Dict]:
         """Get all active categories"""
-        categories = self.category_repository.get_all()
-        return [category.to_dict() for category in categories]
+        def load():
+            categories = self.category_repository.get_all()
+            return [category.to_dict() for category in categories]
+        
+        return catalog_cache.get_or_load(('categories', 'list'), load)
     
     def get_category_by_id(self, category_id: str) -> Optional[Dict]:
         """Get category by ID"""
-        category = self.category_repository.get_by_id(category_id)
-        return category.to_dict() if category else None
+        def load():
+            category = self.category_repository.get_by_id(category_id)
+            return category.to_dict() if category else None
+        
+        return catalog_cache.get_or_load(('categories', 'detail', category_id), load)
     
     def search_categories(self, type_name: str) -> List[Dict]:
         """Search categories by type"""
@@ -37,6 +45,7 @@ class CategoryService:
         
         category = self.category_repository.create(category_data)
         db.session.commit()
+        catalog_cache.invalidate('categories', 'list')
         return category.to_dict()
     
     def update_category(self, category_id: str, data: dict) -> Optional[Dict]:
@@ -55,8 +64,16 @@ class CategoryService:
             'category_type': data.get('category_type', category.category_type)
         }
         
+        type_changed = update_data['category_type'] != category.category_type
         updated_category = self.category_repository.update(category, update_data)
+        if type_changed:
+            BookSearchService.reindex_category(updated_category.id)
         db.session.commit()
+        catalog_cache.invalidate('categories', 'list')
+        catalog_cache.invalidate('categories', 'detail', category_id)
+        if type_changed:
+            # Book dicts embed the category name
+            catalog_cache.invalidate('books')
         return updated_category.to_dict()
     
     def delete_category(self, category_id: str) -> bool:
@@ -67,4 +84,6 @@ class CategoryService:
         
         self.category_repository.delete(category)
         db.session.commit()
+        catalog_cache.invalidate('categories', 'list')
+        catalog_cache.invalidate('categories', 'detail', category_id)
         return True
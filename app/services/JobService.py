@@ -0,0 +1,181 @@
+from app.repositories.JobRepository import JobRepository
+from app.models import db
+from flask import current_app
+from typing import Dict, Optional
+from datetime import datetime, timezone, timedelta
+import json
+import os
+import socket
+import threading
+import traceback
+
+class JobService:
+    """Database-backed background job queue
+    
+    enqueue() adds a job row to the caller's transaction, so the job exists
+    only if the request's own changes commit, and a worker (`flask jobs work`)
+    picks it up afterwards. Handlers are listed in app.tasks.TASKS and are
+    called with the job payload as keyword arguments. A handler that raises
+    is retried with exponential backoff until max_attempts, then the job is
+    marked failed. A handler's database writes commit together with the
+    job's 'done' status, and only while the worker still holds the job: if
+    it was requeued meanwhile (JOBS_LOCK_TIMEOUT) the late run is rolled
+    back. Work outside the database may still happen more than once, so
+    handlers must be idempotent.
+    """
+    
+    MAX_RETRY_DELAY = timedelta(hours=1)
+    
+    def __init__(self):
+        self.repository = JobRepository()
+    
+    def enqueue(self, name: str, payload: Optional[dict] = None, idempotency_key: Optional[str] = None,
+                delay: int = 0, max_attempts: Optional[int] = None):
+        """Add a job to the current transaction (no commit)
+        
+        Args:
+            name: Task name from app.tasks.TASKS
+            payload: JSON-serializable keyword arguments for the task
+            idempotency_key: Enqueueing an existing key returns that job instead
+            delay: Seconds before the job may run
+        """
+        if idempotency_key:
+            existing = self.repository.get_by_idempotency_key(idempotency_key)
+            if existing:
+                return existing
+        
+        return self.repository.create({
+            'name': name,
+            'payload': json.dumps(payload or {}),
+            'idempotency_key': idempotency_key,
+            'max_attempts': max_attempts or current_app.config.get('JOBS_MAX_ATTEMPTS', 5),
+            'run_at': datetime.now(timezone.utc) + timedelta(seconds=delay)
+        })
+    
+    def process_next(self, worker_id: str) -> Optional[Dict]:
+        """Claim and run one due job
+        
+        Returns:
+            The finished job as dict, or None if no job was due
+        """
+        now = datetime.now(timezone.utc)
+        for job_id in self.repository.get_due_ids(now):
+            if self.repository.claim(job_id, worker_id, now):
+                db.session.commit()
+                return self._run(job_id, worker_id)
+            db.session.rollback()
+        db.session.rollback()
+        return None
+    
+    def _run(self, job_id: str, worker_id: str) -> Dict:
+        job = self.repository.get_by_id(job_id)
+        name, attempts, max_attempts = job.name, job.attempts, job.max_attempts
+        try:
+            handler = self._handler(name)
+            handler(**job.arguments)
+            done = self.repository.update_if_owned(job_id, worker_id, attempts, {
+                'status': 'done',
+                'finished_at': datetime.now(timezone.utc),
+                'last_error': None
+            })
+            if not done:
+                db.session.rollback()
+                current_app.logger.warning(f'Job {name} {job_id} was requeued while running, result discarded')
+                return self.repository.get_by_id(job_id).to_dict()
+            db.session.commit()
+            current_app.logger.info(f'Job {name} {job_id} done')
+        except Exception:
+            error = traceback.format_exc()
+            db.session.rollback()
+            values = {'last_error': error, 'locked_at': None, 'locked_by': None}
+            if attempts >= max_attempts:
+                values.update(status='failed', finished_at=datetime.now(timezone.utc))
+            else:
+                values.update(status='pending', run_at=datetime.now(timezone.utc) + self._retry_delay(attempts))
+            if self.repository.update_if_owned(job_id, worker_id, attempts, values):
+                if values['status'] == 'failed':
+                    current_app.logger.error(f'Job {name} {job_id} failed after {attempts} attempts:\n{error}')
+                else:
+                    current_app.logger.warning(f'Job {name} {job_id} attempt {attempts} failed, retrying at {values["run_at"]}:\n{error}')
+            db.session.commit()
+        return self.repository.get_by_id(job_id).to_dict()
+    
+    @staticmethod
+    def _handler(name: str):
+        from app.tasks import TASKS
+        if name not in TASKS:
+            raise LookupError(f'No task registered for job {name}')
+        return TASKS[name]
+    
+    def _retry_delay(self, attempts: int) -> timedelta:
+        base = current_app.config.get('JOBS_RETRY_BASE_SECONDS', 10)
+        return min(timedelta(seconds=base * 2 ** (attempts - 1)), self.MAX_RETRY_DELAY)
+    
+    def release_stale_jobs(self) -> int:
+        """Requeue jobs whose worker has held them longer than JOBS_LOCK_TIMEOUT"""
+        timeout = current_app.config.get('JOBS_LOCK_TIMEOUT', 300)
+        released = self.repository.release_stale(datetime.now(timezone.utc) - timedelta(seconds=timeout))
+        db.session.commit()
+        if released:
+            current_app.logger.warning(f'Requeued {released} jobs from unresponsive workers')
+        return released
+    
+    def run_pending(self, worker_id: str = 'inline', limit: Optional[int] = None) -> int:
+        """Run due jobs in the calling thread until none are left
+        
+        The in-process worker for tests and local development: call it after
+        a request to execute the jobs it enqueued.
+        
+        Returns:
+            Number of jobs run (done, retried or failed)
+        """
+        count = 0
+        while limit is None or count < limit:
+            if self.process_next(worker_id) is None:
+                break
+            count += 1
+        return count
+    
+    def work(self, worker_id: Optional[str] = None, poll_interval: Optional[float] = None,
+             stop_event: Optional[threading.Event] = None, burst: bool = False) -> int:
+        """Worker loop: run due jobs, sleeping poll_interval seconds when idle
+        
+        Stops when stop_event is set, or once no jobs are due with burst.
+        
+        Returns:
+            Number of jobs run
+        """
+        worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        poll_interval = poll_interval if poll_interval is not None else current_app.config.get('JOBS_POLL_INTERVAL', 1)
+        stop_event = stop_event or threading.Event()
+        
+        count = 0
+        self.release_stale_jobs()
+        while not stop_event.is_set():
+            job = self.process_next(worker_id)
+            # Don't carry loaded rows from one job into the next
+            db.session.remove()
+            if job is not None:
+                count += 1
+                continue
+            if burst:
+                break
+            self.release_stale_jobs()
+            stop_event.wait(poll_interval)
+        return count
+    
+    def get_status_counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        return self.repository.count_by_status()
+    
+    def retry_failed_jobs(self) -> int:
+        """Requeue failed jobs"""
+        count = self.repository.retry_failed()
+        db.session.commit()
+        return count
+    
+    def prune_finished_jobs(self, days: int) -> int:
+        """Delete jobs that finished successfully more than days ago"""
+        deleted = self.repository.delete_finished(datetime.now(timezone.utc) - timedelta(days=days))
+        db.session.commit()
+        return deleted
@@ -2,90 +2,160 @@ from app.repositories.OrderDetailsRepository import OrderDetailsRepository
 from app.repositories.OrderItemRepository import OrderItemRepository
 from app.repositories.CartItemRepository import CartItemRepository
 from app.repositories.BookRepository import BookRepository
-from app.models import db, Book, CartItem
+from app.services.BookService import BookService
+from app.services.JobService import JobService
+from app.services.AnalyticsService import AnalyticsService
+from app.models import db, CartItem, OrderDetails
+from app.utils.pagination import keyset_paginate, DEFAULT_PAGE_SIZE
+from flask import current_app
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
+import csv
+
+class StockConflict(Exception):
+    """A book's stock or price, or the cart, changed between reading it and the UPDATE"""
 
 class OrderService:
     """Service layer for Order business logic"""
     
+    ORDER_STATUSES = ['Pending', 'Confirmed', 'Shipped', 'Delivered', 'Cancelled']
+    BULK_STATUS_LIMIT = 500
+    TRACKING_NUMBER_LENGTH = 100
+    
     def __init__(self):
         self.order_repository = OrderDetailsRepository()
         self.order_item_repository = OrderItemRepository()
         self.cart_repository = CartItemRepository()
         self.book_repository = BookRepository()
+        self.job_service = JobService()
     
     def create_order_from_cart(self, user_id: str, shipping_data: dict) -> Dict:
-        """Create order from user's cart (checkout process with transaction)"""
+        """Create order from user's cart (checkout process with transaction)
+        
+        Everything happens in one transaction with a fixed number of statements
+        regardless of cart size: read the books, one conditional stock UPDATE,
+        one bulk order item INSERT, one cart UPDATE, one commit.
+        Follow-up work (cart history, ...) is queued in the same transaction
+        and done by the job worker after the response.
+        
+        STOCK_CONCURRENCY picks how stock is protected. 'pessimistic' (default)
+        locks the books with SELECT ... FOR UPDATE before validating, so
+        concurrent buyers of a book wait for each other's whole checkout.
+        'optimistic' reads the books unlocked and makes the conditional UPDATE
+        (stock still sufficient, price unchanged) the last statement before
+        the commit, so row locks are only held for the commit; if it misses,
+        the checkout is retried up to STOCK_UPDATE_RETRIES times.
+        """
+        optimistic = current_app.config.get('STOCK_CONCURRENCY', 'pessimistic') == 'optimistic'
+        attempts = 1 + (current_app.config.get('STOCK_UPDATE_RETRIES', 3) if optimistic else 0)
+        
         try:
-            # Get cart items
-            cart_items = self.cart_repository.get_by_user_id(user_id)
-            
-            if not cart_items:
-                raise ValueError('Cart is empty')
-            
-            # Calculate total and validate stock
-            total_amount = 0
-            for cart_item in cart_items:
-                book = self.book_repository.get_by_id(cart_item.book_id)
-                if not book:
-                    raise ValueError(f'Book not found')
-                
-                if book.stock_quantity < cart_item.quantity:
-                    raise ValueError(f'Insufficient stock for {book.title}. Available: {book.stock_quantity}')
-                
-                total_amount += float(book.price) * cart_item.quantity
-            
-            # Create order
-            order_data = {
-                'user_id': user_id,
-                'total_amount': total_amount,
-                'order_status': 'Pending',
-                'shipping_address': shipping_data.get('shipping_address', ''),
-                'city': shipping_data.get('city', ''),
-                'phone_number': shipping_data.get('phone_number', ''),
-                'payment_method': shipping_data.get('payment_method', 'Cash on Delivery'),
-                'notes': shipping_data.get('notes')
-            }
-            
-            order = self.order_repository.create(order_data)
-            
-            # Create order items and reduce stock
-            order_items_data = []
-            for cart_item in cart_items:
-                # Lock book row and reduce stock
-                book = Book.query.with_for_update().get(cart_item.book_id)
-                
-                if book.stock_quantity < cart_item.quantity:
+            for attempt in range(attempts):
+                try:
+                    order_id, book_ids = self._place_order(user_id, shipping_data, optimistic)
+                    break
+                except StockConflict:
+                    # Re-read and revalidate (a real shortage then fails validation)
                     db.session.rollback()
-                    raise ValueError(f'Stock changed for {book.title}')
-                
-                book.stock_quantity -= cart_item.quantity
-                
-                # Prepare order item data
-                order_items_data.append({
-                    'order_details_id': order.id,
-                    'book_id': cart_item.book_id,
-                    'user_id': user_id,
-                    'unit_price': book.price,
-                    'quantity': cart_item.quantity
-                })
-                
-                # Soft delete cart item
-                self.cart_repository.delete(cart_item)
-            
-            # Create all order items
-            self.order_item_repository.create_batch(order_items_data)
+            else:
+                raise ValueError('Stock changed during checkout, please try again')
             
-            db.session.commit()
+            # Stock changed, drop cached book entries
+            BookService.invalidate_cache(book_ids)
             
             # Return order with items
-            return self.get_order_details(order.id, user_id)
+            return self.get_order_details(order_id, user_id)
             
         except Exception as e:
             db.session.rollback()
             raise e
     
+    def _place_order(self, user_id: str, shipping_data: dict, optimistic: bool):
+        """One checkout attempt, committed on success
+        
+        Returns:
+            (order id, ids of the books whose stock changed)
+        """
+        # Get cart items
+        cart_items = self.cart_repository.get_by_user_id(user_id)
+        
+        if not cart_items:
+            raise ValueError('Cart is empty')
+        
+        # Quantity per book (a book may appear in several cart rows)
+        quantities = {}
+        for cart_item in cart_items:
+            quantities[cart_item.book_id] = quantities.get(cart_item.book_id, 0) + cart_item.quantity
+        
+        if optimistic:
+            books = {book.id: book for book in self.book_repository.get_many(list(quantities))}
+        else:
+            # Lock every book row in one statement, ordered by id
+            books = {book.id: book for book in self.book_repository.get_many_for_update(list(quantities))}
+        
+        # Calculate total and validate stock
+        total_amount = 0
+        for book_id, quantity in quantities.items():
+            book = books.get(book_id)
+            if not book:
+                raise ValueError(f'Book not found')
+            
+            if book.stock_quantity < quantity:
+                raise ValueError(f'Insufficient stock for {book.title}. Available: {book.stock_quantity}')
+            
+            total_amount += float(book.price) * quantity
+        
+        # Create order
+        order_data = {
+            'user_id': user_id,
+            'total_amount': total_amount,
+            'order_status': 'Pending',
+            'shipping_address': shipping_data.get('shipping_address', ''),
+            'city': shipping_data.get('city', ''),
+            'phone_number': shipping_data.get('phone_number', ''),
+            'payment_method': shipping_data.get('payment_method', 'Cash on Delivery'),
+            'notes': shipping_data.get('notes')
+        }
+        
+        order = self.order_repository.create(order_data)
+        order_id = order.id
+        
+        # Reduce stock (conditional on stock_quantity >= quantity)
+        if not optimistic and not self.book_repository.reduce_stock_bulk(quantities):
+            raise ValueError('Stock changed during checkout, please try again')
+        
+        # Create all order items in one INSERT
+        order_items_data = [{
+            'order_details_id': order_id,
+            'book_id': cart_item.book_id,
+            'user_id': user_id,
+            'unit_price': books[cart_item.book_id].price,
+            'quantity': cart_item.quantity
+        } for cart_item in cart_items]
+        self.order_item_repository.create_batch(order_items_data)
+        
+        # Consume the cart (only the rows that were checked out); a concurrent
+        # checkout that already consumed some of them must not sell them again
+        consumed = self.cart_repository.soft_delete_for_user(user_id, [cart_item.id for cart_item in cart_items])
+        if consumed != len(cart_items):
+            if optimistic:
+                raise StockConflict()
+            raise ValueError('Cart changed during checkout, please try again')
+        
+        # Side effects run in the job worker, only if this transaction commits
+        self.job_service.enqueue('cart_history.record_order', {'order_id': order_id},
+                                 idempotency_key=f'cart_history:{order_id}')
+        self._queue_status_change(order_id, None, 'Pending')
+        
+        if optimistic:
+            # Last statement before the commit: the book rows stay locked only until then
+            prices = {book_id: books[book_id].price for book_id in quantities}
+            if not self.book_repository.reduce_stock_bulk(quantities, prices=prices):
+                raise StockConflict()
+        
+        db.session.commit()
+        return order_id, list(quantities)
+    
     def get_user_orders(self, user_id: str) -> List[Dict]:
         """Get all orders for a user"""
         orders = self.order_repository.get_by_user_id(user_id)
@@ -97,8 +167,13 @@ class OrderService:
         return [self._order_to_dict_summary(order) for order in orders]
     
     def get_order_details(self, order_id: str, user_id: str = None) -> Optional[Dict]:
-        """Get order by ID with full details"""
-        order = self.order_repository.get_by_id(order_id)
+        """Get order by ID with full details
+        
+        The order, its items and their books are read up front, so building
+        the response runs no further queries. Checkout, cancel and status
+        updates end with this call.
+        """
+        order = self.order_repository.get_with_items(order_id)
         
         if not order:
             return None
@@ -107,31 +182,38 @@ class OrderService:
         if user_id and order.user_id != user_id:
             raise PermissionError('Unauthorized to view this order')
         
-        # Get order items
-        items = self.order_item_repository.get_by_order_id(order_id)
-        
-        order_dict = order.to_dict()
+        items = order.active_items
+        order_dict = order.to_dict(item_count=sum(item.quantity for item in items))
         order_dict['items'] = [item.to_dict() for item in items]
-        order_dict['item_count'] = order.item_count
         
         return order_dict
     
-    def get_all_orders(self) -> List[Dict]:
-        """Get all orders (Admin only)"""
-        orders = self.order_repository.get_all()
-        return [self._order_to_dict_summary(order) for order in orders]
-    
-    def get_orders_by_status(self, status: str) -> List[Dict]:
-        """Get orders by status (Admin only)"""
-        orders = self.order_repository.get_by_status(status)
-        return [self._order_to_dict_summary(order) for order in orders]
+    def get_admin_orders(self, filters: Optional[dict] = None, limit: int = DEFAULT_PAGE_SIZE,
+                         cursor: Optional[str] = None) -> Dict:
+        """One page of orders for the admin dashboard, newest first (Admin only)
+        
+        item_count and user_name are computed in the listing query itself.
+        
+        Returns:
+            dict with 'orders' and 'next_cursor' (None on the last page)
+        """
+        rows, next_cursor = keyset_paginate(
+            self.order_repository.admin_listing_query(filters),
+            OrderDetails.order_date, OrderDetails.id, limit, cursor,
+            descending=True, scope='admin-orders', entity=lambda row: row[0]
+        )
+        
+        orders = []
+        for order, item_count, user_name in rows:
+            order_dict = order.to_dict(item_count=item_count)
+            order_dict['user_name'] = user_name
+            orders.append(order_dict)
+        return {'orders': orders, 'next_cursor': next_cursor}
     
     def update_order_status(self, order_id: str, status: str) -> Optional[Dict]:
         """Update order status (Admin only)"""
-        valid_statuses = ['Pending', 'Confirmed', 'Shipped', 'Delivered', 'Cancelled']
-        
-        if status not in valid_statuses:
-            raise ValueError(f'Invalid status. Must be one of: {", ".join(valid_statuses)}')
+        if status not in self.ORDER_STATUSES:
+            raise ValueError(f'Invalid status. Must be one of: {", ".join(self.ORDER_STATUSES)}')
         
         order = self.order_repository.get_by_id(order_id)
         if not order:
@@ -141,10 +223,103 @@ class OrderService:
         if not order.can_update_status(status):
             raise ValueError(f'Cannot change status from {order.order_status} to {status}')
         
-        update_data = {'order_status': status}
-        updated_order = self.order_repository.update(order, update_data)
+        try:
+            # Conditional UPDATE: of two concurrent transitions only one applies (and is counted in analytics)
+            if not self.order_repository.update_status_if(order.id, [order.order_status], status):
+                raise ValueError('Order status changed, please reload and try again')
+            self._queue_status_change(order.id, order.order_status, status)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
         
-        return self.get_order_details(updated_order.id)
+        return self.get_order_details(order_id)
+    
+    def bulk_update_order_status(self, status: str, order_ids: Optional[List[str]] = None,
+                                 filters: Optional[dict] = None) -> Dict:
+        """Move many orders to one status in a single transaction (Admin only)
+        
+        Orders are picked by id, or by the admin listing filters (at most
+        BULK_STATUS_LIMIT per call, call again while has_more), and locked.
+        A filter only selects orders whose status can move to the target, so
+        every filtered order changes and repeated calls work through the rest;
+        transitions are checked with can_update_status in memory and the valid
+        ones applied with one UPDATE per source status. Cancelling restores
+        the stock of every cancelled order with one UPDATE.
+        
+        Returns:
+            dict with 'status', 'updated', 'failed', 'has_more' and per-order 'results'
+        """
+        if status not in self.ORDER_STATUSES:
+            raise ValueError(f'Invalid status. Must be one of: {", ".join(self.ORDER_STATUSES)}')
+        if order_ids is None and not filters:
+            raise ValueError('Provide order_ids or a filter')
+        if order_ids is not None:
+            if not isinstance(order_ids, list) or not all(isinstance(order_id, str) for order_id in order_ids):
+                raise ValueError('order_ids must be a list of order ids')
+            order_ids = list(dict.fromkeys(order_ids))
+            if not order_ids:
+                raise ValueError('order_ids must not be empty')
+            if len(order_ids) > self.BULK_STATUS_LIMIT:
+                raise ValueError(f'At most {self.BULK_STATUS_LIMIT} orders per request')
+        
+        try:
+            has_more = False
+            if order_ids is not None:
+                orders = self.order_repository.get_many_for_update(order_ids=order_ids)
+            else:
+                orders = self.order_repository.get_many_for_update(
+                    filters=filters, statuses=OrderDetails.statuses_leading_to(status), limit=self.BULK_STATUS_LIMIT + 1
+                )
+                has_more = len(orders) > self.BULK_STATUS_LIMIT
+                orders = orders[:self.BULK_STATUS_LIMIT]
+                order_ids = [order.id for order in orders]
+            orders = {order.id: order for order in orders}
+            
+            # Validate every transition in memory, grouping the valid ones by source status
+            results = []
+            by_source = {}
+            for order_id in order_ids:
+                order = orders.get(order_id)
+                if not order:
+                    results.append({'id': order_id, 'success': False, 'error': 'Order not found'})
+                elif not order.can_update_status(status):
+                    results.append({'id': order_id, 'success': False, 'from_status': order.order_status,
+                                    'error': f'Cannot change status from {order.order_status} to {status}'})
+                else:
+                    by_source.setdefault(order.order_status, []).append(order_id)
+                    results.append({'id': order_id, 'success': True, 'from_status': order.order_status})
+            
+            # Rows are locked, so each UPDATE matches every order it was given
+            for from_status, ids in by_source.items():
+                self.order_repository.update_status_bulk(ids, from_status, status)
+                for order_id in ids:
+                    self._queue_status_change(order_id, from_status, status)
+            
+            restocked = []
+            if status == 'Cancelled' and by_source:
+                quantities = self.order_item_repository.get_quantities_by_order_ids(
+                    [order_id for ids in by_source.values() for order_id in ids]
+                )
+                self.book_repository.increase_stock_bulk(quantities)
+                restocked = list(quantities)
+            
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise e
+        
+        if restocked:
+            BookService.invalidate_cache(restocked)
+        
+        updated = sum(len(ids) for ids in by_source.values())
+        return {
+            'status': status,
+            'updated': updated,
+            'failed': len(results) - updated,
+            'has_more': has_more,
+            'results': results
+        }
     
     def update_tracking_number(self, order_id: str, tracking_number: str) -> Optional[Dict]:
         """Update order tracking number (Admin only)"""
@@ -157,9 +332,94 @@ class OrderService:
         
         return updated_order.to_dict()
     
+    def import_tracking_numbers(self, lines, batch_size: Optional[int] = None) -> Dict:
+        """Set tracking numbers from CSV rows with order_id and tracking_number columns (Admin only)
+        
+        lines is any iterable of text lines (an open file, a wrapped request
+        stream) and is read incrementally. Rows are applied in batches of
+        TRACKING_IMPORT_BATCH_SIZE, each with one SELECT for the ids, one
+        executemany UPDATE and its own commit, so memory use and transaction
+        size stay bounded whatever the file size. Bad rows are reported (the
+        first TRACKING_IMPORT_MAX_ERRORS of them) and skipped; a malformed
+        file stops the import after the rows before it.
+        
+        Returns:
+            dict with 'rows', 'updated', 'failed' and 'errors' ({'row', 'order_id', 'error'})
+        """
+        batch_size = batch_size or current_app.config.get('TRACKING_IMPORT_BATCH_SIZE', 1000)
+        max_errors = current_app.config.get('TRACKING_IMPORT_MAX_ERRORS', 1000)
+        summary = {'rows': 0, 'updated': 0, 'failed': 0, 'errors': []}
+        
+        def fail(row_number, order_id, error):
+            summary['failed'] += 1
+            if len(summary['errors']) < max_errors:
+                summary['errors'].append({'row': row_number, 'order_id': order_id, 'error': error})
+        
+        reader = csv.reader(lines)
+        try:
+            header = [column.strip().lower() for column in next(reader, [])]
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise ValueError(f'Malformed CSV, expected UTF-8 text: {e}')
+        if not header:
+            raise ValueError('CSV file is empty')
+        if 'order_id' not in header or 'tracking_number' not in header:
+            raise ValueError('CSV header must include order_id and tracking_number')
+        id_index, tracking_index = header.index('order_id'), header.index('tracking_number')
+        
+        batch = []
+        while True:
+            try:
+                row = next(reader, None)
+            except (csv.Error, UnicodeDecodeError) as e:
+                fail(reader.line_num + 1, None, f'Malformed CSV, import stopped: {e}')
+                break
+            if row is None:
+                break
+            if not any(cell.strip() for cell in row):
+                continue
+            
+            summary['rows'] += 1
+            order_id = row[id_index].strip() if len(row) > id_index else ''
+            tracking_number = row[tracking_index].strip() if len(row) > tracking_index else ''
+            if not order_id:
+                fail(reader.line_num, None, 'Order id is required')
+            elif not tracking_number:
+                fail(reader.line_num, order_id, 'Tracking number is required')
+            elif len(tracking_number) > self.TRACKING_NUMBER_LENGTH:
+                fail(reader.line_num, order_id, f'Tracking number is longer than {self.TRACKING_NUMBER_LENGTH} characters')
+            else:
+                batch.append((reader.line_num, order_id, tracking_number))
+                if len(batch) >= batch_size:
+                    summary['updated'] += self._apply_tracking_batch(batch, fail)
+                    batch = []
+        
+        if batch:
+            summary['updated'] += self._apply_tracking_batch(batch, fail)
+        summary['errors'].sort(key=lambda error: error['row'])
+        return summary
+    
+    def _apply_tracking_batch(self, batch: List[tuple], fail) -> int:
+        """Update one batch of (row number, order id, tracking number) and commit"""
+        existing = self.order_repository.get_existing_ids(list({order_id for _, order_id, _ in batch}))
+        rows = []
+        for row_number, order_id, tracking_number in batch:
+            if order_id in existing:
+                rows.append({'id': order_id, 'tracking_number': tracking_number})
+            else:
+                fail(row_number, order_id, 'Order not found')
+        
+        try:
+            updated = self.order_repository.update_tracking_numbers_bulk(rows)
+            db.session.commit()
+            return updated
+        except Exception as e:
+            db.session.rollback()
+            raise e
+    
     def cancel_order(self, order_id: str, user_id: str, is_admin: bool = False) -> Dict:
         """Cancel an order and restore stock"""
-        order = self.order_repository.get_by_id(order_id)
+        # Books aren't loaded here, the stock update below reads them under lock
+        order = self.order_repository.get_with_items(order_id, with_books=False)
         
         if not order:
             raise ValueError('Order not found')
@@ -174,25 +434,41 @@ class OrderService:
         
         try:
             # Restore stock for all items
-            order_items = self.order_item_repository.get_by_order_id(order_id)
+            order_items = order.active_items
+            book_ids = [item.book_id for item in order_items]
             
-            for item in order_items:
-                book = Book.query.with_for_update().get(item.book_id)
-                if book:
-                    book.stock_quantity += item.quantity
+            # Conditional status change first: of two concurrent transitions only one
+            # applies, restores stock and is counted in analytics
+            if not self.order_repository.update_status_if(order_id, [order.order_status], 'Cancelled'):
+                raise ValueError('Order status changed, please reload and try again')
+            self._queue_status_change(order_id, order.order_status, 'Cancelled')
             
-            # Update order status
-            update_data = {'order_status': 'Cancelled'}
-            updated_order = self.order_repository.update(order, update_data)
+            quantities = {}
+            for item in order_items:
+                quantities[item.book_id] = quantities.get(item.book_id, 0) + item.quantity
+            if current_app.config.get('STOCK_CONCURRENCY', 'pessimistic') != 'optimistic':
+                # Same lock order as checkout (by id), so the two can't deadlock
+                self.book_repository.get_many_for_update(list(quantities))
+            self.book_repository.increase_stock_bulk(quantities)
             
             db.session.commit()
             
-            return self.get_order_details(updated_order.id)
+            BookService.invalidate_cache(book_ids)
+            
+            return self.get_order_details(order_id)
             
         except Exception as e:
             db.session.rollback()
             raise e
     
+    def _queue_status_change(self, order_id: str, from_status: Optional[str], to_status: str) -> None:
+        """Let the job worker move the order's contribution in the sales rollups (commits with the caller)"""
+        self.job_service.enqueue(AnalyticsService.TASK, {
+            'order_id': order_id,
+            'from_status': from_status,
+            'to_status': to_status
+        })
+    
     def _order_to_dict_summary(self, order) -> Dict:
         """Convert order to dict with summary info"""
         order_dict = order.to_dict()
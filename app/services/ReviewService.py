@@ -1,5 +1,7 @@
 from app.repositories.ReviewRepository import ReviewRepository
 from app.repositories.BookRepository import BookRepository
+from app.services.BookService import BookService
+from app.models import db
 from typing import List, Dict, Optional
 
 class ReviewService:
@@ -33,8 +35,9 @@ class ReviewService:
         }
         
         review = self.review_repository.create(review_data)
-        from app.models import db
+        self.book_repository.apply_rating_change(book_id, new_rating=rating)
         db.session.commit()
+        BookService.invalidate_cache([book_id])
         return review.to_dict()
     
     def get_review(self, review_id: str) -> Optional[Dict]:
@@ -53,28 +56,23 @@ class ReviewService:
         return [review.to_dict() for review in reviews]
     
     def get_book_rating_summary(self, book_id: str) -> Dict:
-        """Get rating summary for a book (average rating, total reviews, distribution)"""
-        reviews = self.review_repository.get_by_book_id(book_id)
+        """Get rating summary for a book (average rating, total reviews, distribution)
+        
+        Read from the aggregates kept on the book row, no review scan.
+        """
+        book = self.book_repository.get_by_id(book_id)
         
-        if not reviews:
+        if not book or not book.rating_count:
             return {
                 'average_rating': 0,
                 'total_reviews': 0,
                 'rating_distribution': {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
             }
         
-        total_reviews = len(reviews)
-        average_rating = sum(r.rating for r in reviews) / total_reviews
-        
-        # Calculate rating distribution
-        distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        for review in reviews:
-            distribution[review.rating] += 1
-        
         return {
-            'average_rating': round(average_rating, 2),
-            'total_reviews': total_reviews,
-            'rating_distribution': distribution
+            'average_rating': round(book.average_rating, 2),
+            'total_reviews': book.rating_count,
+            'rating_distribution': book.rating_distribution()
         }
     
     def get_user_reviews(self, user_id: str) -> List[Dict]:
@@ -96,9 +94,12 @@ class ReviewService:
         if 'rating' in update_data and not 1 <= update_data['rating'] <= 5:
             raise ValueError("Rating must be between 1 and 5")
         
+        old_rating = review.rating
         updated_review = self.review_repository.update(review, update_data)
-        from app.models import db
+        if updated_review.rating != old_rating:
+            self.book_repository.apply_rating_change(review.book_id, old_rating=old_rating, new_rating=updated_review.rating)
         db.session.commit()
+        BookService.invalidate_cache([updated_review.book_id])
         return updated_review.to_dict()
     
     def delete_review(self, review_id: str, user_id: str, is_admin: bool = False) -> bool:
@@ -112,6 +113,14 @@ class ReviewService:
             raise PermissionError("You can only delete your own reviews")
         
         self.review_repository.delete(review)
-        from app.models import db
+        self.book_repository.apply_rating_change(review.book_id, old_rating=review.rating)
         db.session.commit()
+        BookService.invalidate_cache([review.book_id])
         return True
+    
+    def rebuild_rating_aggregates(self) -> int:
+        """Backfill book review aggregates from the reviews table"""
+        count = self.book_repository.rebuild_rating_aggregates()
+        db.session.commit()
+        BookService.invalidate_cache()
+        return count
@@ -0,0 +1,190 @@
+from app.models import Book, db
+from app.utils.pagination import keyset_paginate
+from sqlalchemy import table, column, func, cast, Float, literal_column, text, inspect, select, or_, and_
+import re
+
+class BookSearchService:
+    """Full-text search over books backed by the book_search index table
+
+    On PostgreSQL the index holds one weighted tsvector per book (GIN indexed),
+    on SQLite it is an FTS5 virtual table ranked with bm25. Documents are built
+    from title, ISBN, author name, category type and description. Databases
+    without the index (not migrated yet, or another backend) fall back to the
+    old ILIKE matching so search keeps working.
+    """
+
+    TABLE_NAME = 'book_search'
+    MAX_TERMS = 10
+
+    _pg_index = table('book_search', column('book_id'), column('document'))
+    _fts_index = table('book_search', column('book_id'))
+
+    # engine -> 'postgresql' | 'sqlite' | None
+    _backends = {}
+
+    # Per-book document rebuilt from books + authors + categories
+    _PG_INSERT = '''
+        INSERT INTO book_search (book_id, document)
+        SELECT b.id,
+               setweight(to_tsvector('simple', coalesce(b.title, '') || ' ' || coalesce(b.isbn, '')), 'A') ||
+               setweight(to_tsvector('simple', coalesce(a.author_name, '')), 'B') ||
+               setweight(to_tsvector('simple', coalesce(c.category_type, '')), 'C') ||
+               setweight(to_tsvector('simple', coalesce(b.description, '')), 'D')
+        FROM books b
+        LEFT JOIN authors a ON a.id = b.author_id
+        LEFT JOIN categories c ON c.id = b.category_id
+        WHERE b.is_deleted = :deleted AND {condition}
+    '''
+    _FTS_INSERT = '''
+        INSERT INTO book_search (book_id, title, isbn, description, author_name, category_type)
+        SELECT b.id, b.title, coalesce(b.isbn, ''), coalesce(b.description, ''),
+               coalesce(a.author_name, ''), coalesce(c.category_type, '')
+        FROM books b
+        LEFT JOIN authors a ON a.id = b.author_id
+        LEFT JOIN categories c ON c.id = b.category_id
+        WHERE b.is_deleted = :deleted AND {condition}
+    '''
+    _DELETE = 'DELETE FROM book_search WHERE book_id IN (SELECT b.id FROM books b WHERE {condition})'
+
+    @staticmethod
+    def _backend():
+        """Return the active index backend, or None to use the ILIKE fallback"""
+        engine = db.engine
+        if engine not in BookSearchService._backends:
+            backend = None
+            if engine.dialect.name in ('postgresql', 'sqlite') and inspect(engine).has_table(BookSearchService.TABLE_NAME):
+                backend = engine.dialect.name
+            BookSearchService._backends[engine] = backend
+        return BookSearchService._backends[engine]
+
+    @staticmethod
+    def _terms(query_string):
+        """Split user input into lowercase word tokens (drops query syntax characters)"""
+        return re.findall(r'\w+', (query_string or '').lower())[:BookSearchService.MAX_TERMS]
+
+    @staticmethod
+    def _match(backend, terms):
+        """Return (match clause, rank expression, rank descending) for the index table"""
+        if backend == 'postgresql':
+            tsquery = func.to_tsquery('simple', ' & '.join(f'{term}:*' for term in terms))
+            document = BookSearchService._pg_index.c.document
+            # Cast to double so the rank survives a JSON round trip in the cursor
+            rank = cast(func.ts_rank(document, tsquery), Float(53)).label('rank')
+            return document.op('@@')(tsquery), rank, True
+
+        fts = literal_column(BookSearchService.TABLE_NAME)
+        # Column weights: book_id, title, isbn, description, author_name, category_type
+        rank = func.bm25(fts, 0.0, 10.0, 10.0, 1.0, 5.0, 2.0).label('rank')
+        return fts.op('MATCH')(' AND '.join(f'"{term}"*' for term in terms)), rank, False
+
+    @staticmethod
+    def _ilike_clause(query_string):
+        search_term = f"%{query_string}%"
+        return or_(
+            Book.title.ilike(search_term),
+            Book.isbn.ilike(search_term),
+            Book.description.ilike(search_term)
+        )
+
+    @staticmethod
+    def filter_clause(query_string):
+        """SQL condition on Book matching the search string (for filtered listings)"""
+        backend = BookSearchService._backend()
+        terms = BookSearchService._terms(query_string)
+        if not backend or not terms:
+            return BookSearchService._ilike_clause(query_string)
+
+        match, _, _ = BookSearchService._match(backend, terms)
+        index = BookSearchService._pg_index if backend == 'postgresql' else BookSearchService._fts_index
+        return Book.id.in_(select(index.c.book_id).where(match))
+
+    @staticmethod
+    def search(query_string, limit, cursor=None):
+        """Return one page of matching book ids in relevance order
+
+        Returns:
+            (book_ids, next_cursor)
+        """
+        backend = BookSearchService._backend()
+        terms = BookSearchService._terms(query_string)
+
+        if not backend or not terms:
+            query = db.session.query(Book.id, Book.title).filter(
+                and_(Book.is_deleted == False, BookSearchService._ilike_clause(query_string))
+            )
+            rows, next_cursor = keyset_paginate(query, Book.title, Book.id, limit, cursor=cursor, scope='title')
+            return [row.id for row in rows], next_cursor
+
+        match, rank, descending = BookSearchService._match(backend, terms)
+        index = BookSearchService._pg_index if backend == 'postgresql' else BookSearchService._fts_index
+        query = db.session.query(index.c.book_id, rank).filter(match)
+        rows, next_cursor = keyset_paginate(
+            query, rank, index.c.book_id, limit,
+            cursor=cursor, descending=descending, scope='relevance'
+        )
+        return [row.book_id for row in rows], next_cursor
+
+    @staticmethod
+    def _reindex(condition, params):
+        """Replace index documents for books matching a SQL condition on alias b"""
+        backend = BookSearchService._backend()
+        if not backend:
+            return
+
+        db.session.flush()
+        insert_sql = BookSearchService._PG_INSERT if backend == 'postgresql' else BookSearchService._FTS_INSERT
+        db.session.execute(text(BookSearchService._DELETE.format(condition=condition)), params)
+        db.session.execute(text(insert_sql.format(condition=condition)), {**params, 'deleted': False})
+
+    @staticmethod
+    def index_book(book_id):
+        """Add, refresh or drop (if soft deleted) a single book's document"""
+        BookSearchService._reindex('b.id = :book_id', {'book_id': book_id})
+
+    @staticmethod
+    def remove_book(book_id):
+        """Drop a book's document from the index"""
+        if BookSearchService._backend():
+            db.session.execute(text('DELETE FROM book_search WHERE book_id = :book_id'), {'book_id': book_id})
+
+    @staticmethod
+    def reindex_author(author_id):
+        """Refresh documents for every book by an author (after a rename)"""
+        BookSearchService._reindex('b.author_id = :author_id', {'author_id': author_id})
+
+    @staticmethod
+    def reindex_category(category_id):
+        """Refresh documents for every book in a category (after a rename)"""
+        BookSearchService._reindex('b.category_id = :category_id', {'category_id': category_id})
+
+    @staticmethod
+    def rebuild():
+        """Create the index if missing and rebuild it from the books table
+
+        Returns:
+            Number of indexed books
+        """
+        engine = db.engine
+        if engine.dialect.name == 'sqlite':
+            db.session.execute(text(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS book_search USING fts5('
+                'book_id UNINDEXED, title, isbn, description, author_name, category_type, '
+                "tokenize='unicode61 remove_diacritics 2')"
+            ))
+        elif engine.dialect.name == 'postgresql':
+            db.session.execute(text(
+                'CREATE TABLE IF NOT EXISTS book_search ('
+                'book_id VARCHAR(36) PRIMARY KEY REFERENCES books(id) ON DELETE CASCADE, '
+                'document TSVECTOR NOT NULL)'
+            ))
+            db.session.execute(text(
+                'CREATE INDEX IF NOT EXISTS ix_book_search_document ON book_search USING gin (document)'
+            ))
+        else:
+            raise ValueError(f'Full-text search is not supported on {engine.dialect.name}')
+        db.session.commit()
+
+        BookSearchService._backends.pop(engine, None)
+        BookSearchService._reindex('1 = 1', {})
+        db.session.commit()
+        return db.session.execute(text('SELECT count(*) FROM book_search')).scalar()
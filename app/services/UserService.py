@@ -1,8 +1,9 @@
 from app.models import User, db
 from app.repositories.UserRepository import UserRepository
-from app import bcrypt
+from app.utils.passwords import password_hasher
 from datetime import datetime, timezone
 from app.utils.enums import enums
+from app.utils.auth import bump_token_version, forget_user
 
 class UserService:
     """Service layer for User operations"""
@@ -32,7 +33,7 @@ class UserService:
         """Create a new user"""
         try:
             # Hash password before storing
-            hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+            hashed_password = password_hasher.hash(data['password'])
             
             # Parse date_of_birth if provided
             date_of_birth = None
@@ -82,10 +83,12 @@ class UserService:
                 user.city = data['city']
             if 'province' in data:
                 user.province = data['province']
-            if 'role' in data:
+            if 'role' in data and int(data['role']) != user.role:
                 user.role = int(data['role'])
-            if 'is_active' in data:
+                bump_token_version(user)
+            if 'is_active' in data and int(data['is_active']) != user.is_active:
                 user.is_active = int(data['is_active'])
+                bump_token_version(user)
             if 'date_of_birth' in data and data['date_of_birth']:
                 try:
                     user.date_of_birth = datetime.fromisoformat(data['date_of_birth'].replace('Z', '+00:00'))
@@ -94,9 +97,11 @@ class UserService:
             
             # Update password if provided
             if 'password' in data and data['password']:
-                user.password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+                user.password = password_hasher.hash(data['password'])
             
-            return UserRepository.update(user)
+            user = UserRepository.update(user)
+            forget_user(user_id)
+            return user
         except Exception as e:
             db.session.rollback()
             raise e
@@ -104,7 +109,9 @@ class UserService:
     @staticmethod
     def delete_user(user_id):
         """Soft delete user"""
-        return UserRepository.delete(user_id)
+        deleted = UserRepository.delete(user_id)
+        forget_user(user_id)
+        return deleted
     
     @staticmethod
     def activate_user(user_id):
@@ -112,7 +119,10 @@ class UserService:
         user = UserRepository.get_by_id(user_id)
         if user:
             user.is_active = enums.UserStatus.isActive
-            return UserRepository.update(user)
+            bump_token_version(user)
+            user = UserRepository.update(user)
+            forget_user(user_id)
+            return user
         return None
     
     @staticmethod
@@ -121,7 +131,10 @@ class UserService:
         user = UserRepository.get_by_id(user_id)
         if user:
             user.is_active = enums.UserStatus.isInactive
-            return UserRepository.update(user)
+            bump_token_version(user)
+            user = UserRepository.update(user)
+            forget_user(user_id)
+            return user
         return None
     
     @staticmethod
@@ -132,9 +145,11 @@ class UserService:
             return None, "User not found"
         
         # Verify old password
-        if not bcrypt.check_password_hash(user.password, old_password):
+        if not password_hasher.check(user.password, old_password):
             return None, "Invalid old password"
         
         # Update password
-        user.password = bcrypt.generate_password_hash(new_password).decode('utf-8')
-        return UserRepository.update(user), "Password changed successfully"
+        user.password = password_hasher.hash(new_password)
+        user = UserRepository.update(user)
+        forget_user(user_id)
+        return user, "Password changed successfully"
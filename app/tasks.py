@@ -0,0 +1,23 @@
+"""Background job handlers, run by the job worker (see app.services.JobService)
+
+Each handler receives the job payload as keyword arguments and may run more
+than once for the same job, so it has to be idempotent.
+"""
+from app.services.AnalyticsService import AnalyticsService
+from app.services.CartHistoryService import CartHistoryService
+
+
+def record_order_history(order_id):
+    """Copy a placed order's items into cart history"""
+    CartHistoryService().record_order(order_id)
+
+
+def apply_order_status(order_id, from_status, to_status):
+    """Move an order's contribution in the sales rollups (from_status None = new order)"""
+    AnalyticsService().apply_status_change(order_id, from_status, to_status)
+
+
+TASKS = {
+    'cart_history.record_order': record_order_history,
+    AnalyticsService.TASK: apply_order_status,
+}
@@ -0,0 +1,104 @@
+from functools import wraps
+from flask import current_app, jsonify, g
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.models import User
+from app.utils.cache import auth_cache
+from app.utils.blocklist import token_revocations
+from app.utils.db_routing import use_primary
+from app.utils.enums import enums, is_admin
+
+def token_claims(user):
+    """Additional JWT claims so authorization checks don't need the users table"""
+    return {
+        'role': user.role,
+        'is_active': user.is_active,
+        'ver': user.token_version or 0
+    }
+
+class CurrentUser:
+    """Read-only snapshot of a user row, shared across requests through auth_cache
+
+    Returned by the JWT user loader (flask_jwt_extended.current_user). Write
+    paths should use get_current_user_model() for the ORM instance.
+    """
+
+    __slots__ = ('id', 'role', 'is_active', 'token_version', '_profile')
+
+    def __init__(self, user):
+        self.id = user.id
+        self.role = user.role
+        self.is_active = user.is_active
+        self.token_version = user.token_version or 0
+        self._profile = user.to_dict()
+
+    def to_dict(self):
+        return dict(self._profile)
+
+def _load_user_snapshot(user_id):
+    # From the primary, so a lagging replica can't bring back an old role or active flag
+    with use_primary():
+        user = User.query.filter_by(id=user_id, is_deleted=False).first()
+    # Missing/deleted users are cached too (as False) so their tokens don't reach the database
+    return CurrentUser(user) if user else False
+
+def get_user_snapshot(user_id):
+    """Return the user's CurrentUser snapshot (None if deleted), cached for AUTH_CACHE_TTL seconds
+
+    Keyed by user id alone, not (id, updated_at): the token doesn't carry
+    updated_at and reading it would cost the query the cache saves. The
+    worker that commits a change drops its entry with forget_user(); other
+    workers serve the old snapshot until AUTH_CACHE_TTL expires.
+    """
+    return auth_cache.get_or_load(('users', user_id), lambda: _load_user_snapshot(user_id)) or None
+
+def get_current_user_model():
+    """The current user's ORM row for write paths, loaded once per request"""
+    if 'current_user_model' not in g:
+        g.current_user_model = User.query.filter_by(id=get_jwt_identity(), is_deleted=False).first()
+    return g.current_user_model
+
+def is_token_revoked(jwt_payload):
+    """True if the token was logged out, issued before a role/status change or
+    logout-all, or its user is gone
+
+    Tokens issued before version claims existed count as version 0.
+    """
+    if token_revocations.is_revoked(jwt_payload['jti']):
+        return True
+    user = get_user_snapshot(jwt_payload[current_app.config['JWT_IDENTITY_CLAIM']])
+    return user is None or user.is_active != enums.UserStatus.isActive or jwt_payload.get('ver', 0) != user.token_version
+
+def bump_token_version(user):
+    """Invalidate every token issued to a user (call before committing the change)"""
+    user.token_version = (user.token_version or 0) + 1
+
+def forget_user(user_id):
+    """Drop this worker's cached snapshot of a user (call after committing a change)"""
+    auth_cache.invalidate('users', user_id)
+
+def admin_required():
+    """jwt_required() that also requires the admin role claim (no database lookup)"""
+    def decorator(fn):
+        @wraps(fn)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            if not is_admin():
+                return jsonify({
+                    'success': False,
+                    'error': 'Admin access required',
+                    'message': 'Permission denied'
+                }), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def register_jwt_callbacks(jwt):
+    """Reject revoked/outdated tokens, and load current_user"""
+    @jwt.token_in_blocklist_loader
+    def check_token_revoked(jwt_header, jwt_payload):
+        return is_token_revoked(jwt_payload)
+    
+    # flask_jwt_extended keeps the result on flask.g for the rest of the request
+    @jwt.user_lookup_loader
+    def load_current_user(jwt_header, jwt_payload):
+        return get_user_snapshot(jwt_payload[current_app.config['JWT_IDENTITY_CLAIM']])
@@ -0,0 +1,151 @@
+from datetime import datetime, timezone, timedelta
+from app.models import TokenBlocklist, db
+from app.utils.db_routing import use_primary
+import hashlib
+import math
+import threading
+import time
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives, rare false positives)"""
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.size = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+class TokenRevocations:
+    """Revoked JWT ids: token_blocklist table of record, Bloom filter in front
+
+    Each worker keeps a Bloom filter of the jtis in token_blocklist. A jti
+    missing from the filter is certainly not revoked, so the common case costs
+    a few hashes and no query; a filter hit is confirmed with an indexed lookup.
+    Workers pull jtis revoked elsewhere every sync_interval seconds, and rebuild
+    the filter from unexpired rows every rebuild_interval seconds (Bloom filters
+    can't remove entries, expired jtis drop out on rebuild).
+    """
+
+    SYNC_OVERLAP = timedelta(seconds=5)  # re-read window for rows committed after the last sync
+
+    def __init__(self, capacity=100000, error_rate=0.001, sync_interval=5, rebuild_interval=3600):
+        self._lock = threading.Lock()
+        self.configure(capacity, error_rate, sync_interval, rebuild_interval)
+
+    def configure(self, capacity=100000, error_rate=0.001, sync_interval=5, rebuild_interval=3600):
+        """Set filter size and refresh intervals; the filter is rebuilt on next use"""
+        with self._lock:
+            self.capacity = int(capacity)
+            self.error_rate = float(error_rate)
+            self.sync_interval = float(sync_interval)
+            self.rebuild_interval = float(rebuild_interval)
+            self._filter = None
+            self._synced_at = None
+            self._next_sync = 0
+            self._next_rebuild = 0
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now < self._next_sync and self._filter is not None:
+            return
+        # Only one thread syncs; others keep using the current filter meanwhile
+        if not self._lock.acquire(blocking=self._filter is None):
+            return
+        try:
+            if self._filter is None or now >= self._next_rebuild or self._filter.count > self._filter.capacity:
+                self._rebuild(now)
+            elif now >= self._next_sync:
+                self._sync()
+            self._next_sync = now + self.sync_interval
+        finally:
+            self._lock.release()
+
+    def _rebuild(self, now):
+        synced_at = datetime.now(timezone.utc)
+        jtis = [row.jti for row in db.session.query(TokenBlocklist.jti).filter(TokenBlocklist.expires_at > synced_at)]
+        bloom = BloomFilter(max(self.capacity, len(jtis) * 2), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+        self._synced_at = synced_at
+        self._next_rebuild = now + self.rebuild_interval
+
+    def _sync(self):
+        synced_at = datetime.now(timezone.utc)
+        rows = db.session.query(TokenBlocklist.jti).filter(TokenBlocklist.created_at > self._synced_at - self.SYNC_OVERLAP)
+        for row in rows:
+            if row.jti not in self._filter:
+                self._filter.add(row.jti)
+        self._synced_at = synced_at
+
+    def is_revoked(self, jti):
+        """True if the jti was revoked (by this or any other worker, within sync_interval)
+
+        Reads use the primary: the sync only re-reads SYNC_OVERLAP back, so a
+        lagging replica would make it skip revocations until the next rebuild.
+        """
+        with use_primary():
+            self._refresh()
+            if jti not in self._filter:
+                return False
+            return db.session.query(TokenBlocklist.id).filter_by(jti=jti).first() is not None
+
+    def revoke(self, payloads):
+        """Store decoded JWT payloads in the blocklist and commit
+
+        Returns:
+            Number of newly revoked tokens
+        """
+        jtis = [payload['jti'] for payload in payloads]
+        existing = {row.jti for row in db.session.query(TokenBlocklist.jti).filter(TokenBlocklist.jti.in_(jtis))}
+
+        added = []
+        for payload in payloads:
+            if payload['jti'] in existing or payload['jti'] in added:
+                continue
+            db.session.add(TokenBlocklist(
+                jti=payload['jti'],
+                token_type=payload.get('type', 'access'),
+                user_id=payload.get('sub'),
+                expires_at=datetime.fromtimestamp(payload['exp'], timezone.utc)
+            ))
+            added.append(payload['jti'])
+        db.session.commit()
+
+        # Visible to this worker immediately, others pick it up on their next sync
+        self._refresh()
+        for jti in added:
+            self._filter.add(jti)
+        return len(added)
+
+    def prune(self):
+        """Delete blocklist rows whose tokens have expired anyway
+
+        Returns:
+            Number of rows deleted
+        """
+        deleted = TokenBlocklist.query.filter(
+            TokenBlocklist.expires_at <= datetime.now(timezone.utc)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+# Configured in create_app from TOKEN_BLOCKLIST_*
+token_revocations = TokenRevocations()
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+import threading
+import time
+import os
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe in-process cache with per-entry TTL and LRU eviction
+
+    Keys are tuples whose first items act as a namespace, e.g.
+    ('books', 'detail', book_id), so related entries can be dropped together
+    with invalidate('books', 'detail', book_id) or invalidate('books').
+
+    Each gunicorn worker holds its own copy; invalidation is local to the
+    worker, so the TTL bounds how stale other workers can get.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self.configure(max_entries, ttl)
+
+    def configure(self, max_entries=1024, ttl=60):
+        """Resize the cache and reset entries and counters (ttl <= 0 disables caching)"""
+        with self._lock:
+            self.max_entries = max(int(max_entries), 1)
+            self.ttl = int(ttl)
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def get(self, key, default=None):
+        """Return a cached value, or default on miss/expiry"""
+        if not self.enabled:
+            return default
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entry when full"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss
+
+        None results are not cached, so lookups of missing ids always go to the database.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def invalidate(self, *prefix):
+        """Drop every entry whose key starts with prefix (everything when no prefix given)"""
+        with self._lock:
+            if not prefix:
+                self._entries.clear()
+                return
+            size = len(prefix)
+            for key in [k for k in self._entries if k[:size] == prefix]:
+                del self._entries[key]
+
+    def stats(self):
+        """Hit/miss counters and occupancy for this worker"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'pid': os.getpid(),
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+            }
+
+# Serialized book/author/category dicts, configured in create_app
+catalog_cache = TTLCache()
+
+# Per-user CurrentUser snapshots (token checks and profile reads), configured in create_app
+auth_cache = TTLCache(max_entries=4096, ttl=30)
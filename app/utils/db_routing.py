@@ -0,0 +1,198 @@
+from contextlib import contextmanager
+from functools import wraps
+from flask import g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, exc, text
+from sqlalchemy.sql.dml import UpdateBase
+import hashlib
+import threading
+import time
+
+REPLICA_BIND = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE = 'db_primary_until'
+
+class RoutingSession(Session):
+    """db.session class that sends read-only work to the 'replica' bind
+
+    Statements go to the replica only while reads are routed there (GET
+    requests, or inside read_from_replica()) and only until the session
+    writes: flushes, DML and SELECT ... FOR UPDATE always use the primary,
+    and pin the rest of the request to it. Without a replica bind, or while
+    the replica is marked down, everything uses the primary.
+
+    The replica connection is opened here rather than when the statement
+    runs, so a replica that can't be reached is marked down and the same
+    statement goes to the primary instead of failing the request.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _reads_use_replica():
+            if self._flushing or _is_write(clause):
+                g.db_wrote = True
+            else:
+                engine = self._db.engines.get(REPLICA_BIND)
+                if engine is not None and replica_health.available(engine) and self._replica_connects(engine):
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_connects(self, engine):
+        # Joins the session transaction; later statements reuse the connection
+        try:
+            self.connection(bind_arguments={'bind': engine})
+            return True
+        except exc.DBAPIError:
+            replica_health.mark_down(engine)
+            return False
+
+def _is_write(clause):
+    return isinstance(clause, UpdateBase) or getattr(clause, '_for_update_arg', None) is not None
+
+def _reads_use_replica():
+    return has_app_context() and g.get('db_read_only', False) and not g.get('db_wrote', False)
+
+class ReplicaHealth:
+    """Tracks whether the replica answers, probing it at most every retry_interval seconds
+
+    One thread probes at a time; the others keep the last known state
+    instead of waiting for it (bounded by the replica's connect timeout).
+    """
+
+    def __init__(self, retry_interval=30):
+        self.retry_interval = retry_interval
+        self._lock = threading.Lock()
+        self._state = {}  # engine -> (available, next probe at)
+
+    def available(self, engine):
+        available, next_probe = self._state.get(engine, (False, 0))
+        if time.monotonic() < next_probe:
+            return available
+        if not self._lock.acquire(blocking=False):
+            return available
+        try:
+            available, next_probe = self._state.get(engine, (False, 0))
+            if time.monotonic() >= next_probe:
+                available = self._probe(engine)
+                self._state[engine] = (available, time.monotonic() + self.retry_interval)
+        finally:
+            self._lock.release()
+        return available
+
+    @staticmethod
+    def _probe(engine):
+        try:
+            with engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+            return True
+        except Exception:
+            return False
+
+    def mark_down(self, engine):
+        """Send reads to the primary until the next probe"""
+        self._state[engine] = (False, time.monotonic() + self.retry_interval)
+
+    def reset(self):
+        self._state.clear()
+
+replica_health = ReplicaHealth()
+
+@contextmanager
+def read_from_replica():
+    """Route reads inside the block to the replica (for read-only work outside GET requests)"""
+    previous = g.get('db_read_only', False)
+    g.db_read_only = True
+    try:
+        yield
+    finally:
+        g.db_read_only = previous
+
+@contextmanager
+def use_primary():
+    """Route everything inside the block to the primary (reads that must see the latest writes)"""
+    previous = g.get('db_read_only', False)
+    g.db_read_only = False
+    try:
+        yield
+    finally:
+        g.db_read_only = previous
+
+def replica_read(fn):
+    """Mark a read-only service method so it may be served by the replica"""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with read_from_replica():
+            return fn(*args, **kwargs)
+    return wrapper
+
+class _RecentWriters:
+    """Clients that wrote within the read-your-writes window (per worker)"""
+
+    MAX_ENTRIES = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._until = {}
+
+    def add(self, key, until):
+        with self._lock:
+            if len(self._until) >= self.MAX_ENTRIES:
+                now = time.time()
+                self._until = {k: v for k, v in self._until.items() if v > now}
+            self._until[key] = until
+
+    def pinned(self, key):
+        return self._until.get(key, 0) > time.time()
+
+_recent_writers = _RecentWriters()
+
+def _client_key():
+    auth = request.headers.get('Authorization')
+    if not auth:
+        return None
+    return hashlib.sha1(auth.encode('utf-8')).hexdigest()
+
+def _pinned_to_primary():
+    try:
+        if float(request.cookies.get(PIN_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    key = _client_key()
+    return key is not None and _recent_writers.pinned(key)
+
+def register_db_routing(app):
+    """Route GET requests to the replica bind, if SQLALCHEMY_BINDS has one
+
+    After a successful write a client reads from the primary for
+    READ_YOUR_WRITES_SECONDS: browsers through a cookie (works across
+    workers), bearer-token clients through a per-worker record of their token.
+    """
+    from app.models import db
+
+    with app.app_context():
+        engine = db.engines.get(REPLICA_BIND)
+    if engine is None:
+        return
+
+    replica_health.retry_interval = app.config.get('REPLICA_RETRY_INTERVAL', 30)
+    window = app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+
+    @event.listens_for(engine, 'handle_error')
+    def replica_failed(context):
+        if context.is_disconnect or context.connection is None:
+            replica_health.mark_down(engine)
+
+    @app.before_request
+    def route_reads():
+        g.db_read_only = request.method in SAFE_METHODS and not _pinned_to_primary()
+        g.db_wrote = False
+
+    @app.after_request
+    def remember_writes(response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            until = time.time() + window
+            response.set_cookie(PIN_COOKIE, str(until), max_age=window, httponly=True, samesite='Lax')
+            key = _client_key()
+            if key:
+                _recent_writers.add(key, until)
+        return response
@@ -1,5 +1,4 @@
-from flask_jwt_extended import get_jwt_identity
-from app.models import User
+from flask_jwt_extended import get_jwt, get_current_user
 
 class enums:
     class UserRole:
@@ -11,9 +10,17 @@ class enums:
         isActive = 1
 
 def is_admin():
-    """Check if current user is admin (role >= 1)"""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
-    return user and user.role >= 1
+    """Check if current user is admin (role >= 1)
+    
+    Reads the role claim of the access token. Role changes revoke older
+    tokens (see app.utils.auth), so the claim is never trusted past a demotion.
+    """
+    claims = get_jwt()
+    if 'role' in claims:
+        return claims['role'] >= enums.UserRole.isAdmin
+    
+    # Tokens issued before role claims were added (cached user snapshot)
+    user = get_current_user()
+    return user is not None and user.role >= 1
 
 
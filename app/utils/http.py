@@ -0,0 +1,16 @@
+from flask import current_app, jsonify, request
+
+def conditional_json(payload):
+    """Build a cacheable JSON 200 response for read-only catalog endpoints
+
+    Adds a strong ETag (hash of the body) and Cache-Control. Returns 304 Not
+    Modified when the request's If-None-Match shows the client copy is current.
+    No Last-Modified: the payloads are lists that shrink on deletes and books
+    that embed ratings and author/category names, none of which move the
+    rows' updated_at, so If-Modified-Since could confirm a stale copy.
+    """
+    response = jsonify(payload)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get('CATALOG_HTTP_MAX_AGE', 0)
+    response.add_etag()
+    return response.make_conditional(request)
@@ -0,0 +1,155 @@
+from datetime import datetime, timezone, timedelta
+from functools import wraps
+from flask import current_app, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from app.models import IdempotencyKey, db
+import hashlib
+import json
+import time
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.1  # seconds between checks while another request holds the key
+
+def _fingerprint():
+    """Hash of what the key is being used for, so a reused key can't replay a different request"""
+    data = request.get_json(silent=True)
+    body = json.dumps(data, sort_keys=True) if data is not None else request.get_data(as_text=True)
+    return hashlib.sha256(f'{request.method} {request.path}\n{body}'.encode('utf-8')).hexdigest()
+
+def _claim(user_id, key, request_hash):
+    """Insert an in-progress record for the key and commit
+
+    Expired records, and in-progress ones older than IDEMPOTENCY_LOCK_TIMEOUT
+    (their request died), are removed first. The timeout must exceed the
+    longest a request can run (gunicorn's timeout kills it after that):
+    taking over a key whose request is still running runs the view twice.
+
+    Returns:
+        The record id, or None if another request already holds the key
+    """
+    now = datetime.now(timezone.utc)
+    abandoned = now - timedelta(seconds=current_app.config.get('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+    IdempotencyKey.query.filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.key == key,
+        or_(
+            IdempotencyKey.expires_at <= now,
+            and_(IdempotencyKey.status == 'in_progress', IdempotencyKey.created_at <= abandoned)
+        )
+    ).delete(synchronize_session=False)
+
+    record = IdempotencyKey(
+        user_id=user_id,
+        key=key,
+        request_hash=request_hash,
+        expires_at=now + timedelta(seconds=current_app.config.get('IDEMPOTENCY_TTL', 86400))
+    )
+    db.session.add(record)
+    try:
+        db.session.flush()
+        record_id = record.id
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return None
+    return record_id
+
+def _load(user_id, key):
+    return IdempotencyKey.query.filter_by(user_id=user_id, key=key).execution_options(populate_existing=True).first()
+
+def _store(record_id, response):
+    db.session.rollback()
+    db.session.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.id == record_id)
+        .values(
+            status='completed',
+            response_status=response.status_code,
+            response_body=response.get_data(as_text=True),
+            response_mimetype=response.mimetype,
+            updated_at=datetime.now(timezone.utc)
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+def _release(record_id):
+    """Forget the key so the request can be retried (it failed on our side)"""
+    db.session.rollback()
+    IdempotencyKey.query.filter_by(id=record_id).delete(synchronize_session=False)
+    db.session.commit()
+
+def _replay(record):
+    response = current_app.response_class(record.response_body, status=record.response_status, mimetype=record.response_mimetype)
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+def idempotent(fn):
+    """Honor an Idempotency-Key header on a POST view (apply after jwt_required)
+
+    The first request with a key runs the view and its response is stored per
+    (user, key) for IDEMPOTENCY_TTL seconds; retries with the same key get the
+    stored response without running the view again. A retry arriving while the
+    first request is still running waits up to IDEMPOTENCY_WAIT_SECONDS for its
+    result, then answers 409. Reusing a key for a different request body is a
+    422. 5xx responses are not stored, so those requests can be retried.
+    Requests without the header behave as before.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return fn(*args, **kwargs)
+
+        key = key.strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'{HEADER} must be 1-{MAX_KEY_LENGTH} characters'}), 400
+
+        user_id = get_jwt_identity()
+        request_hash = _fingerprint()
+        deadline = time.monotonic() + current_app.config.get('IDEMPOTENCY_WAIT_SECONDS', 10)
+
+        while True:
+            record_id = _claim(user_id, key, request_hash)
+            if record_id is not None:
+                break
+
+            record = _load(user_id, key)
+            if record is not None:
+                if record.request_hash != request_hash:
+                    return jsonify({'error': f'{HEADER} was already used for a different request'}), 422
+                if record.status == 'completed':
+                    return _replay(record)
+            if time.monotonic() >= deadline:
+                return jsonify({
+                    'error': 'A request with this Idempotency-Key is still in progress, please retry'
+                }), 409, {'Retry-After': '1'}
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            response = make_response(fn(*args, **kwargs))
+        except Exception:
+            _release(record_id)
+            raise
+
+        if response.status_code >= 500:
+            _release(record_id)
+        else:
+            _store(record_id, response)
+        return response
+    return wrapper
+
+def prune_idempotency_keys():
+    """Delete expired records
+
+    Returns:
+        Number of rows deleted
+    """
+    deleted = IdempotencyKey.query.filter(
+        IdempotencyKey.expires_at <= datetime.now(timezone.utc)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -0,0 +1,110 @@
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import or_, and_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse a ?limit= query value, clamped to [1, maximum]"""
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid limit format')
+    if limit <= 0:
+        raise ValueError('Limit must be greater than 0')
+    return min(limit, maximum)
+
+
+def _dump_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _load_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+    if isinstance(value, (dict, list)):
+        raise ValueError('Not a sort key')
+    return value
+
+
+def encode_cursor(scope, key, row_id):
+    """Encode (scope, sort key, id) into an opaque URL-safe cursor"""
+    payload = json.dumps([scope, _dump_value(key), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, scope):
+    """Decode a cursor produced by encode_cursor, returns (key, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_scope, key, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        # A hand-edited cursor must not reach the query as a malformed value
+        key = _load_value(key)
+        if not isinstance(row_id, (str, int)):
+            raise TypeError('Not a row id')
+    except (ValueError, TypeError, InvalidOperation):
+        raise ValueError('Invalid cursor')
+    if cursor_scope != scope:
+        raise ValueError('Cursor does not match the requested sort order')
+    return key, row_id
+
+
+def keyset_paginate(query, sort_column, id_column, limit, cursor=None, descending=False,
+                    scope='', entity=None):
+    """Apply a stable (sort key, id) ordering and keyset filter to a query
+
+    Fetches one extra row to detect whether another page exists, so the
+    cost of a page never depends on how deep into the result set it is.
+
+    Args:
+        query: Base query with all filters applied
+        sort_column: Column used as the primary sort key
+        id_column: Unique tie-breaker column
+        limit: Page size
+        cursor: Opaque cursor from a previous page (optional)
+        descending: Sort direction for both columns
+        scope: Tag stored in the cursor so it can't be replayed against another sort
+        entity: Callable mapping a result row to the object holding the sort
+            attributes (for queries returning tuples)
+
+    Returns:
+        (rows, next_cursor) - next_cursor is None on the last page
+    """
+    if cursor:
+        last_key, last_id = decode_cursor(cursor, scope)
+        if descending:
+            query = query.filter(or_(
+                sort_column < last_key,
+                and_(sort_column == last_key, id_column < last_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > last_key,
+                and_(sort_column == last_key, id_column > last_id)
+            ))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = entity(rows[-1]) if entity else rows[-1]
+        next_cursor = encode_cursor(scope, getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+from flask import jsonify
+from app import bcrypt
+import threading
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already queued"""
+
+class PasswordHasher:
+    """Runs bcrypt on a small dedicated thread pool
+
+    bcrypt is deliberately CPU heavy; hashing on the request threads lets a
+    burst of logins starve every other endpoint. The pool caps how many
+    hashes run at once per worker, and calls beyond max_pending (running +
+    queued) fail fast with PasswordHasherBusy so routes can answer 503.
+    """
+
+    def __init__(self, workers=2, max_pending=16, rounds=12):
+        self._executor = None
+        self.configure(workers, max_pending, rounds)
+
+    def configure(self, workers=2, max_pending=16, rounds=12):
+        """(Re)create the pool; rounds is the bcrypt cost for new hashes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.workers = max(int(workers), 1)
+        self.max_pending = max(int(max_pending), self.workers)
+        self.rounds = int(rounds)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy('Too many password operations in progress')
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        """Hash a password with the configured cost, returns str"""
+        return self._run(bcrypt.generate_password_hash, password, self.rounds).decode('utf-8')
+
+    def check(self, password_hash, password):
+        """Verify a password against a stored hash"""
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if a stored hash was made with a different cost than configured"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return False
+
+def busy_response():
+    """503 answer for PasswordHasherBusy"""
+    return jsonify({'error': 'Server is busy, please try again shortly'}), 503, {'Retry-After': '1'}
+
+# Configured in create_app from BCRYPT_LOG_ROUNDS / PASSWORD_HASH_*
+password_hasher = PasswordHasher()
@@ -0,0 +1,191 @@
+from abc import ABC, abstractmethod
+from functools import wraps
+from importlib import import_module
+from flask import current_app, g, jsonify, request
+import math
+import threading
+import time
+
+class RateLimitStore(ABC):
+    """Storage backend for sliding-window rate limit counters
+
+    hit() must check and count one request atomically. The in-process store
+    below is per worker; for several gunicorn workers or instances, subclass
+    this with a shared backend (e.g. Redis INCR + EXPIRE on the two bucket
+    keys, DECR to release) and set RATELIMIT_STORE to 'package.module:ClassName'.
+    """
+
+    @abstractmethod
+    def hit(self, key, limit, window):
+        """Count one request for key, or refuse it
+
+        Args:
+            key: Counter key, e.g. 'login:ip:203.0.113.5'
+            limit: Requests allowed per window
+            window: Window length in seconds
+
+        Returns:
+            0 if the request is allowed (and counted), otherwise the number
+            of seconds until it would be allowed
+        """
+
+    @abstractmethod
+    def release(self, key, window):
+        """Take back one request counted by hit() (it shouldn't count after all)"""
+
+    @abstractmethod
+    def reset(self):
+        """Drop all counters"""
+
+class MemoryRateLimitStore(RateLimitStore):
+    """In-process sliding window counter store
+
+    Keeps the counts of the current and previous fixed windows per key and
+    weights the previous one by how much of it still overlaps the sliding
+    window, so memory is constant per key however many requests arrive.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}  # key -> [bucket, current count, previous count, window]
+        self._calls = 0
+
+    def hit(self, key, limit, window):
+        now = time.time()
+        bucket = int(now // window)
+        elapsed = (now % window) / window
+
+        with self._lock:
+            self._calls += 1
+            if self._calls % self.PRUNE_EVERY == 0:
+                self._prune(now)
+
+            entry = self._counters.get(key)
+            if entry is None or entry[0] < bucket - 1:
+                entry = [bucket, 0, 0, window]
+            elif entry[0] == bucket - 1:
+                entry = [bucket, 0, entry[1], window]
+            self._counters[key] = entry
+
+            current, previous = entry[1], entry[2]
+            if previous * (1 - elapsed) + current < limit:
+                entry[1] += 1
+                return 0
+
+        return self._retry_after(current, previous, limit, window, now)
+
+    @staticmethod
+    def _retry_after(current, previous, limit, window, now):
+        """Seconds until the weighted count drops below limit"""
+        remaining = window - now % window
+        if current >= limit:
+            # Wait for the next window, then for enough of this one to slide out
+            wait = remaining + window * (1 - limit / current)
+        else:
+            wait = window * (1 - (limit - current) / previous) - (window - remaining)
+        return max(int(math.ceil(wait)), 1)
+
+    def release(self, key, window):
+        bucket = int(time.time() // window)
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is None or entry[0] < bucket - 1:
+                return
+            # The request was counted in the entry's current window, or in the
+            # previous one if a new window started since
+            if entry[0] == bucket - 1 or entry[1] > 0:
+                entry[1] = max(entry[1] - 1, 0)
+            else:
+                entry[2] = max(entry[2] - 1, 0)
+
+    def _prune(self, now):
+        for key in [k for k, entry in self._counters.items() if entry[0] < int(now // entry[3]) - 1]:
+            del self._counters[key]
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+class RateLimiter:
+    """Applies the RATELIMIT_<SCOPE>_<KIND> = (limit, window seconds) settings"""
+
+    def __init__(self, store=None):
+        self.store = store or MemoryRateLimitStore()
+
+    def configure(self, store_path=None):
+        """Use the store class at 'module:ClassName', or the in-process store"""
+        if store_path:
+            module_name, class_name = store_path.split(':')
+            self.store = getattr(import_module(module_name), class_name)()
+        else:
+            self.store = MemoryRateLimitStore()
+
+    def check(self, scope, keys):
+        """Count a request against every (kind, value) key of a scope
+
+        Returns:
+            0 if allowed, otherwise the largest Retry-After in seconds
+        """
+        retry_after = 0
+        g.rate_limit_counted = counted = []
+        for kind, value in keys:
+            setting = current_app.config.get(f'RATELIMIT_{scope.upper()}_{kind.upper()}')
+            if not setting or not value:
+                continue
+            limit, window = setting
+            key = f'{scope}:{kind}:{value}'
+            wait = self.store.hit(key, limit, window)
+            if wait:
+                retry_after = max(retry_after, wait)
+            else:
+                counted.append((kind, key, window))
+        return retry_after
+
+    def release(self, kind):
+        """Take back this request's hits on the given key kind (e.g. 'user' after a successful login)"""
+        counted = g.get('rate_limit_counted', [])
+        for entry in [entry for entry in counted if entry[0] == kind]:
+            self.store.release(entry[1], entry[2])
+            counted.remove(entry)
+
+def client_ip():
+    """Client address, taken from X-Forwarded-For when behind RATELIMIT_TRUSTED_PROXIES proxies"""
+    proxies = current_app.config.get('RATELIMIT_TRUSTED_PROXIES', 0)
+    if proxies and request.headers.get('X-Forwarded-For'):
+        # Same choice as werkzeug's ProxyFix(x_for=proxies): the entry added by the outermost trusted proxy
+        route = request.access_route
+        return route[-min(proxies, len(route))]
+    return request.remote_addr
+
+def rate_limit(scope, by_username=False):
+    """Reject requests over the scope's limits with 429 before the view runs
+
+    Limits are counted per client IP and, with by_username, per lowercase
+    'username' from the JSON body (login accepts a username or an email).
+    A view can take back its 'user' hit with rate_limiter.release('user'),
+    so only failed attempts use up an account's lockout budget.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_app.config.get('RATELIMIT_ENABLED', True):
+                keys = [('ip', client_ip())]
+                if by_username:
+                    data = request.get_json(silent=True) or {}
+                    username = data.get('username')
+                    if isinstance(username, str):
+                        keys.append(('user', username.strip().lower()))
+
+                retry_after = rate_limiter.check(scope, keys)
+                if retry_after:
+                    return jsonify({
+                        'error': 'Too many attempts, please try again later'
+                    }), 429, {'Retry-After': str(retry_after)}
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# Configured in create_app from RATELIMIT_STORE
+rate_limiter = RateLimiter()
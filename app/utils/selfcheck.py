@@ -0,0 +1,70 @@
+from sqlalchemy import text
+from app.models import db
+
+DEFAULT_SECRETS = ('dev-secret-key-change-in-production', 'jwt-secret-key-change-in-production')
+
+def collect_settings(app, workers=None, threads=None):
+    """Effective runtime settings, read from the live engine where possible"""
+    engine = db.engine
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    settings = {
+        'debug': app.debug,
+        'sql_echo': bool(app.config.get('SQLALCHEMY_ECHO')),
+        'database': engine.url.render_as_string(hide_password=True),
+        'replica': db.engines['replica'].url.render_as_string(hide_password=True) if 'replica' in db.engines else None,
+        'pool_class': type(engine.pool).__name__,
+        'pool_size': options.get('pool_size'),
+        'max_overflow': options.get('max_overflow'),
+        'pool_timeout': options.get('pool_timeout'),
+        'pool_recycle': options.get('pool_recycle'),
+        'pool_pre_ping': options.get('pool_pre_ping', False),
+        'workers': workers,
+        'threads': threads,
+        'bcrypt_rounds': app.config.get('BCRYPT_LOG_ROUNDS'),
+        'catalog_cache_ttl': app.config.get('CATALOG_CACHE_TTL'),
+        'auth_cache_ttl': app.config.get('AUTH_CACHE_TTL'),
+        'rate_limiting': app.config.get('RATELIMIT_ENABLED', True),
+    }
+    if workers and options.get('pool_size') is not None:
+        settings['max_db_connections'] = workers * (options['pool_size'] + options.get('max_overflow', 0))
+
+    if engine.dialect.name == 'postgresql':
+        with engine.connect() as connection:
+            settings['server_version'] = connection.execute(text('SHOW server_version')).scalar()
+            settings['statement_timeout'] = connection.execute(text('SHOW statement_timeout')).scalar()
+    return settings
+
+def find_problems(app, settings):
+    """Misconfigurations worth a warning at startup"""
+    problems = []
+    if settings['debug']:
+        problems.append('DEBUG is enabled')
+    if settings['sql_echo']:
+        problems.append('SQLALCHEMY_ECHO is enabled, every query is logged')
+    for key in ('SECRET_KEY', 'JWT_SECRET_KEY'):
+        if not app.config.get(key) or app.config.get(key) in DEFAULT_SECRETS:
+            problems.append(f'{key} is missing or uses the development default')
+    if settings['database'].startswith('sqlite') and (settings['workers'] or 1) > 1:
+        problems.append('SQLite with several workers, writes will contend for the database lock')
+    if settings.get('statement_timeout') in ('0', '0ms'):
+        problems.append('PostgreSQL statement_timeout is disabled')
+    if settings['threads'] and settings['pool_size'] is not None:
+        capacity = settings['pool_size'] + (settings['max_overflow'] or 0)
+        if settings['threads'] > capacity:
+            problems.append(f'{settings["threads"]} threads per worker share {capacity} pooled connections')
+    return problems
+
+def run_self_check(app, workers=None, threads=None, log=None):
+    """Log the effective settings (info) and any problems found (warning)
+
+    Returns:
+        (settings, problems)
+    """
+    log = log or app.logger
+    settings = collect_settings(app, workers, threads)
+    problems = find_problems(app, settings)
+
+    log.info('Startup self-check: ' + ', '.join(f'{key}={value}' for key, value in settings.items()))
+    for problem in problems:
+        log.warning(f'Startup self-check: {problem}')
+    return settings, problems
@@ -0,0 +1,169 @@
+"""
+Benchmark the soft-delete composite indexes on a large seeded dataset (PostgreSQL only)
+
+Shows the query plan of each repository lookup with and without the
+*_active indexes. Indexes are dropped inside a transaction that is rolled
+back, so the database is left unchanged.
+
+Usage (point DATABASE_URL at a scratch database, not production):
+    python benchmark_indexes.py --seed --rows 1000000   # generate data, then benchmark
+    python benchmark_indexes.py                          # benchmark existing data
+    python benchmark_indexes.py --cleanup                # remove generated rows
+"""
+import argparse
+import json
+import sys
+from sqlalchemy import text
+from app import create_app
+from app.models import db
+from config.development import DevelopmentConfig
+
+BENCH_TAG = 'benchmark'
+
+class BenchmarkConfig(DevelopmentConfig):
+    SQLALCHEMY_ECHO = False
+
+# (label, SQL) - same shapes the repositories issue
+QUERIES = [
+    ('Cart items by user', "SELECT * FROM cart_items WHERE user_id = :user_id AND is_deleted = false"),
+    ('Cart item by user and book', "SELECT * FROM cart_items WHERE user_id = :user_id AND book_id = :book_id AND is_deleted = false LIMIT 1"),
+    ('Orders by user', "SELECT * FROM order_details WHERE user_id = :user_id AND is_deleted = false ORDER BY order_date DESC"),
+    ('Orders by status', "SELECT * FROM order_details WHERE order_status = 'Pending' AND is_deleted = false ORDER BY order_date DESC LIMIT 20"),
+    ('Recent orders (admin)', "SELECT * FROM order_details WHERE is_deleted = false ORDER BY order_date DESC LIMIT 20"),
+    ('Order items by order', "SELECT * FROM order_items WHERE order_details_id = :order_id AND is_deleted = false"),
+    ('Reviews by book', "SELECT * FROM reviews WHERE book_id = :book_id AND is_deleted = false"),
+    ('Books by category, newest', "SELECT * FROM books WHERE category_id = :category_id AND is_deleted = false ORDER BY created_at DESC, id DESC LIMIT 21"),
+    ('Books by price', "SELECT * FROM books WHERE is_deleted = false ORDER BY price ASC, id ASC LIMIT 21"),
+]
+
+def seed(rows):
+    """Generate users, catalog, carts, orders and reviews with generate_series"""
+    users = max(rows // 100, 10)
+    books = max(rows // 10, 10)
+    print(f'Seeding {users} users, {books} books and {rows} rows per large table...')
+    statements = [
+        f"""INSERT INTO authors (id, author_name, created_at, updated_at, is_deleted, created_by, role, is_active)
+            SELECT 'bench-author-' || i, 'Bench Author ' || i, now(), now(), false, '{BENCH_TAG}', 0, 1
+            FROM generate_series(1, 1000) i""",
+        f"""INSERT INTO categories (id, category_type, created_at, updated_at, is_deleted, created_by, role, is_active)
+            SELECT 'bench-category-' || i, 'Bench Category ' || i, now(), now(), false, '{BENCH_TAG}', 0, 1
+            FROM generate_series(1, 50) i""",
+        f"""INSERT INTO users (id, username, name, email, password, created_at, updated_at, is_deleted, created_by, role, is_active)
+            SELECT 'bench-user-' || i, 'bench_user_' || i, 'Bench User', 'bench' || i || '@example.com', 'x',
+                   now(), now(), false, '{BENCH_TAG}', 0, 1
+            FROM generate_series(1, {users}) i""",
+        f"""INSERT INTO books (id, title, price, stock_quantity, author_id, category_id, created_at, updated_at, is_deleted, created_by, role, is_active)
+            SELECT 'bench-book-' || i, 'Bench Book ' || i, 100 + (i % 2000), i % 50,
+                   'bench-author-' || (1 + i % 1000), 'bench-category-' || (1 + i % 50),
+                   now() - (i || ' minutes')::interval, now(), (i % 20 = 0), '{BENCH_TAG}', 0, 1
+            FROM generate_series(1, {books}) i""",
+        f"""INSERT INTO cart_items (id, quantity, book_id, user_id, created_at, updated_at, is_deleted, created_by, role, is_active)
+            SELECT 'bench-cart-' || i, 1, 'bench-book-' || (1 + i % {books}), 'bench-user-' || (1 + i % {users}),
+                   now(), now(), (i % 10 <> 0), '{BENCH_TAG}', 0, 1
+            FROM generate_series(1, {rows}) i""",
+        f"""INSERT INTO order_details (id, total_amount, order_date, order_status, shipping_address, city, phone_number,
+                                       user_id, created_at, updated_at, is_deleted, created_by, role, is_active)
+            SELECT 'bench-order-' || i, 1000, now() - (i || ' minutes')::interval,
+                   (ARRAY['Pending', 'Confirmed', 'Shipped', 'Delivered', 'Cancelled'])[1 + i % 5],
+                   'Street ' || i, 'Lahore', '03001234567', 'bench-user-' || (1 + i % {users}),
+                   now(), now(), (i % 50 = 0), '{BENCH_TAG}', 0, 1
+            FROM generate_series(1, {rows}) i""",
+        f"""INSERT INTO order_items (id, unit_price, quantity, user_id, order_details_id, book_id, created_at, updated_at, is_deleted, created_by, role, is_active)
+            SELECT 'bench-item-' || i, 500, 1 + i % 3, 'bench-user-' || (1 + i % {users}), 'bench-order-' || (1 + i % {rows}),
+                   'bench-book-' || (1 + i % {books}), now(), now(), false, '{BENCH_TAG}', 0, 1
+            FROM generate_series(1, {rows}) i""",
+        f"""INSERT INTO reviews (id, rating, user_id, book_id, created_at, updated_at, is_deleted, created_by, role, is_active)
+            SELECT 'bench-review-' || i, 1 + i % 5, 'bench-user-' || (1 + i % {users}), 'bench-book-' || (1 + i / {users} % {books}),
+                   now(), now(), (i % 25 = 0), '{BENCH_TAG}', 0, 1
+            FROM generate_series(1, {rows}) i
+            ON CONFLICT DO NOTHING""",
+    ]
+    for statement in statements:
+        db.session.execute(text(statement))
+    db.session.commit()
+
+def cleanup():
+    """Delete every row created by seed()"""
+    for table in ['reviews', 'order_items', 'order_details', 'cart_items', 'books', 'users', 'categories', 'authors']:
+        result = db.session.execute(text(f"DELETE FROM {table} WHERE created_by = :tag"), {'tag': BENCH_TAG})
+        print(f'{table}: deleted {result.rowcount} rows')
+    db.session.commit()
+
+def sample_params():
+    """Pick real ids so every query hits data"""
+    row = lambda sql: db.session.execute(text(sql)).scalar()
+    return {
+        'user_id': row("SELECT user_id FROM order_details WHERE is_deleted = false ORDER BY order_date DESC LIMIT 1"),
+        'book_id': row("SELECT book_id FROM reviews WHERE is_deleted = false LIMIT 1"),
+        'order_id': row("SELECT order_details_id FROM order_items WHERE is_deleted = false LIMIT 1"),
+        'category_id': row("SELECT id FROM categories WHERE is_deleted = false LIMIT 1"),
+    }
+
+def explain(sql, params):
+    """Return (top plan node, execution time ms)"""
+    plan = db.session.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    root = plan[0]
+
+    # Report the node that actually reads the table
+    node = root['Plan']
+    while node.get('Plans') and node['Node Type'] in ('Limit', 'Sort', 'Gather', 'Gather Merge', 'Incremental Sort'):
+        node = node['Plans'][0]
+    label = node['Node Type']
+    if node.get('Index Name'):
+        label += f" using {node['Index Name']}"
+    return label, root['Execution Time']
+
+def active_indexes():
+    """Names of the *_active indexes declared on the models"""
+    return sorted(
+        index.name
+        for table in db.metadata.tables.values()
+        for index in table.indexes
+        if index.name and index.name.endswith('_active')
+    )
+
+def run_benchmark():
+    for table in ['books', 'cart_items', 'order_details', 'order_items', 'reviews']:
+        db.session.execute(text(f"ANALYZE {table}"))
+    db.session.commit()
+
+    params = sample_params()
+    with_indexes = {label: explain(sql, params) for label, sql in QUERIES}
+
+    # Drop the indexes inside the transaction, measure, then roll back
+    for name in active_indexes():
+        db.session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    without_indexes = {label: explain(sql, params) for label, sql in QUERIES}
+    db.session.rollback()
+
+    print(f"\n{'Query':<30} {'Without indexes':<48} {'With indexes':<60}")
+    print('-' * 138)
+    for label, _ in QUERIES:
+        before, before_ms = without_indexes[label]
+        after, after_ms = with_indexes[label]
+        print(f"{label:<30} {before + f' ({before_ms:.1f} ms)':<48} {after + f' ({after_ms:.1f} ms)':<60}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark soft-delete composite indexes (PostgreSQL)')
+    parser.add_argument('--seed', action='store_true', help='generate benchmark data first')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='rows per large table when seeding')
+    parser.add_argument('--cleanup', action='store_true', help='delete generated benchmark data and exit')
+    args = parser.parse_args()
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        if db.engine.dialect.name != 'postgresql':
+            print('This benchmark requires PostgreSQL (set DATABASE_URL)')
+            sys.exit(1)
+
+        if args.cleanup:
+            cleanup()
+            return
+        if args.seed:
+            seed(args.rows)
+        run_benchmark()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Compare checkout throughput of the two STOCK_CONCURRENCY strategies (PostgreSQL only)
+
+Parallel buyers check out one copy of the same popular book over and over
+(a flash sale), once with 'pessimistic' (SELECT ... FOR UPDATE) and once with
+'optimistic' (conditional UPDATE last, bounded retries), through the real
+OrderService code path. Every generated row is deleted afterwards.
+
+Usage (point DATABASE_URL at a scratch database, not production):
+    python benchmark_stock.py                          # 50 buyers x 20 checkouts each
+    python benchmark_stock.py --buyers 100 --orders 10
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from sqlalchemy import text
+from app import create_app
+from app.models import Book, CartItem, User, db
+from app.services.OrderService import OrderService
+from config.development import DevelopmentConfig
+
+BENCH_TAG = 'benchmark-stock'
+BOOK_ID = 'bench-stock-book'
+SHIPPING = {'shipping_address': 'Bench Street 1', 'city': 'Lahore', 'phone_number': '03001234567'}
+
+class BenchmarkConfig(DevelopmentConfig):
+    SQLALCHEMY_ECHO = False
+    CATALOG_CACHE_TTL = 0
+
+def user_id(i):
+    return f'bench-stock-user-{i}'
+
+def seed(buyers, stock):
+    """Create the buyers and the hot book"""
+    db.session.add(Book(id=BOOK_ID, title='Bench Flash Sale Book', price=100, stock_quantity=stock, created_by=BENCH_TAG))
+    db.session.add_all([
+        User(id=user_id(i), username=f'bench_stock_{i}', name='Bench Buyer', email=f'bench_stock_{i}@example.com',
+             password='x', created_by=BENCH_TAG)
+        for i in range(buyers)
+    ])
+    db.session.commit()
+
+def cleanup():
+    """Delete every row created by the benchmark"""
+    orders = "SELECT id FROM order_details WHERE user_id LIKE 'bench-stock-user-%'"
+    statements = [
+        f"DELETE FROM jobs WHERE idempotency_key IN (SELECT 'cart_history:' || id FROM ({orders}) o)",
+        "DELETE FROM cart_history WHERE user_id LIKE 'bench-stock-user-%'",
+        f"DELETE FROM order_items WHERE order_details_id IN ({orders})",
+        f"DELETE FROM order_details WHERE id IN ({orders})",
+        "DELETE FROM cart_items WHERE user_id LIKE 'bench-stock-user-%'",
+        "DELETE FROM users WHERE created_by = :tag",
+        "DELETE FROM books WHERE created_by = :tag",
+    ]
+    for statement in statements:
+        db.session.execute(text(statement), {'tag': BENCH_TAG})
+    db.session.commit()
+
+def buyer(app, index, orders, start, results):
+    """Add one copy to the cart and check out, orders times"""
+    service = OrderService()
+    latencies, failures = [], 0
+    with app.app_context():
+        start.wait()
+        for _ in range(orders):
+            db.session.add(CartItem(user_id=user_id(index), book_id=BOOK_ID, quantity=1))
+            db.session.commit()
+            began = time.perf_counter()
+            try:
+                service.create_order_from_cart(user_id(index), SHIPPING)
+                latencies.append(time.perf_counter() - began)
+            except ValueError:
+                failures += 1
+                db.session.execute(text("DELETE FROM cart_items WHERE user_id = :user_id"), {'user_id': user_id(index)})
+                db.session.commit()
+        db.session.remove()
+    results.append((latencies, failures))
+
+def run_strategy(app, strategy, buyers, orders):
+    app.config['STOCK_CONCURRENCY'] = strategy
+    with app.app_context():
+        cleanup()
+        seed(buyers, buyers * orders)
+
+    start = threading.Barrier(buyers + 1)
+    results = []
+    threads = [threading.Thread(target=buyer, args=(app, i, orders, start, results)) for i in range(buyers)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    latencies = sorted(latency for thread_latencies, _ in results for latency in thread_latencies)
+    failures = sum(thread_failures for _, thread_failures in results)
+    with app.app_context():
+        stock = db.session.execute(text("SELECT stock_quantity FROM books WHERE id = :id"), {'id': BOOK_ID}).scalar()
+        cleanup()
+
+    return {
+        'strategy': strategy,
+        'orders': len(latencies),
+        'failed': failures,
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed else 0,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0,
+        'stock_consistent': stock == buyers * orders - len(latencies),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pessimistic vs optimistic stock updates (PostgreSQL)')
+    parser.add_argument('--buyers', type=int, default=50, help='parallel buyers')
+    parser.add_argument('--orders', type=int, default=20, help='checkouts per buyer')
+    args = parser.parse_args()
+
+    # One pooled connection per buyer, so the pool isn't what's measured
+    BenchmarkConfig.SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': args.buyers + 2, 'max_overflow': 0}
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        if db.engine.dialect.name != 'postgresql':
+            print('This benchmark requires PostgreSQL (set DATABASE_URL)')
+            sys.exit(1)
+
+    rows = [run_strategy(app, strategy, args.buyers, args.orders) for strategy in ('pessimistic', 'optimistic')]
+
+    print(f"\n{args.buyers} buyers x {args.orders} checkouts of one book")
+    print(f"{'Strategy':<14} {'Orders':>7} {'Failed':>7} {'Seconds':>8} {'Orders/s':>9} {'p50 ms':>8} {'p95 ms':>8}  Stock OK")
+    print('-' * 80)
+    for row in rows:
+        print(f"{row['strategy']:<14} {row['orders']:>7} {row['failed']:>7} {row['seconds']:>8.2f} {row['throughput']:>9.1f} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f}  {row['stock_consistent']}")
+
+if __name__ == '__main__':
+    main()
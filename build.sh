@@ -13,3 +13,6 @@ python seed_categories_authors.py
 python seed_books_new.py
 python seed_admin.py
 python seed_users.py
+
+# Refresh the book search index after seeding
+flask search rebuild
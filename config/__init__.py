@@ -1 +1,16 @@
 # Config package
+import os
+
+def get_config(name=None):
+    """Return the config class for name, or for FLASK_ENV (development, production, testing)"""
+    name = (name or os.environ.get('FLASK_ENV') or 'development').lower()
+    if name == 'production':
+        from config.production import ProductionConfig
+        return ProductionConfig
+    if name == 'testing':
+        from config.testing import TestingConfig
+        return TestingConfig
+    if name == 'development':
+        from config.development import DevelopmentConfig
+        return DevelopmentConfig
+    raise ValueError(f'Unknown FLASK_ENV: {name}')
@@ -10,6 +10,11 @@ class DevelopmentConfig:
     TESTING = False
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///dev.db')
+    # Optional read replica for GET requests (see app.utils.db_routing)
+    # Pre-ping so a dead pooled replica connection is found at checkout, where reads can still fall back
+    SQLALCHEMY_BINDS = {'replica': {'url': os.environ['DATABASE_REPLICA_URL'], 'pool_pre_ping': True}} if os.environ.get('DATABASE_REPLICA_URL') else {}
+    READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', 5))  # reads pinned to the primary after a write
+    REPLICA_RETRY_INTERVAL = int(os.environ.get('REPLICA_RETRY_INTERVAL', 30))  # seconds between replica health probes
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = True  # Print SQL queries to console
     
@@ -17,3 +22,50 @@ class DevelopmentConfig:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+
+    # Password hashing - stored hashes with another cost are rehashed on login
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))  # concurrent hashes per worker
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 16))  # running + queued before 503
+
+    # Auth rate limits as (requests, window seconds), counted per IP and per login username
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'true').lower() == 'true'
+    RATELIMIT_STORE = os.environ.get('RATELIMIT_STORE')  # 'module:Class' shared store, default in-process
+    RATELIMIT_TRUSTED_PROXIES = int(os.environ.get('RATELIMIT_TRUSTED_PROXIES', 0))  # proxies adding X-Forwarded-For
+    RATELIMIT_LOGIN_IP = (20, 60)
+    RATELIMIT_LOGIN_USER = (10, 900)  # Failed attempts only; locks an account name for up to 15 minutes
+    RATELIMIT_REGISTER_IP = (5, 300)
+    RATELIMIT_REFRESH_IP = (30, 60)
+
+    # Catalog cache (per worker)
+    CATALOG_CACHE_MAX_ENTRIES = int(os.environ.get('CATALOG_CACHE_MAX_ENTRIES', 1024))
+    CATALOG_CACHE_TTL = int(os.environ.get('CATALOG_CACHE_TTL', 60))  # seconds, 0 disables
+    CATALOG_HTTP_MAX_AGE = int(os.environ.get('CATALOG_HTTP_MAX_AGE', 0))  # Cache-Control max-age for catalog GETs (0 = always revalidate)
+
+    # Current user cache (per worker) - bounds how long role changes, deactivation and profile edits take to reach other workers
+    AUTH_CACHE_MAX_ENTRIES = int(os.environ.get('AUTH_CACHE_MAX_ENTRIES', 4096))
+    AUTH_CACHE_TTL = int(os.environ.get('AUTH_CACHE_TTL', 30))  # seconds, 0 checks every request
+
+    # Logout blocklist - each worker checks a Bloom filter and polls for other workers' revocations
+    TOKEN_BLOCKLIST_CAPACITY = int(os.environ.get('TOKEN_BLOCKLIST_CAPACITY', 100000))
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = int(os.environ.get('TOKEN_BLOCKLIST_SYNC_INTERVAL', 5))  # seconds
+    TOKEN_BLOCKLIST_REBUILD_INTERVAL = int(os.environ.get('TOKEN_BLOCKLIST_REBUILD_INTERVAL', 3600))  # seconds
+
+    # Background jobs (flask jobs work)
+    JOBS_POLL_INTERVAL = float(os.environ.get('JOBS_POLL_INTERVAL', 1))  # seconds between polls when idle
+    JOBS_MAX_ATTEMPTS = int(os.environ.get('JOBS_MAX_ATTEMPTS', 5))
+    JOBS_RETRY_BASE_SECONDS = int(os.environ.get('JOBS_RETRY_BASE_SECONDS', 10))  # doubled after every failed attempt
+    JOBS_LOCK_TIMEOUT = int(os.environ.get('JOBS_LOCK_TIMEOUT', 300))  # seconds before a running job is assumed abandoned
+
+    # Idempotency-Key on checkout, cart add and review create (see app.utils.idempotency)
+    IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', 86400))  # seconds a stored response can be replayed
+    IDEMPOTENCY_WAIT_SECONDS = int(os.environ.get('IDEMPOTENCY_WAIT_SECONDS', 10))  # a retry waits this long for the in-flight original
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.environ.get('IDEMPOTENCY_LOCK_TIMEOUT', 60))  # in-flight record considered abandoned after this (keep above the longest request)
+
+    # Stock updates: 'pessimistic' locks book rows (SELECT ... FOR UPDATE), 'optimistic' uses conditional UPDATEs with retries
+    STOCK_CONCURRENCY = os.environ.get('STOCK_CONCURRENCY', 'pessimistic')
+    STOCK_UPDATE_RETRIES = int(os.environ.get('STOCK_UPDATE_RETRIES', 3))  # optimistic checkout retries after a missed UPDATE
+
+    # Courier tracking-number CSV import (POST /admin/orders/tracking/import, flask orders import-tracking)
+    TRACKING_IMPORT_BATCH_SIZE = int(os.environ.get('TRACKING_IMPORT_BATCH_SIZE', 1000))  # rows per UPDATE and commit
+    TRACKING_IMPORT_MAX_ERRORS = int(os.environ.get('TRACKING_IMPORT_MAX_ERRORS', 1000))  # row errors listed in the report
@@ -1,4 +1,17 @@
+from datetime import timedelta
+
 class TestingConfig:
     DEBUG = True
     TESTING = True
     SECRET_KEY = 'test-secret-key'
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'  # In-memory, one per app
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    JWT_SECRET_KEY = 'test-jwt-secret-key-with-enough-bytes'
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    CATALOG_CACHE_TTL = 0  # Always read through to the database
+    AUTH_CACHE_TTL = 0  # Always load the current user from the database
+    BCRYPT_LOG_ROUNDS = 4  # Fast hashing in tests
+    RATELIMIT_ENABLED = False
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = 0  # See other workers' logouts immediately
+    JOBS_RETRY_BASE_SECONDS = 0  # Retry failed jobs immediately with JobService.run_pending()
@@ -146,6 +146,9 @@ async function getBooks(filters = {}) {
     if (filters.author_id) params.append('author_id', filters.author_id);
     if (filters.min_price) params.append('min_price', filters.min_price);
     if (filters.max_price) params.append('max_price', filters.max_price);
+    if (filters.sort) params.append('sort', filters.sort);
+    if (filters.limit) params.append('limit', filters.limit);
+    if (filters.cursor) params.append('cursor', filters.cursor);
     
     const queryString = params.toString();
     const endpoint = queryString ? `${ENDPOINTS.BOOKS}?${queryString}` : ENDPOINTS.BOOKS;
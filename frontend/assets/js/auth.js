@@ -58,6 +58,20 @@ function isAdmin() {
  * Logout user
  */
 function logout() {
+    // Revoke the tokens server-side (best effort, a failure must not keep the user logged in)
+    const accessToken = getAccessToken();
+    if (accessToken) {
+        fetch(`${CONFIG.API_BASE_URL}${ENDPOINTS.LOGOUT}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${accessToken}`
+            },
+            body: JSON.stringify({ refresh_token: getRefreshToken() }),
+            keepalive: true
+        }).catch(() => {});
+    }
+    
     localStorage.removeItem(CONFIG.TOKEN_KEY);
     localStorage.removeItem(CONFIG.REFRESH_TOKEN_KEY);
     localStorage.removeItem(CONFIG.USER_KEY);
@@ -144,11 +158,10 @@ async function updateCartBadge() {
     if (!isLoggedIn()) return;
     
     try {
-        const response = await apiGet(ENDPOINTS.CART, true);
+        const response = await apiGet(`${ENDPOINTS.CART_SUMMARY}?compact=true`, true);
         const cartBadge = document.getElementById('cart-badge');
-        if (cartBadge && response.cart) {
-            const totalItems = response.cart.reduce((sum, item) => sum + item.quantity, 0);
-            cartBadge.textContent = totalItems;
+        if (cartBadge && response.total_quantity !== undefined) {
+            cartBadge.textContent = response.total_quantity;
         }
     } catch (error) {
         console.error('Error updating cart badge:', error);
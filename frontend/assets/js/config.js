@@ -14,6 +14,7 @@ const ENDPOINTS = {
     REGISTER: '/auth/register',
     ME: '/auth/me',
     REFRESH: '/auth/refresh',
+    LOGOUT: '/auth/logout',
     
     // Books
     BOOKS: '/books',
@@ -27,6 +28,7 @@ const ENDPOINTS = {
     
     // Cart
     CART: '/cart',
+    CART_SUMMARY: '/cart/summary',
     CART_ADD: '/cart/items',
     CART_ITEM: (id) => `/cart/items/${id}`,
     
@@ -46,7 +48,10 @@ const ENDPOINTS = {
     ADMIN_BOOKS: '/admin/books',
     ADMIN_BOOK: (id) => `/admin/books/${id}`,
     ADMIN_ORDERS: '/admin/orders',
-    ADMIN_ORDER_STATUS: (id) => `/admin/orders/${id}/status`
+    ADMIN_ORDER_STATUS: (id) => `/admin/orders/${id}/status`,
+    ADMIN_ANALYTICS_SUMMARY: '/admin/analytics/summary',
+    ADMIN_ANALYTICS_DAILY: '/admin/analytics/revenue/daily',
+    ADMIN_ANALYTICS_TOP_BOOKS: '/admin/analytics/top-books'
 };
 
 // User Roles
@@ -0,0 +1,36 @@
+"""
+Gunicorn settings for production (render.yaml: gunicorn -c gunicorn.conf.py run:app)
+
+Workers and threads default from the CPU count and can be overridden with
+WEB_CONCURRENCY / GUNICORN_THREADS. Each worker has its own SQLAlchemy pool,
+so keep GUNICORN_THREADS <= DB_POOL_SIZE + DB_MAX_OVERFLOW.
+"""
+import multiprocessing
+import os
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', min(cpu_count * 2 + 1, int(os.environ.get('GUNICORN_MAX_WORKERS', 8)))))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', max(2, min(cpu_count * 2, 8))))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then so slow leaks can't build up
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_worker_init(worker):
+    """Log the effective settings once, from the first worker"""
+    app = worker.wsgi
+    if worker.age == 1 and app.config.get('STARTUP_SELF_CHECK'):
+        from app.utils.selfcheck import run_self_check
+        with app.app_context():
+            run_self_check(app, workers=worker.cfg.workers, threads=worker.cfg.threads, log=worker.log)
@@ -90,13 +90,26 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # the book_search full-text index (and its FTS5 shadow tables on SQLite)
+    # is managed by hand, keep autogenerate from dropping it
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == 'table' and name.startswith('book_search'):
+            return False
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # Schema changes and backfills may run longer than the app's statement_timeout
+        if connection.dialect.name == 'postgresql':
+            connection.exec_driver_sql('SET statement_timeout = 0')
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
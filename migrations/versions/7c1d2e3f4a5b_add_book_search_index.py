@@ -0,0 +1,67 @@
+"""add book full-text search index
+
+Revision ID: 7c1d2e3f4a5b
+Revises: 6b7c8d9e0f1a
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1d2e3f4a5b'
+down_revision = '6b7c8d9e0f1a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    if conn.dialect.name == 'postgresql':
+        # One weighted tsvector per book: title/isbn (A), author (B), category (C), description (D)
+        op.create_table('book_search',
+            sa.Column('book_id', sa.String(length=36), sa.ForeignKey('books.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('document', postgresql.TSVECTOR(), nullable=False)
+        )
+        op.create_index('ix_book_search_document', 'book_search', ['document'], postgresql_using='gin')
+        op.execute("""
+            INSERT INTO book_search (book_id, document)
+            SELECT b.id,
+                   setweight(to_tsvector('simple', coalesce(b.title, '') || ' ' || coalesce(b.isbn, '')), 'A') ||
+                   setweight(to_tsvector('simple', coalesce(a.author_name, '')), 'B') ||
+                   setweight(to_tsvector('simple', coalesce(c.category_type, '')), 'C') ||
+                   setweight(to_tsvector('simple', coalesce(b.description, '')), 'D')
+            FROM books b
+            LEFT JOIN authors a ON a.id = b.author_id
+            LEFT JOIN categories c ON c.id = b.category_id
+            WHERE b.is_deleted = false
+        """)
+
+    elif conn.dialect.name == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE book_search USING fts5("
+            "book_id UNINDEXED, title, isbn, description, author_name, category_type, "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute("""
+            INSERT INTO book_search (book_id, title, isbn, description, author_name, category_type)
+            SELECT b.id, b.title, coalesce(b.isbn, ''), coalesce(b.description, ''),
+                   coalesce(a.author_name, ''), coalesce(c.category_type, '')
+            FROM books b
+            LEFT JOIN authors a ON a.id = b.author_id
+            LEFT JOIN categories c ON c.id = b.category_id
+            WHERE b.is_deleted = 0
+        """)
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    if conn.dialect.name == 'postgresql':
+        op.drop_index('ix_book_search_document', table_name='book_search', postgresql_using='gin')
+        op.drop_table('book_search')
+    elif conn.dialect.name == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS book_search')
@@ -0,0 +1,41 @@
+"""add review rating aggregates to books
+
+Revision ID: 8d2e3f4a5b6c
+Revises: 7c1d2e3f4a5b
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e3f4a5b6c'
+down_revision = '7c1d2e3f4a5b'
+branch_labels = None
+depends_on = None
+
+RATING_COLUMNS = ['rating_count', 'rating_sum'] + [f'rating_{star}_count' for star in range(1, 6)]
+
+
+def upgrade():
+    with op.batch_alter_table('books', schema=None) as batch_op:
+        for name in RATING_COLUMNS:
+            batch_op.add_column(sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing reviews
+    active = "r.book_id = books.id AND r.is_deleted = false"
+    assignments = [
+        f"rating_count = (SELECT count(*) FROM reviews r WHERE {active})",
+        f"rating_sum = (SELECT coalesce(sum(r.rating), 0) FROM reviews r WHERE {active})",
+    ] + [
+        f"rating_{star}_count = (SELECT count(*) FROM reviews r WHERE {active} AND r.rating = {star})"
+        for star in range(1, 6)
+    ]
+    op.execute(f"UPDATE books SET {', '.join(assignments)}")
+
+
+def downgrade():
+    with op.batch_alter_table('books', schema=None) as batch_op:
+        for name in reversed(RATING_COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,46 @@
+"""add composite indexes for soft-delete filtered lookups
+
+Partial (WHERE is_deleted = false) on PostgreSQL, plain composite elsewhere.
+
+Revision ID: 9e3f4a5b6c7d
+Revises: 8d2e3f4a5b6c
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e3f4a5b6c7d'
+down_revision = '8d2e3f4a5b6c'
+branch_labels = None
+depends_on = None
+
+ACTIVE = sa.text('is_deleted = false')
+
+# (index name, table, columns) - mirrors __table_args__ on the models
+INDEXES = [
+    ('ix_books_created_at_active', 'books', ['created_at', 'id']),
+    ('ix_books_title_active', 'books', ['title', 'id']),
+    ('ix_books_price_active', 'books', ['price', 'id']),
+    ('ix_books_category_active', 'books', ['category_id', 'created_at', 'id']),
+    ('ix_books_author_active', 'books', ['author_id', 'created_at', 'id']),
+    ('ix_cart_items_user_book_active', 'cart_items', ['user_id', 'book_id']),
+    ('ix_order_details_user_date_active', 'order_details', ['user_id', 'order_date']),
+    ('ix_order_details_status_date_active', 'order_details', ['order_status', 'order_date']),
+    ('ix_order_details_date_active', 'order_details', ['order_date']),
+    ('ix_order_items_order_active', 'order_items', ['order_details_id']),
+    ('ix_order_items_user_active', 'order_items', ['user_id']),
+    ('ix_reviews_book_active', 'reviews', ['book_id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, postgresql_where=ACTIVE)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table, postgresql_where=ACTIVE)
@@ -0,0 +1,47 @@
+"""add token_blocklist table for revoked JWTs
+
+Revision ID: b1a5c6d7e8f9
+Revises: a0f4b5c6d7e8
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b1a5c6d7e8f9'
+down_revision = 'a0f4b5c6d7e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('token_blocklist',
+    sa.Column('jti', sa.String(length=36), nullable=False),
+    sa.Column('token_type', sa.String(length=10), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.Column('created_by', sa.String(length=255), nullable=True),
+    sa.Column('role', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('jti')
+    )
+    with op.batch_alter_table('token_blocklist', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_token_blocklist_expires_at'), ['expires_at'], unique=False)
+        batch_op.create_index('ix_token_blocklist_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('token_blocklist', schema=None) as batch_op:
+        batch_op.drop_index('ix_token_blocklist_created_at')
+        batch_op.drop_index(batch_op.f('ix_token_blocklist_expires_at'))
+
+    op.drop_table('token_blocklist')
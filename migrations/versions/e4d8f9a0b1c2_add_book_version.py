@@ -0,0 +1,26 @@
+"""add books.version for optimistic concurrency
+
+Revision ID: e4d8f9a0b1c2
+Revises: d3c7e8f9a0b1
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4d8f9a0b1c2'
+down_revision = 'd3c7e8f9a0b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('books', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('books', schema=None) as batch_op:
+        batch_op.drop_column('version')
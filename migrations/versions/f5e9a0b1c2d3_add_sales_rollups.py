@@ -0,0 +1,45 @@
+"""add sales_daily and book_sales_daily rollup tables
+
+Revision ID: f5e9a0b1c2d3
+Revises: e4d8f9a0b1c2
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5e9a0b1c2d3'
+down_revision = 'e4d8f9a0b1c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('city', sa.String(length=100), nullable=False),
+    sa.Column('orders', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('cancelled_orders', sa.Integer(), nullable=False),
+    sa.Column('cancelled_revenue', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('delivered_orders', sa.Integer(), nullable=False),
+    sa.Column('delivered_revenue', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'city')
+    )
+    op.create_table('book_sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('book_id', sa.String(length=36), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('cancelled_quantity', sa.Integer(), nullable=False),
+    sa.Column('cancelled_revenue', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ),
+    sa.PrimaryKeyConstraint('day', 'book_id')
+    )
+
+
+def downgrade():
+    op.drop_table('book_sales_daily')
+    op.drop_table('sales_daily')
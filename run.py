@@ -1,7 +1,9 @@
 from app import create_app
 from app.models import db
+from config import get_config
 
-app = create_app()
+# FLASK_ENV selects the config class (development by default)
+app = create_app(get_config())
 
 # Create database tables
 # Comment this out when using Flask-Migrate
@@ -10,4 +12,4 @@ app = create_app()
 #     print("Database tables created successfully!")
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=app.config.get('DEBUG', False), host='0.0.0.0', port=5000)
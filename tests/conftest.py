@@ -0,0 +1,116 @@
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app import create_app, bcrypt
+from app.models import db, Author, Category, Book, User
+from config.testing import TestingConfig
+
+PASSWORD = 'pass123'
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all(bind_key=None)
+        yield app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    def make_user(username, role=0):
+        user = User(username=username, name=username.title(), email=f'{username}@example.com',
+                    password=bcrypt.generate_password_hash(PASSWORD).decode('utf-8'), role=role)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make_user
+
+
+@pytest.fixture
+def login(client):
+    def login(username):
+        response = client.post('/api/v1/auth/login', json={'username': username, 'password': PASSWORD})
+        assert response.status_code == 200, response.get_json()
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    return login
+
+
+@pytest.fixture
+def books(app):
+    """Five books with one author and one category, 10 copies each"""
+    author = Author(author_name='Author One')
+    category = Category(category_type='Fiction')
+    db.session.add_all([author, category])
+    db.session.flush()
+    books = [Book(title=f'Book {i}', isbn=f'isbn-{i}', price=100 + i, stock_quantity=10,
+                  author_id=author.id, category_id=category.id) for i in range(5)]
+    db.session.add_all(books)
+    db.session.commit()
+    return books
+
+
+@pytest.fixture
+def place_order(app):
+    """Check out the given {book: quantity} for a user through OrderService"""
+    def place_order(user, quantities, city='Lahore'):
+        from app.models import CartItem
+        from app.services.OrderService import OrderService
+        db.session.add_all([CartItem(user_id=user.id, book_id=book.id, quantity=quantity)
+                            for book, quantity in quantities.items()])
+        db.session.commit()
+        return OrderService().create_order_from_cart(user.id, {
+            'shipping_address': 'Street 1', 'city': city, 'phone_number': '03001234567'
+        })
+    return place_order
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    """App with a 'replica' bind: two SQLite files, replicated on demand with app.sync_replica()"""
+    import shutil
+    from app.utils.db_routing import replica_health
+
+    primary, replica = tmp_path / 'primary.db', tmp_path / 'replica.db'
+
+    class ReplicaConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{primary}'
+        SQLALCHEMY_BINDS = {'replica': f'sqlite:///{replica}'}
+
+    def sync_replica():
+        """Copy the primary's committed state to the replica (a replica with no lag at this moment)"""
+        db.engines['replica'].dispose()
+        shutil.copyfile(primary, replica)
+
+    replica_health.reset()
+    app = create_app(ReplicaConfig)
+    app.sync_replica = sync_replica
+    with app.app_context():
+        db.create_all(bind_key=None)
+        sync_replica()
+        yield app
+        db.session.remove()
+    replica_health.reset()
+
+
+@pytest.fixture
+def count_statements(app):
+    """Context manager collecting the SQL statements run on the primary engine"""
+    @contextmanager
+    def count_statements():
+        statements = []
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+    return count_statements
@@ -0,0 +1,74 @@
+from datetime import datetime, timezone, timedelta
+import pytest
+from sqlalchemy import update
+from app.models import db, Job, OrderDetails, SalesDaily, BookSalesDaily
+from app.repositories.JobRepository import JobRepository
+from app.services.AnalyticsService import AnalyticsService
+from app.services.JobService import JobService
+from app.services.OrderService import OrderService
+
+
+def rollups():
+    db.session.expire_all()
+    return (
+        sorted((row.day, row.city, row.orders, float(row.revenue), row.cancelled_orders, row.delivered_orders)
+               for row in SalesDaily.query),
+        sorted((row.day, row.book_id, row.quantity, row.cancelled_quantity) for row in BookSalesDaily.query),
+    )
+
+
+def test_incremental_rollups_match_rebuild(app, books, make_user, place_order):
+    user = make_user('reader')
+    service = OrderService()
+    cancelled = place_order(user, {books[0]: 1, books[1]: 2})
+    delivered = place_order(user, {books[0]: 3}, city='Karachi')
+    place_order(user, {books[2]: 1})
+    service.cancel_order(cancelled['id'], user.id)
+    for status in ('Confirmed', 'Shipped', 'Delivered'):
+        service.update_order_status(delivered['id'], status)
+    JobService().run_pending()
+
+    incremental = rollups()
+    AnalyticsService().rebuild()
+    assert rollups() == incremental
+
+    summary = AnalyticsService().get_summary(datetime.now(timezone.utc).date(), datetime.now(timezone.utc).date())
+    assert (summary['orders'], summary['cancelled_orders'], summary['delivered_orders']) == (2, 1, 1)
+
+
+def test_stale_status_change_is_rejected_and_not_counted(app, books, make_user, place_order, monkeypatch):
+    user = make_user('reader')
+    order_id = place_order(user, {books[0]: 1})['id']
+    JobService().run_pending()
+    service = OrderService()
+    order = db.session.get(OrderDetails, order_id)
+    assert order.order_status == 'Pending'
+
+    # Another request confirms the order after this one read it
+    db.session.execute(update(OrderDetails).where(OrderDetails.id == order_id).values(order_status='Confirmed')
+                       .execution_options(synchronize_session=False))
+    monkeypatch.setattr(service.order_repository, 'get_by_id', lambda order_id: order)
+
+    with pytest.raises(ValueError, match='Order status changed'):
+        service.update_order_status(order_id, 'Confirmed')
+    assert Job.query.filter_by(name=AnalyticsService.TASK, status='pending').count() == 0
+
+
+def test_requeued_job_is_applied_once(app, books, make_user, place_order):
+    user = make_user('reader')
+    place_order(user, {books[0]: 2})
+    repository = JobRepository()
+    job = Job.query.filter_by(name=AnalyticsService.TASK).one()
+
+    # Worker A claims the job, then stalls past the lock timeout
+    assert repository.claim(job.id, 'worker-a', datetime.now(timezone.utc))
+    db.session.commit()
+    repository.release_stale(datetime.now(timezone.utc) + timedelta(seconds=1))
+    db.session.commit()
+
+    JobService().run_pending(worker_id='worker-b')
+    late = JobService()._run(job.id, 'worker-a')
+
+    assert late['status'] == 'done' and late['locked_by'] == 'worker-b'
+    (row,), (book_row,) = rollups()
+    assert row[2] == 1 and book_row[2] == 2
@@ -0,0 +1,47 @@
+from app.models import db, User
+from app.utils.passwords import password_hasher, PasswordHasherBusy
+from tests.conftest import PASSWORD
+
+
+def login_status(client, username):
+    return client.post('/api/v1/auth/login', json={'username': username, 'password': PASSWORD}).status_code
+
+
+def stored_rounds(user_id):
+    db.session.expire_all()
+    return int(db.session.get(User, user_id).password.split('$')[2])
+
+
+def test_login_upgrades_the_password_hash_cost(client, make_user, monkeypatch):
+    user_id = make_user('reader').id
+    monkeypatch.setattr(password_hasher, 'rounds', stored_rounds(user_id) + 1)
+
+    assert login_status(client, 'reader') == 200
+    assert stored_rounds(user_id) == password_hasher.rounds
+
+
+def test_login_skips_the_upgrade_when_the_hasher_is_busy(client, make_user, monkeypatch):
+    user_id = make_user('reader').id
+    rounds = stored_rounds(user_id)
+    monkeypatch.setattr(password_hasher, 'rounds', rounds + 1)
+
+    def busy(password):
+        raise PasswordHasherBusy('Too many password operations in progress')
+
+    monkeypatch.setattr(password_hasher, 'hash', busy)
+    assert login_status(client, 'reader') == 200
+    assert stored_rounds(user_id) == rounds
+
+
+def test_only_failed_logins_count_towards_the_username_lockout(app, client, make_user, monkeypatch):
+    make_user('reader')
+    monkeypatch.setitem(app.config, 'RATELIMIT_ENABLED', True)
+    monkeypatch.setitem(app.config, 'RATELIMIT_LOGIN_IP', (100, 60))
+    monkeypatch.setitem(app.config, 'RATELIMIT_LOGIN_USER', (2, 900))
+
+    wrong = {'username': 'reader', 'password': 'wrong1'}
+    assert client.post('/api/v1/auth/login', json=wrong).status_code == 401
+    for _ in range(5):
+        assert login_status(client, 'reader') == 200
+    assert [client.post('/api/v1/auth/login', json=wrong).status_code for _ in range(2)] == [401, 429]
+    assert login_status(client, 'reader') == 429
@@ -0,0 +1,74 @@
+import base64
+import json
+import pytest
+from app.models import db, Author, Category, Book
+from app.services.BookService import BookService
+
+
+@pytest.fixture
+def catalog(app):
+    """Twelve books, each with its own author and category (lazy loads would show up per row)"""
+    books = []
+    for i in range(12):
+        author = Author(author_name=f'Author {i}')
+        category = Category(category_type=f'Category {i}')
+        db.session.add_all([author, category])
+        db.session.flush()
+        books.append(Book(title=f'Dragon Book {i}', isbn=f'isbn-{i}', price=100 + i, stock_quantity=5,
+                          author_id=author.id, category_id=category.id))
+    db.session.add_all(books)
+    db.session.commit()
+    book_ids = [book.id for book in books]
+    # Start from an empty identity map, like a fresh request
+    db.session.remove()
+    return book_ids
+
+
+def test_book_listing_is_one_statement_per_page(client, catalog, count_statements):
+    with count_statements() as statements:
+        first = client.get('/api/v1/books?limit=5').get_json()
+    assert len(first['books']) == 5
+    assert all(book['author'] and book['category'] for book in first['books'])
+    assert len(statements) == 1
+
+    db.session.remove()
+    with count_statements() as statements:
+        second = client.get(f"/api/v1/books?limit=10&cursor={first['next_cursor']}").get_json()
+    assert len(second['books']) == 7
+    assert len(statements) == 1
+
+
+def test_book_detail_is_one_statement(client, catalog, count_statements):
+    with count_statements() as statements:
+        response = client.get(f'/api/v1/books/{catalog[3]}')
+    assert response.status_code == 200
+    book = response.get_json()['book']
+    assert book['author']['name'] == 'Author 3' and book['category']['name'] == 'Category 3'
+    assert len(statements) == 1
+
+
+def test_book_listing_is_not_304_after_a_removal(client, catalog):
+    first = client.get('/api/v1/books?limit=20')
+    assert first.headers.get('ETag') and 'Last-Modified' not in first.headers
+    assert client.get('/api/v1/books?limit=20', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    BookService.delete_book(catalog[0])
+    db.session.remove()
+    second = client.get('/api/v1/books?limit=20', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert len(second.get_json()['books']) == 11
+
+
+@pytest.mark.parametrize('payload', [
+    ['newest', {'dt': 5}, 'id'],
+    ['newest', {'dt': 'yesterday'}, 'id'],
+    ['price_asc', {'dec': 'cheap'}, 'id'],
+    ['price_asc', {'other': 1}, 'id'],
+    ['title', 'Dragon Book 1', ['id']],
+])
+def test_tampered_cursor_is_a_bad_request(client, catalog, payload):
+    sort = payload[0]
+    cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+    response = client.get(f'/api/v1/books?sort={sort}&cursor={cursor}')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid cursor'
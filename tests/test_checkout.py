@@ -0,0 +1,41 @@
+import pytest
+from app.models import db, Book, CartItem, OrderDetails
+from app.services.OrderService import OrderService
+
+SHIPPING = {'shipping_address': 'Street 1', 'city': 'Lahore', 'phone_number': '03001234567'}
+
+
+@pytest.mark.parametrize('mode, error', [
+    ('pessimistic', 'Cart changed during checkout'),
+    ('optimistic', 'Cart is empty'),
+])
+def test_cart_checked_out_concurrently_is_sold_once(app, books, make_user, monkeypatch, mode, error):
+    monkeypatch.setitem(app.config, 'STOCK_CONCURRENCY', mode)
+    user = make_user('reader')
+    db.session.add(CartItem(user_id=user.id, book_id=books[0].id, quantity=2))
+    db.session.commit()
+
+    # This checkout read the cart, then another one consumed it first
+    service = OrderService()
+    stale_cart = service.cart_repository.get_by_user_id(user.id)
+    OrderService().create_order_from_cart(user.id, SHIPPING)
+    reads = iter([stale_cart])
+    monkeypatch.setattr(service.cart_repository, 'get_by_user_id', lambda user_id: next(reads, []))
+
+    with pytest.raises(ValueError, match=error):
+        service.create_order_from_cart(user.id, SHIPPING)
+    db.session.expire_all()
+    assert OrderDetails.query.count() == 1
+    assert db.session.get(Book, books[0].id).stock_quantity == 8
+
+
+@pytest.mark.parametrize('mode', ['pessimistic', 'optimistic'])
+def test_cancel_restores_stock(app, books, make_user, place_order, monkeypatch, mode):
+    monkeypatch.setitem(app.config, 'STOCK_CONCURRENCY', mode)
+    user = make_user('reader')
+    order = place_order(user, {books[0]: 2, books[1]: 3})
+
+    OrderService().cancel_order(order['id'], user.id)
+    db.session.expire_all()
+    assert [db.session.get(Book, book.id).stock_quantity for book in books[:2]] == [10, 10]
+    assert db.session.get(OrderDetails, order['id']).order_status == 'Cancelled'
@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import update
+from app.models import db, Book
+from app.utils.db_routing import replica_health, read_from_replica, use_primary, ReplicaHealth
+
+
+@pytest.fixture
+def app(replica_app):
+    return replica_app
+
+
+@pytest.fixture
+def book_id(app, books):
+    """A book whose title differs between the replica ('Book 0') and the primary ('Primary title')"""
+    app.sync_replica()
+    db.session.execute(update(Book).where(Book.id == books[0].id).values(title='Primary title'))
+    db.session.commit()
+    return books[0].id
+
+
+def get_title(client, book_id):
+    # The test client reuses the test's app context; start each request with an empty session like a real one
+    db.session.remove()
+    response = client.get(f'/api/v1/books/{book_id}')
+    assert response.status_code == 200
+    return response.get_json()['book']['title']
+
+
+def test_get_reads_go_to_the_replica(app, book_id):
+    assert get_title(app.test_client(), book_id) == 'Book 0'
+
+
+def test_writes_go_to_the_primary_and_pin_later_reads(app, book_id, make_user, login):
+    make_user('admin', role=1)
+    client = app.test_client()
+    headers = login('admin')
+
+    response = client.post('/api/v1/books', headers=headers, json={'title': 'New book', 'price': 50})
+    assert response.status_code == 201, response.get_json()
+    new_id = response.get_json()['book']['id']
+
+    with app.app_context():
+        assert db.session.get(Book, new_id).title == 'New book'
+    # The writer's next reads use the primary: its own write and the primary's title
+    assert get_title(client, new_id) == 'New book'
+    assert get_title(client, book_id) == 'Primary title'
+    # Other clients still read the replica
+    assert get_title(app.test_client(), book_id) == 'Book 0'
+
+
+def test_reads_fall_back_to_the_primary_while_the_replica_is_down(app, book_id, monkeypatch):
+    client = app.test_client()
+    replica_health.mark_down(db.engines['replica'])
+    assert get_title(client, book_id) == 'Primary title'
+
+    # A failed probe keeps it down; a successful one brings it back
+    replica_health.reset()
+    monkeypatch.setattr(ReplicaHealth, '_probe', staticmethod(lambda engine: False))
+    assert get_title(client, book_id) == 'Primary title'
+    monkeypatch.setattr(ReplicaHealth, '_probe', staticmethod(lambda engine: True))
+    replica_health.reset()
+    assert get_title(client, book_id) == 'Book 0'
+
+
+def test_request_falls_back_when_the_replica_breaks_between_probes(app, book_id, tmp_path):
+    client = app.test_client()
+    replica = db.engines['replica']
+    assert get_title(client, book_id) == 'Book 0'
+
+    # The replica was healthy at the last probe and is unreachable now
+    replica.dispose()
+    (tmp_path / 'replica.db').unlink()
+    (tmp_path / 'replica.db').mkdir()
+    assert get_title(client, book_id) == 'Primary title'
+    assert not replica_health.available(replica)
+
+
+def test_probe_in_progress_does_not_block_other_requests(monkeypatch):
+    health = ReplicaHealth()
+    monkeypatch.setattr(ReplicaHealth, '_probe', staticmethod(lambda engine: True))
+    # Another thread is probing: keep the last known state (down) without waiting
+    health._lock.acquire()
+    try:
+        assert not health.available('replica')
+    finally:
+        health._lock.release()
+    assert health.available('replica')
+
+
+def test_use_primary_overrides_replica_reads(app, book_id):
+    db.session.remove()
+    with app.app_context():
+        with read_from_replica():
+            assert db.session.get(Book, book_id).title == 'Book 0'
+            db.session.remove()
+            with use_primary():
+                assert db.session.get(Book, book_id).title == 'Primary title'
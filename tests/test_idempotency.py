@@ -0,0 +1,121 @@
+from datetime import datetime, timezone, timedelta
+import pytest
+from flask_jwt_extended import jwt_required
+from app.models import db, Book, CartItem, IdempotencyKey, OrderDetails
+from app.routes import OrderRoutes
+from app.utils.idempotency import idempotent, _fingerprint
+
+SHIPPING = {'shipping_address': 'Street 1', 'city': 'Lahore', 'phone_number': '03001234567'}
+
+
+@pytest.fixture
+def reader(make_user):
+    return make_user('reader')
+
+
+@pytest.fixture
+def headers(reader, login):
+    return login('reader')
+
+
+def fill_cart(user, book, quantity=2):
+    db.session.add(CartItem(user_id=user.id, book_id=book.id, quantity=quantity))
+    db.session.commit()
+
+
+def checkout(client, headers, key, body=SHIPPING):
+    return client.post('/api/v1/orders/checkout', json=body, headers={**headers, 'Idempotency-Key': key})
+
+
+def test_retry_replays_the_stored_response(client, books, reader, headers):
+    fill_cart(reader, books[0])
+    first = checkout(client, headers, 'checkout-1')
+    assert first.status_code == 201
+    assert 'Idempotent-Replayed' not in first.headers
+
+    retry = checkout(client, headers, 'checkout-1')
+    assert retry.status_code == 201
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json() == first.get_json()
+    db.session.expire_all()
+    assert OrderDetails.query.count() == 1
+    assert db.session.get(Book, books[0].id).stock_quantity == 8
+
+
+def test_key_reused_for_another_body_is_rejected(client, books, reader, headers):
+    fill_cart(reader, books[0])
+    assert checkout(client, headers, 'checkout-1').status_code == 201
+    response = checkout(client, headers, 'checkout-1', body={**SHIPPING, 'city': 'Karachi'})
+    assert response.status_code == 422
+    assert OrderDetails.query.count() == 1
+
+
+def test_key_is_released_after_a_server_error(client, books, reader, headers, monkeypatch):
+    fill_cart(reader, books[0])
+
+    def broken(user_id, shipping_data):
+        raise RuntimeError('database went away')
+
+    monkeypatch.setattr(OrderRoutes.order_service, 'create_order_from_cart', broken)
+    assert checkout(client, headers, 'checkout-1').status_code == 500
+    assert IdempotencyKey.query.count() == 0
+
+    monkeypatch.undo()
+    response = checkout(client, headers, 'checkout-1')
+    assert response.status_code == 201
+    assert 'Idempotent-Replayed' not in response.headers
+
+
+@pytest.fixture
+def flaky_view(app):
+    """POST /test/flaky behind @idempotent: raises on its first call (registered before any request)"""
+    calls = []
+
+    @jwt_required()
+    @idempotent
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('boom')
+        return {'calls': len(calls)}, 201
+
+    app.add_url_rule('/test/flaky', 'flaky', flaky, methods=['POST'])
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+    return calls
+
+
+def test_key_is_released_when_the_view_raises(flaky_view, client, headers):
+    request_headers = {**headers, 'Idempotency-Key': 'flaky-1'}
+    assert client.post('/test/flaky', json={}, headers=request_headers).status_code == 500
+    assert IdempotencyKey.query.count() == 0
+    assert client.post('/test/flaky', json={}, headers=request_headers).get_json() == {'calls': 2}
+
+
+def in_flight(app, user_id, key, body, age=0):
+    """Record a request with the same key and body as still running, started age seconds ago"""
+    with app.test_request_context('/api/v1/orders/checkout', method='POST', json=body):
+        request_hash = _fingerprint()
+    now = datetime.now(timezone.utc)
+    db.session.add(IdempotencyKey(user_id=user_id, key=key, request_hash=request_hash,
+                                  created_at=now - timedelta(seconds=age), expires_at=now + timedelta(days=1)))
+    db.session.commit()
+
+
+def test_retry_waits_then_conflicts_while_the_original_runs(app, client, books, reader, headers, monkeypatch):
+    fill_cart(reader, books[0])
+    in_flight(app, reader.id, 'checkout-1', SHIPPING)
+    monkeypatch.setitem(app.config, 'IDEMPOTENCY_WAIT_SECONDS', 0.3)
+
+    response = checkout(client, headers, 'checkout-1')
+    assert response.status_code == 409
+    assert response.headers['Retry-After'] == '1'
+    assert OrderDetails.query.count() == 0
+
+
+def test_in_progress_key_is_taken_over_after_the_lock_timeout(app, client, books, reader, headers, monkeypatch):
+    fill_cart(reader, books[0])
+    monkeypatch.setitem(app.config, 'IDEMPOTENCY_LOCK_TIMEOUT', 60)
+    in_flight(app, reader.id, 'checkout-1', SHIPPING, age=61)
+
+    assert checkout(client, headers, 'checkout-1').status_code == 201
+    assert OrderDetails.query.count() == 1
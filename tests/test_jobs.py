@@ -0,0 +1,89 @@
+from datetime import datetime, timezone, timedelta
+from sqlalchemy import update
+from app.models import db, Job, CartHistory, OrderItem
+from app.repositories.JobRepository import JobRepository
+from app.services.JobService import JobService
+from app import tasks
+
+
+def utcnow():
+    # SQLite hands datetimes back without a timezone
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def test_enqueue_is_part_of_the_callers_transaction(app):
+    JobService().enqueue('cart_history.record_order', {'order_id': 'missing'})
+    db.session.rollback()
+    assert Job.query.count() == 0
+
+    JobService().enqueue('cart_history.record_order', {'order_id': 'missing'})
+    db.session.commit()
+    assert Job.query.count() == 1
+
+
+def test_only_one_worker_claims_a_job(app):
+    job = JobService().enqueue('cart_history.record_order', {'order_id': 'missing'})
+    db.session.commit()
+    job_id = job.id
+    repository = JobRepository()
+    now = datetime.now(timezone.utc)
+
+    assert repository.claim(job_id, 'worker-a', now)
+    db.session.commit()
+    assert not repository.claim(job_id, 'worker-b', now)
+    db.session.rollback()
+    assert JobService().process_next('worker-b') is None
+
+    job = db.session.get(Job, job_id)
+    assert (job.status, job.locked_by, job.attempts) == ('running', 'worker-a', 1)
+
+
+def test_failing_job_backs_off_then_fails(app, monkeypatch):
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise RuntimeError('boom')
+
+    monkeypatch.setitem(tasks.TASKS, 'test.flaky', flaky)
+    monkeypatch.setitem(app.config, 'JOBS_RETRY_BASE_SECONDS', 10)
+    job = JobService().enqueue('test.flaky', max_attempts=3)
+    db.session.commit()
+    job_id = job.id
+
+    for attempt, delay in ((1, 10), (2, 20)):
+        started = utcnow()
+        assert JobService().run_pending() == 1
+        job = db.session.get(Job, job_id)
+        db.session.refresh(job)
+        assert (job.status, job.attempts, job.locked_by) == ('pending', attempt, None)
+        assert started + timedelta(seconds=delay) <= job.run_at <= utcnow() + timedelta(seconds=delay)
+        # Not due yet, so nothing runs until the backoff has passed
+        assert JobService().run_pending() == 0
+        db.session.execute(update(Job).where(Job.id == job_id).values(run_at=datetime.now(timezone.utc))
+                           .execution_options(synchronize_session=False))
+        db.session.commit()
+
+    assert JobService().run_pending() == 1
+    job = db.session.get(Job, job_id)
+    db.session.refresh(job)
+    assert (job.status, job.attempts) == ('failed', 3)
+    assert 'RuntimeError: boom' in job.last_error
+    assert len(calls) == 3
+
+
+def test_order_history_is_recorded_by_the_worker(app, books, make_user, place_order):
+    user = make_user('reader')
+    order_id = place_order(user, {books[0]: 1, books[1]: 2})['id']
+    assert CartHistory.query.count() == 0
+
+    JobService().run_pending()
+    item_ids = {item.id for item in OrderItem.query.filter_by(order_details_id=order_id)}
+    history = CartHistory.query.all()
+    assert {row.order_item_id for row in history} == item_ids
+    assert sorted(row.quantity for row in history) == [1, 2]
+
+    # A repeated run of the handler adds nothing
+    tasks.record_order_history(order_id)
+    db.session.commit()
+    assert CartHistory.query.count() == 2
@@ -0,0 +1,70 @@
+import pytest
+from app.models import db, OrderDetails
+from app.services.OrderService import OrderService
+
+
+@pytest.fixture
+def admin_headers(make_user, login):
+    make_user('admin', role=1)
+    return login('admin')
+
+
+def make_orders(user, statuses, city='Lahore'):
+    orders = [OrderDetails(user_id=user.id, total_amount=100, order_status=status, city=city) for status in statuses]
+    db.session.add_all(orders)
+    db.session.commit()
+    return [order.id for order in orders]
+
+
+def bulk_update(client, headers, body):
+    response = client.put('/api/v1/admin/orders/status', headers=headers, json=body)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['data']
+
+
+def test_bulk_update_by_ids_reports_each_order(client, make_user, admin_headers):
+    user = make_user('reader')
+    confirmed, pending = make_orders(user, ['Confirmed', 'Pending'])
+
+    data = bulk_update(client, admin_headers, {'status': 'Shipped', 'order_ids': [confirmed, pending, 'missing']})
+
+    assert (data['updated'], data['failed']) == (1, 2)
+    assert [result['success'] for result in data['results']] == [True, False, False]
+    assert data['results'][2]['error'] == 'Order not found'
+    assert db.session.get(OrderDetails, confirmed).order_status == 'Shipped'
+
+
+def test_bulk_update_by_filter_finishes(client, make_user, admin_headers, monkeypatch):
+    monkeypatch.setattr(OrderService, 'BULK_STATUS_LIMIT', 2)
+    user = make_user('reader')
+    make_orders(user, ['Pending'] * 4)
+    confirmed = make_orders(user, ['Confirmed'] * 3)
+    make_orders(user, ['Confirmed'], city='Karachi')
+
+    calls, updated = 0, 0
+    while True:
+        data = bulk_update(client, admin_headers, {'status': 'Shipped', 'filter': {'city': 'Lahore'}})
+        calls += 1
+        updated += data['updated']
+        assert data['failed'] == 0
+        if not data['has_more']:
+            break
+        assert calls < 5
+
+    assert updated == 3
+    db.session.expire_all()
+    assert {db.session.get(OrderDetails, order_id).order_status for order_id in confirmed} == {'Shipped'}
+    assert OrderDetails.query.filter_by(order_status='Pending').count() == 4
+    assert OrderDetails.query.filter_by(city='Karachi', order_status='Confirmed').count() == 1
+
+
+@pytest.mark.parametrize('method, path', [
+    ('get', '/api/v1/admin/orders'),
+    ('put', '/api/v1/admin/orders/status'),
+    ('post', '/api/v1/admin/orders/tracking/import'),
+])
+def test_admin_order_endpoints_reject_customers(client, make_user, login, method, path):
+    make_user('reader')
+    response = getattr(client, method)(path, headers=login('reader'), json={'status': 'Confirmed', 'order_ids': []})
+    assert response.status_code == 403
+    assert response.get_json()['error'] == 'Admin access required'
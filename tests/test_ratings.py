@@ -0,0 +1,33 @@
+from app.models import db, Book, Review
+from app.services.ReviewService import ReviewService
+
+
+def test_backfill_recomputes_aggregates_on_versioned_books(app, books, make_user):
+    users = [make_user(f'reader{i}') for i in range(3)]
+    db.session.add_all([
+        Review(user_id=users[0].id, book_id=books[0].id, rating=5),
+        Review(user_id=users[1].id, book_id=books[0].id, rating=3),
+        Review(user_id=users[2].id, book_id=books[1].id, rating=4),
+    ])
+    # Stale aggregates on a book without reviews
+    books[2].rating_count, books[2].rating_sum, books[2].rating_5_count = 2, 10, 2
+    db.session.commit()
+    versions = {book.id: book.version for book in books}
+
+    assert ReviewService().rebuild_rating_aggregates() == 2
+
+    db.session.expire_all()
+    first, second, third = (db.session.get(Book, book.id) for book in books[:3])
+    assert (first.rating_count, first.rating_sum, first.rating_5_count, first.rating_3_count) == (2, 8, 1, 1)
+    assert (second.rating_count, second.rating_sum, second.rating_4_count) == (1, 4, 1)
+    assert (third.rating_count, third.rating_sum, third.rating_5_count) == (0, 0, 0)
+    assert all(db.session.get(Book, book_id).version > version for book_id, version in versions.items())
+
+    # ORM updates still pass the version check after the backfill
+    first.stock_quantity += 1
+    db.session.commit()
+
+
+def test_backfill_command(app, books):
+    result = app.test_cli_runner().invoke(args=['ratings', 'backfill'])
+    assert result.exit_code == 0, result.output
@@ -0,0 +1,36 @@
+import pytest
+from flask_jwt_extended import decode_token
+from app.models import db, User
+from app.utils.blocklist import token_revocations
+
+
+@pytest.fixture
+def app(replica_app):
+    return replica_app
+
+
+def test_revocation_is_seen_while_the_replica_lags(app, make_user, login):
+    make_user('reader')
+    app.sync_replica()
+    headers = login('reader')
+
+    # A fresh client (no read-your-writes cookie) so GETs go to the replica
+    reader = app.test_client()
+    assert reader.get('/api/v1/cart', headers=headers).status_code == 200
+
+    # Another worker revokes the token; the replica hasn't caught up
+    with app.app_context():
+        token_revocations.revoke([decode_token(headers['Authorization'].split()[1])])
+    assert reader.get('/api/v1/cart', headers=headers).status_code == 401
+
+
+def test_user_snapshot_ignores_a_stale_replica(app, make_user, login):
+    user = make_user('reader')
+    app.sync_replica()
+    headers = login('reader')
+
+    # Deactivated on the primary only (the cache TTL is 0 in tests)
+    db.session.get(User, user.id).is_active = 0
+    db.session.commit()
+    reader = app.test_client()
+    assert reader.get('/api/v1/cart', headers=headers).status_code == 401